@@ -0,0 +1,72 @@
+"""Random problems that the benchmarks share."""
+
+import numpy as np
+from probnum import _randomvariablelist, randvars
+
+# The benchmarks construct random variable lists, just like the tests do.
+# pylint: disable=protected-access
+
+SIZES = [100, 1_000, 10_000]
+"""Number of time steps (or samples)."""
+
+DIMENSIONS = [2, 10, 50]
+"""State dimensions."""
+
+STRATEGIES = ["inv", "pinv", "solve", "cholesky", "cov_cholesky", "auto", "cg"]
+"""All strategies of ``config.COVARIANCE_INVERSION``."""
+
+
+def random_problem(N, d):
+    """Stack of centered means and SPD covariance matrices."""
+    np.random.seed(42)
+    centered_mean = np.random.randn(N, d)
+    factors = np.random.randn(N, d, d)
+    cov_matrices = factors @ np.transpose(factors, axes=(0, 2, 1)) + d * np.eye(d)
+    return centered_mean, cov_matrices
+
+
+def random_solutions(N, d):
+    """Approximate solution (a list of Normals) and a reference solution."""
+    mean, cov_matrices = random_problem(N, d)
+    approximate_solution = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=C) for m, C in zip(mean, cov_matrices)]
+    )
+    reference_solution = mean + np.random.randn(N, d)
+    return approximate_solution, reference_solution
+
+
+def random_samples(N, d, shift=0.0):
+    """I.i.d. standard Normal samples, optionally shifted."""
+    return np.random.default_rng(42).normal(loc=shift, size=(N, d))
+
+
+class IndependentGaussianPosterior:
+    """Time-series posterior with independent Normal marginals on a fixed grid.
+
+    It evaluates and samples in O(N), so the timeseries benchmarks measure probnumeval,
+    not the interpolation of a state-space posterior.
+    """
+
+    def __init__(self, locations, d):
+        self.locations = locations
+        self.approximate_solution, _ = random_solutions(len(locations), d)
+        self._means = np.stack([rv.mean for rv in self.approximate_solution])
+        self._scales = np.sqrt(
+            np.stack([np.diag(rv.cov) for rv in self.approximate_solution])
+        )
+
+    def __call__(self, t):
+        indices = np.searchsorted(self.locations, t)
+        return _randomvariablelist._RandomVariableList(
+            [self.approximate_solution[i] for i in indices]
+        )
+
+    def sample(self, t, size, random_state=None):
+        indices = np.searchsorted(self.locations, t)
+        rng = np.random.default_rng(random_state)
+        base_samples = rng.normal(size=(size,) + self._means[indices].shape)
+        return self._means[indices] + self._scales[indices] * base_samples
+
+    def reference_solution(self, t):
+        """A reference solution that is close to the mean."""
+        return self._means[np.searchsorted(self.locations, t)] + 0.1
@@ -0,0 +1,141 @@
+"""Benchmarks for the calibration measures."""
+
+import numpy as np
+import scipy.linalg
+
+from probnumeval import config, multivariate
+from probnumeval.multivariate import _calibration_measures
+
+from ._problems import DIMENSIONS, SIZES, STRATEGIES, random_problem, random_solutions
+
+# The benchmarks access the private discrepancy engine on purpose.
+# pylint: disable=protected-access
+
+
+def _looped_discrepancies(centered_mean, cov_matrices, strategy):
+    """Reference implementation: one factorization per time step."""
+
+    def discrepancy(mean, cov):
+        cov = 0.5 * (cov + cov.T)
+        if strategy == "inv":
+            return mean @ np.linalg.inv(cov) @ mean
+        if strategy == "pinv":
+            return mean @ np.linalg.pinv(cov) @ mean
+        if strategy == "solve":
+            return mean @ np.linalg.solve(cov, mean)
+        L, lower = scipy.linalg.cho_factor(cov, lower=True)
+        return mean @ scipy.linalg.cho_solve((L, lower), mean)
+
+    return np.array([discrepancy(m, C) for (m, C) in zip(centered_mean, cov_matrices)])
+
+
+class NormalizedDiscrepancies:
+    """Compare the batched discrepancy engine to a loop over time steps.
+
+    The ratio ``time_loop / time_batched`` is the speedup of the batched engine.
+    Strategies without a looped counterpart are compared to the Cholesky loop.
+    """
+
+    param_names = ["N", "d", "strategy"]
+    params = [SIZES, DIMENSIONS, STRATEGIES]
+
+    def setup(self, N, d, strategy):
+        self.centered_mean, self.cov_matrices = random_problem(N, d)
+
+    def time_batched(self, N, d, strategy):
+        with config.covariance_inversion_context(strategy=strategy):
+            _calibration_measures._compute_normalized_discrepancies(
+                self.centered_mean, self.cov_matrices
+            )
+
+    def peakmem_batched(self, N, d, strategy):
+        with config.covariance_inversion_context(strategy=strategy):
+            _calibration_measures._compute_normalized_discrepancies(
+                self.centered_mean, self.cov_matrices
+            )
+
+    def time_loop(self, N, d, strategy):
+        _looped_discrepancies(self.centered_mean, self.cov_matrices, strategy)
+
+
+class CalibrationMeasures:
+    """Public calibration measures, end to end (including stacking the inputs)."""
+
+    param_names = ["metric", "N", "d", "strategy"]
+    params = [
+        ["anees", "non_credibility_index", "inclination_index", "calibration_report"],
+        SIZES,
+        DIMENSIONS,
+        STRATEGIES,
+    ]
+
+    def setup(self, metric, N, d, strategy):
+        self.metric = getattr(multivariate, metric)
+        self.approximate_solution, self.reference_solution = random_solutions(N, d)
+
+    def time_metric(self, metric, N, d, strategy):
+        with config.covariance_inversion_context(strategy=strategy):
+            self.metric(self.approximate_solution, self.reference_solution)
+
+    def peakmem_metric(self, metric, N, d, strategy):
+        with config.covariance_inversion_context(strategy=strategy):
+            self.metric(self.approximate_solution, self.reference_solution)
+
+
+class Accumulators:
+    """Chunked accumulation of error and calibration measures."""
+
+    param_names = ["accumulator", "N", "d"]
+    params = [
+        [
+            "MeanErrorAccumulator",
+            "RelativeMeanErrorAccumulator",
+            "ANEESAccumulator",
+            "CalibrationAccumulator",
+        ],
+        SIZES,
+        DIMENSIONS,
+    ]
+    chunk_size = 100
+
+    def setup(self, accumulator, N, d):
+        self.accumulator_type = getattr(multivariate, accumulator)
+        self.kwargs = {"p": 2} if "MeanError" in accumulator else {}
+        centered_mean, self.cov_matrices = random_problem(N, d)
+        self.reference = np.random.randn(N, d)
+        self.mean = self.reference + centered_mean
+
+    def _accumulate(self):
+        accumulator = self.accumulator_type(**self.kwargs)
+        for start in range(0, len(self.mean), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            accumulator.update(
+                self.mean[chunk], self.cov_matrices[chunk], self.reference[chunk]
+            )
+        return accumulator.result()
+
+    def time_accumulate(self, accumulator, N, d):
+        self._accumulate()
+
+    def peakmem_accumulate(self, accumulator, N, d):
+        self._accumulate()
+
+
+class SlidingWindowCalibration:
+    """Sliding-window NCI and II with rank-one updates of the window."""
+
+    param_names = ["N", "d", "window_size"]
+    params = [SIZES, DIMENSIONS, [100]]
+
+    def setup(self, N, d, window_size):
+        self.approximate_solution, self.reference_solution = random_solutions(N, d)
+
+    def time_sliding_window_calibration(self, N, d, window_size):
+        multivariate.sliding_window_calibration(
+            self.approximate_solution, self.reference_solution, window_size
+        )
+
+    def peakmem_sliding_window_calibration(self, N, d, window_size):
+        multivariate.sliding_window_calibration(
+            self.approximate_solution, self.reference_solution, window_size
+        )
@@ -0,0 +1,38 @@
+"""Benchmarks for the error measures."""
+
+import numpy as np
+
+from probnumeval import multivariate
+
+from ._problems import DIMENSIONS, SIZES
+
+ERROR_MEASURES = [
+    "rmse",
+    "relative_rmse",
+    "mae",
+    "relative_mae",
+    "max_error",
+    "relative_max_error",
+    "mean_error",
+    "relative_mean_error",
+]
+
+
+class ErrorMeasures:
+    """Error measures of an approximate solution with N time steps in d dimensions."""
+
+    param_names = ["metric", "N", "d"]
+    params = [ERROR_MEASURES, SIZES, DIMENSIONS]
+
+    def setup(self, metric, N, d):
+        self.metric = getattr(multivariate, metric)
+        self.kwargs = {"p": 2} if "mean_error" in metric else {}
+        np.random.seed(42)
+        self.approximate_solution = np.random.randn(N, d)
+        self.reference_solution = np.random.randn(N, d)
+
+    def time_metric(self, metric, N, d):
+        self.metric(self.approximate_solution, self.reference_solution, **self.kwargs)
+
+    def peakmem_metric(self, metric, N, d):
+        self.metric(self.approximate_solution, self.reference_solution, **self.kwargs)
@@ -0,0 +1,93 @@
+"""Benchmarks for the analysis of samples and the two-sample discrepancies."""
+
+from probnumeval import multivariate
+
+from ._problems import DIMENSIONS, SIZES, random_samples
+
+
+class SampleDistances:
+    """Distances between N samples in d dimensions, and to a reference."""
+
+    param_names = ["N", "d"]
+    params = [SIZES, DIMENSIONS]
+
+    def setup(self, N, d):
+        self.samples = random_samples(N, d)
+        self.reference = self.samples[0] + 1.0
+
+    def time_sample_sample_distance(self, N, d):
+        multivariate.sample_sample_distance(self.samples)
+
+    def peakmem_sample_sample_distance(self, N, d):
+        multivariate.sample_sample_distance(self.samples)
+
+    def time_sample_sample_distance_gram(self, N, d):
+        multivariate.sample_sample_distance(self.samples, gram=True)
+
+    def time_sample_sample_distance_approx(self, N, d):
+        multivariate.sample_sample_distance(self.samples, approx=True, random_state=1)
+
+    def time_mean_sample_sample_distance(self, N, d):
+        multivariate.mean_sample_sample_distance(self.samples)
+
+    def time_mean_sample_sample_distance_approx(self, N, d):
+        multivariate.mean_sample_sample_distance(
+            self.samples, approx=True, random_state=1
+        )
+
+    def time_sample_reference_distance(self, N, d):
+        multivariate.sample_reference_distance(self.samples, self.reference)
+
+    def peakmem_sample_reference_distance(self, N, d):
+        multivariate.sample_reference_distance(self.samples, self.reference)
+
+
+class Gaussianity:
+    """Normality tests of N samples in d dimensions."""
+
+    param_names = ["N", "d", "method"]
+    params = [SIZES, DIMENSIONS, ["marginal", "mardia"]]
+
+    def setup(self, N, d, method):
+        self.samples = random_samples(N, d)
+
+    def time_gaussianity_p_value(self, N, d, method):
+        multivariate.gaussianity_p_value(self.samples, method=method)
+
+    def peakmem_gaussianity_p_value(self, N, d, method):
+        multivariate.gaussianity_p_value(self.samples, method=method)
+
+
+class TwoSampleDiscrepancies:
+    """Discrepancies between two sets of N samples in d dimensions."""
+
+    param_names = ["N", "d"]
+    params = [SIZES, DIMENSIONS]
+
+    def setup(self, N, d):
+        self.samples = random_samples(N, d)
+        self.other_samples = random_samples(N, d, shift=0.5)
+
+    def time_linear_time_mmd(self, N, d):
+        multivariate.linear_time_mmd(self.samples, self.other_samples, random_state=1)
+
+    def time_random_features_mmd(self, N, d):
+        multivariate.random_features_mmd(
+            self.samples, self.other_samples, random_state=1
+        )
+
+    def time_energy_distance(self, N, d):
+        multivariate.energy_distance(self.samples, self.other_samples)
+
+    def peakmem_energy_distance(self, N, d):
+        multivariate.energy_distance(self.samples, self.other_samples)
+
+    def time_sliced_wasserstein_distance(self, N, d):
+        multivariate.sliced_wasserstein_distance(
+            self.samples, self.other_samples, random_state=1
+        )
+
+    def peakmem_sliced_wasserstein_distance(self, N, d):
+        multivariate.sliced_wasserstein_distance(
+            self.samples, self.other_samples, random_state=1
+        )
@@ -0,0 +1,137 @@
+"""Benchmarks for the time-series metrics."""
+
+import numpy as np
+
+from probnumeval import config, timeseries
+
+from ._problems import DIMENSIONS, SIZES, STRATEGIES, IndependentGaussianPosterior
+
+
+class TimeSeriesCalibrationMeasures:
+    """Calibration measures of a posterior on a grid of N locations."""
+
+    param_names = ["metric", "N", "d", "strategy", "chunk_size"]
+    params = [
+        ["anees", "non_credibility_index", "inclination_index", "calibration_report"],
+        SIZES,
+        DIMENSIONS,
+        STRATEGIES,
+        [None, 100],
+    ]
+
+    def setup(self, metric, N, d, strategy, chunk_size):
+        self.metric = getattr(timeseries, metric)
+        self.locations = np.linspace(0.0, 1.0, N)
+        self.posterior = IndependentGaussianPosterior(self.locations, d)
+
+    def _evaluate(self, strategy, chunk_size):
+        with config.covariance_inversion_context(strategy=strategy):
+            self.metric(
+                self.posterior,
+                self.posterior.reference_solution,
+                self.locations,
+                chunk_size=chunk_size,
+            )
+
+    def time_metric(self, metric, N, d, strategy, chunk_size):
+        self._evaluate(strategy, chunk_size)
+
+    def peakmem_metric(self, metric, N, d, strategy, chunk_size):
+        self._evaluate(strategy, chunk_size)
+
+
+class TimeSeriesErrorMeasures:
+    """Error measures of a deterministic solution on a grid of N locations."""
+
+    param_names = ["metric", "N", "d", "chunk_size"]
+    params = [
+        [
+            "rmse",
+            "relative_rmse",
+            "mae",
+            "relative_mae",
+            "max_error",
+            "relative_max_error",
+            "mean_error",
+            "relative_mean_error",
+        ],
+        SIZES,
+        DIMENSIONS,
+        [None, 100],
+    ]
+
+    def setup(self, metric, N, d, chunk_size):
+        self.metric = getattr(timeseries, metric)
+        self.kwargs = {"p": 2} if "mean_error" in metric else {}
+        self.locations = np.linspace(0.0, 1.0, N)
+        shifts = np.arange(d)
+        self.approximate_solution = lambda t: np.sin(t[:, None] + shifts)
+        self.reference_solution = lambda t: np.cos(t[:, None] + shifts)
+
+    def time_metric(self, metric, N, d, chunk_size):
+        self.metric(
+            self.approximate_solution,
+            self.reference_solution,
+            self.locations,
+            chunk_size=chunk_size,
+            **self.kwargs
+        )
+
+    def peakmem_metric(self, metric, N, d, chunk_size):
+        self.metric(
+            self.approximate_solution,
+            self.reference_solution,
+            self.locations,
+            chunk_size=chunk_size,
+            **self.kwargs
+        )
+
+
+class TimeSeriesSampleAnalysis:
+    """Sample-based metrics with 100 trajectory samples on a grid of N locations."""
+
+    param_names = ["N", "d", "chunk_size"]
+    params = [SIZES, DIMENSIONS, [None, 25]]
+    num_samples = 100
+
+    def setup(self, N, d, chunk_size):
+        self.locations = np.linspace(0.0, 1.0, N)
+        self.posterior = IndependentGaussianPosterior(self.locations, d)
+
+    def time_sample_reference_distance(self, N, d, chunk_size):
+        timeseries.sample_reference_distance(
+            self.posterior,
+            self.posterior.reference_solution,
+            self.locations,
+            self.num_samples,
+            chunk_size=chunk_size,
+            random_state=1,
+        )
+
+    def peakmem_sample_reference_distance(self, N, d, chunk_size):
+        timeseries.sample_reference_distance(
+            self.posterior,
+            self.posterior.reference_solution,
+            self.locations,
+            self.num_samples,
+            chunk_size=chunk_size,
+            random_state=1,
+        )
+
+    def time_sample_sample_distance(self, N, d, chunk_size):
+        timeseries.sample_sample_distance(
+            self.posterior,
+            self.locations,
+            self.num_samples,
+            chunk_size=chunk_size,
+            random_state=1,
+        )
+
+    def peakmem_sample_sample_distance(self, N, d, chunk_size):
+        timeseries.sample_sample_distance(
+            self.posterior,
+            self.locations,
+            self.num_samples,
+            chunk_size=chunk_size,
+            random_state=1,
+        )
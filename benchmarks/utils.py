@@ -0,0 +1,15 @@
+"""Benchmarks for the utility functions."""
+
+from probnumeval import utils
+
+from ._problems import DIMENSIONS
+
+
+class Chi2ConfidenceIntervals:
+    """Confidence intervals of the chi-squared distribution."""
+
+    param_names = ["d"]
+    params = [DIMENSIONS]
+
+    def time_chi2_confidence_intervals(self, d):
+        utils.chi2_confidence_intervals(d)
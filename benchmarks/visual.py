@@ -0,0 +1,88 @@
+"""Benchmarks for the animations."""
+
+import numpy as np
+
+from probnumeval import visual
+
+from ._problems import IndependentGaussianPosterior
+
+NUM_FRAMES = [100, 1_000, 10_000]
+"""Number of frames of an animation."""
+
+GRID_SIZES = [10, 100, 1_000]
+"""Number of grid points (i.e. the dimension) of an animated sample."""
+
+
+class StandardNormalAnimations:
+    """Animations of standard Normal samples."""
+
+    param_names = ["num_frames", "d"]
+    params = [NUM_FRAMES, GRID_SIZES]
+
+    def setup(self, num_frames, d):
+        np.random.seed(42)
+
+    def time_great_circle(self, num_frames, d):
+        visual.animate_with_great_circle_of_unitsphere(d, num_frames)
+
+    def peakmem_great_circle(self, num_frames, d):
+        visual.animate_with_great_circle_of_unitsphere(d, num_frames)
+
+    def time_great_circle_in_chunks(self, num_frames, d):
+        for _ in visual.animate_with_great_circle_of_unitsphere_in_chunks(
+            d, num_frames, chunk_size=100
+        ):
+            pass
+
+    def peakmem_great_circle_in_chunks(self, num_frames, d):
+        for _ in visual.animate_with_great_circle_of_unitsphere_in_chunks(
+            d, num_frames, chunk_size=100
+        ):
+            pass
+
+    def time_periodic_gp(self, num_frames, d):
+        visual.animate_with_periodic_gp(d, num_frames)
+
+    def peakmem_periodic_gp(self, num_frames, d):
+        visual.animate_with_periodic_gp(d, num_frames)
+
+
+class GeodesicSphere:
+    """Geodesics on the sphere, evaluated at many step sizes at once."""
+
+    param_names = ["num_frames", "d"]
+    params = [NUM_FRAMES, GRID_SIZES]
+
+    def setup(self, num_frames, d):
+        rng = np.random.default_rng(42)
+        self.point = rng.normal(size=d)
+        self.point /= np.linalg.norm(self.point)
+        self.velocity = rng.normal(size=d)
+        self.step_sizes = np.linspace(0.0, 2 * np.pi, num_frames)
+
+    def time_geodesic_sphere(self, num_frames, d):
+        visual.geodesic_sphere(self.point, self.velocity, t=self.step_sizes)
+
+
+class PosteriorAnimations:
+    """Animations of marginal samples from a posterior on a grid of T locations."""
+
+    param_names = ["num_frames", "T", "method"]
+    params = [[100, 1_000], [10, 100, 1_000], ["great_circle", "periodic_gp"]]
+
+    def setup(self, num_frames, T, method):
+        np.random.seed(42)
+        self.locations = np.linspace(0.0, 1.0, T)
+        self.posterior = IndependentGaussianPosterior(self.locations, d=2)
+
+    def _animate(self, num_frames, method):
+        for _ in visual.animate_posterior_samples(
+            self.posterior, self.locations, num_frames, method=method
+        ):
+            pass
+
+    def time_animate_posterior_samples(self, num_frames, T, method):
+        self._animate(num_frames, method)
+
+    def peakmem_animate_posterior_samples(self, num_frames, T, method):
+        self._animate(num_frames, method)
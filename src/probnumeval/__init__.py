@@ -1,13 +1,38 @@
 """Evaluate probabilistic numerical algorithms."""
 
+from typing import TYPE_CHECKING
 
-from pkg_resources import DistributionNotFound, get_distribution
+try:
+    from importlib.metadata import PackageNotFoundError, version
+except ImportError:  # Python < 3.8
+    from importlib_metadata import PackageNotFoundError, version
+
+from . import _lazy
 
 try:
     # Change here if project is renamed and does not equal the package name
     dist_name = __name__
-    __version__ = get_distribution(dist_name).version
-except DistributionNotFound:
+    __version__ = version(dist_name)
+except PackageNotFoundError:
     __version__ = "unknown"
 finally:
-    del get_distribution, DistributionNotFound
+    del version, PackageNotFoundError
+
+# Submodules (and their dependencies) are only imported once they are accessed.
+__getattr__, __dir__ = _lazy.attach(
+    __name__,
+    submodules=[
+        "config",
+        "instrumentation",
+        "multivariate",
+        "timeseries",
+        "type",
+        "utils",
+        "visual",
+    ],
+    submodule_attributes={"_parallel": ["evaluate_many"]},
+)
+
+if TYPE_CHECKING:
+    # At runtime, the attributes are provided by the lazy __getattr__.
+    from ._parallel import evaluate_many
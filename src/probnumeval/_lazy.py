@@ -0,0 +1,74 @@
+"""Lazy loading of submodules and their attributes (PEP 562).
+
+Importing a package only executes its ``__init__``. Submodules (and the heavy
+dependencies they import, e.g. ``probnum`` or ``scipy.stats``) are imported on first
+access of one of their attributes. Afterwards, the attribute is cached in the
+package namespace, i.e. subsequent access costs nothing.
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def attach(
+    package_name: str,
+    submodules: Iterable[str] = (),
+    submodule_attributes: Optional[Dict[str, Iterable[str]]] = None,
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Create the module-level ``__getattr__`` and ``__dir__`` of a package.
+
+    Parameters
+    ----------
+    package_name :
+        Name of the package, i.e. ``__name__`` of its ``__init__``.
+    submodules :
+        Names of submodules that are importable as attributes of the package.
+    submodule_attributes :
+        Map from the names of submodules to the names of the attributes they provide.
+
+    Returns
+    -------
+    callable
+        Module-level ``__getattr__``.
+    callable
+        Module-level ``__dir__``.
+    """
+    submodules = set(submodules)
+    attribute_to_submodule = {
+        attribute: submodule
+        for submodule, attributes in (submodule_attributes or {}).items()
+        for attribute in attributes
+    }
+
+    def __getattr__(name):
+        if name in submodules:
+            value = importlib.import_module(f"{package_name}.{name}")
+        elif name in attribute_to_submodule:
+            submodule = importlib.import_module(
+                f"{package_name}.{attribute_to_submodule[name]}"
+            )
+            value = getattr(submodule, name)
+        elif name.startswith("_") and not name.startswith("__"):
+            # Private submodules, e.g. for tests, are importable as attributes, too.
+            try:
+                value = importlib.import_module(f"{package_name}.{name}")
+            except ModuleNotFoundError as err:
+                if err.name != f"{package_name}.{name}":
+                    raise
+                raise AttributeError(
+                    f"module {package_name!r} has no attribute {name!r}"
+                ) from None
+        else:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(
+            set(vars(sys.modules[package_name]))
+            | submodules
+            | set(attribute_to_submodule)
+        )
+
+    return __getattr__, __dir__
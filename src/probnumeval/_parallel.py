@@ -0,0 +1,53 @@
+"""Evaluate several metrics in parallel."""
+
+import concurrent.futures
+import contextvars
+from typing import Any, Callable, Iterable, List, Optional
+
+__all__ = ["evaluate_many"]
+
+
+def evaluate_many(
+    jobs: Iterable[Callable[[], Any]], max_workers: Optional[int] = None
+) -> List[Any]:
+    """Run metric jobs in a thread pool.
+
+    Each job runs in a copy of the caller's context, i.e. it sees the configuration
+    (and the active :class:`probnumeval.timeseries.EvaluationSession`) of the caller,
+    and any configuration it sets itself (e.g. with
+    :class:`probnumeval.config.covariance_inversion_context`) does not leak into
+    the other jobs.
+    Since the heavy lifting happens in NumPy and SciPy, which release the GIL,
+    threads run the jobs in parallel.
+
+    Parameters
+    ----------
+    jobs :
+        Callables without arguments, e.g. ``functools.partial`` objects of metrics.
+    max_workers :
+        Maximum number of threads. Optional. Default is the default of
+        :class:`concurrent.futures.ThreadPoolExecutor`.
+
+    Returns
+    -------
+    list
+        Results of the jobs, in the order of the jobs.
+
+    Examples
+    --------
+    >>> import functools
+    >>> import numpy as np
+    >>> from probnumeval import evaluate_many, timeseries
+    >>> locations = np.linspace(0.0, 1.0, 10)
+    >>> rmse, mae = evaluate_many(
+    ...     [
+    ...         functools.partial(timeseries.rmse, np.sin, np.sin, locations),
+    ...         functools.partial(timeseries.mae, np.sin, np.sin, locations),
+    ...     ]
+    ... )
+    >>> print(rmse, mae)
+    0.0 0.0
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, job) for job in jobs]
+        return [future.result() for future in futures]
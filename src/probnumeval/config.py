@@ -1,29 +1,113 @@
-"""Configurations for all sorts of things."""
+"""Configurations for all sorts of things.
+
+The setters change the process-wide parameters. The context managers override them
+in the current context (:mod:`contextvars`) only, i.e. each thread and each asyncio task
+sees its own values. Entering a context manager never affects evaluations that run
+concurrently in another thread or task.
+The current values are available as the read-only mappings ``COVARIANCE_INVERSION`` and
+``CONJUGATE_GRADIENTS``.
+"""
+import contextvars
+import types
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Optional
 
+# COVARIANCE_INVERSION and CONJUGATE_GRADIENTS are provided by the module __getattr__:
+# pylint: disable=undefined-all-variable
 __all__ = [
     "COVARIANCE_INVERSION",
     "covariance_inversion_context",
     "set_covariance_inversion_parameters",
+    "CONJUGATE_GRADIENTS",
+    "conjugate_gradients_context",
+    "set_conjugate_gradients_parameters",
 ]
 
-COVARIANCE_INVERSION = dict(
+_DEFAULT_COVARIANCE_INVERSION = dict(
     strategy="cholesky",
     symmetrize=True,
     damping=0.0,
 )
-"""Strategy parameters related to computing the inverse of a covariance matrix."""
+"""Strategy parameters related to computing the inverse of a covariance matrix.
+
+The strategy is one of
+
+- ``"cholesky"``: Cholesky factorization and triangular solves. Cholesky factors that
+  are precomputed in the random variables (e.g. by a square-root filter) are reused.
+- ``"cov_cholesky"``: always use the Cholesky factors of the random variables
+  (``Normal.cov_cholesky``), which are computed and cached if necessary.
+- ``"solve"``: linear solves with the covariance matrices.
+- ``"inv"``: explicit inverses of the covariance matrices.
+- ``"pinv"``: pseudo-inverses of the covariance matrices.
+- ``"auto"``: batched Cholesky factorization. Only the time steps whose covariance
+  is not (numerically) positive definite fall back to jitter and, if that does not suffice,
+  to an eigendecomposition. See :class:`probnumeval.multivariate.InversionDiagnostics`.
+- ``"cg"``: matrix-free (Jacobi-preconditioned) conjugate gradients, which only require
+  matrix-vector products with the covariances. See ``CONJUGATE_GRADIENTS``.
+"""
+
+_DEFAULT_CONJUGATE_GRADIENTS = dict(
+    rtol=1e-10,
+    maxiter=None,
+)
+"""Parameters of the conjugate-gradient iteration of the ``"cg"`` strategy.
+
+The iteration stops once the residual norm drops below ``rtol`` times the norm of the
+centered mean, or after ``maxiter`` iterations (if None, ten times the dimension).
+"""
+
+_covariance_inversion = types.MappingProxyType(_DEFAULT_COVARIANCE_INVERSION)
+_conjugate_gradients = types.MappingProxyType(_DEFAULT_CONJUGATE_GRADIENTS)
+"""Process-wide parameters, which the setters change."""
+
+_COVARIANCE_INVERSION = contextvars.ContextVar("covariance_inversion", default=None)
+_CONJUGATE_GRADIENTS = contextvars.ContextVar("conjugate_gradients", default=None)
+"""Parameters of the innermost active context manager (if any)."""
+
+_COVARIANCE_INVERSION_TOKENS = contextvars.ContextVar(
+    "covariance_inversion_tokens", default=()
+)
+_CONJUGATE_GRADIENTS_TOKENS = contextvars.ContextVar(
+    "conjugate_gradients_tokens", default=()
+)
+"""One token per active (possibly nested) context manager. The tokens live in the
+context (not in the context manager), so that the same context manager can be entered
+in several threads or tasks at once."""
+
+
+def __getattr__(name):
+    if name == "COVARIANCE_INVERSION":
+        parameters = _COVARIANCE_INVERSION.get()
+        return _covariance_inversion if parameters is None else parameters
+    if name == "CONJUGATE_GRADIENTS":
+        parameters = _CONJUGATE_GRADIENTS.get()
+        return _conjugate_gradients if parameters is None else parameters
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _enter_context(variable, tokens, parameters):
+    tokens.set(tokens.get() + (variable.set(types.MappingProxyType(parameters)),))
+
+
+def _exit_context(variable, tokens):
+    *outer_tokens, token = tokens.get()
+    tokens.set(tuple(outer_tokens))
+    variable.reset(token)
 
 
 def set_covariance_inversion_parameters(strategy, symmetrize, damping):
-    """Change parameters of covariance inversion."""
+    """Change parameters of covariance inversion (process-wide).
+
+    Active context managers take precedence.
+    """
     # pylint: disable=global-statement
-    global COVARIANCE_INVERSION
-    COVARIANCE_INVERSION = dict(
-        strategy=strategy,
-        symmetrize=symmetrize,
-        damping=damping,
+    global _covariance_inversion
+    _covariance_inversion = types.MappingProxyType(
+        dict(
+            strategy=strategy,
+            symmetrize=symmetrize,
+            damping=damping,
+        )
     )
 
 
@@ -32,22 +116,55 @@ class covariance_inversion_context:
     """Context manager for specific parameters of covariance inversion."""
 
     strategy: str
-    symmetrize: Optional[bool] = COVARIANCE_INVERSION["symmetrize"]
-    damping: Optional[float] = COVARIANCE_INVERSION["damping"]
-
-    _old_values: Optional[Dict] = None
+    symmetrize: Optional[bool] = _DEFAULT_COVARIANCE_INVERSION["symmetrize"]
+    damping: Optional[float] = _DEFAULT_COVARIANCE_INVERSION["damping"]
 
     def __enter__(self):
-        self._old_values = COVARIANCE_INVERSION.copy()
-        set_covariance_inversion_parameters(
-            strategy=self.strategy,
-            symmetrize=self.symmetrize,
-            damping=self.damping,
+        _enter_context(
+            _COVARIANCE_INVERSION,
+            _COVARIANCE_INVERSION_TOKENS,
+            dict(
+                strategy=self.strategy,
+                symmetrize=self.symmetrize,
+                damping=self.damping,
+            ),
         )
 
     def __exit__(self, *args, **kwargs):
-        set_covariance_inversion_parameters(
-            strategy=self._old_values["strategy"],
-            symmetrize=self._old_values["symmetrize"],
-            damping=self._old_values["damping"],
+        _exit_context(_COVARIANCE_INVERSION, _COVARIANCE_INVERSION_TOKENS)
+
+
+def set_conjugate_gradients_parameters(rtol, maxiter):
+    """Change parameters of the conjugate-gradient iteration (process-wide).
+
+    Active context managers take precedence.
+    """
+    # pylint: disable=global-statement
+    global _conjugate_gradients
+    _conjugate_gradients = types.MappingProxyType(
+        dict(
+            rtol=rtol,
+            maxiter=maxiter,
         )
+    )
+
+
+@dataclass
+class conjugate_gradients_context:
+    """Context manager for specific parameters of the conjugate-gradient iteration."""
+
+    rtol: float = _DEFAULT_CONJUGATE_GRADIENTS["rtol"]
+    maxiter: Optional[int] = _DEFAULT_CONJUGATE_GRADIENTS["maxiter"]
+
+    def __enter__(self):
+        _enter_context(
+            _CONJUGATE_GRADIENTS,
+            _CONJUGATE_GRADIENTS_TOKENS,
+            dict(
+                rtol=self.rtol,
+                maxiter=self.maxiter,
+            ),
+        )
+
+    def __exit__(self, *args, **kwargs):
+        _exit_context(_CONJUGATE_GRADIENTS, _CONJUGATE_GRADIENTS_TOKENS)
@@ -0,0 +1,377 @@
+"""Instrumentation of metric evaluations.
+
+Inside an :class:`Instrumentation` context, every call of a probnumeval metric
+emits one :class:`Event` per stage of the computation (e.g. evaluating the solutions,
+symmetrizing the covariances, factorizing them, reducing the discrepancies), plus one
+event for the call itself. Each event carries the wall time of the stage (with and
+without the nested stages), the size of the problem, and details such as factorization
+fallbacks. The events are passed to one or more sinks, i.e. callables that accept an
+event, like :class:`InMemorySink`, :class:`LoggingSink`, or :class:`JSONLinesSink`.
+
+Outside of an :class:`Instrumentation` context, the hooks only look up a context
+variable, i.e. their overhead is negligible. Like the configuration, the active
+instrumentation is local to the current thread (or asyncio task).
+"""
+
+import contextvars
+import dataclasses
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+__all__ = [
+    "Event",
+    "StageSummary",
+    "Instrumentation",
+    "InMemorySink",
+    "LoggingSink",
+    "JSONLinesSink",
+    "instrumented",
+    "stage",
+    "record",
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class Event:
+    """A stage of a metric evaluation.
+
+    Attributes
+    ----------
+    metric :
+        Name of the metric that the user called, e.g. ``"timeseries.anees"``.
+        None if the stage happened outside of a metric call.
+    stage :
+        Name of the stage. The stages of the built-in metrics are
+
+        - ``"call"``: the complete metric call.
+        - ``"evaluate_approximate_solution"``, ``"evaluate_reference_solution"``:
+          evaluation of the solutions on the locations.
+        - ``"stack"``: stacking the means and covariances of a list of random variables.
+        - ``"symmetrize"``: symmetrizing and damping the covariances.
+        - ``"factorize"``: factorizing (or otherwise inverting) the covariances
+          and solving.
+        - ``"reduce"``: reducing the normalized discrepancies to the metric.
+        - ``"fallback"``: some covariances could not be factorized without a fallback
+          (no wall time).
+    wall_time :
+        Wall time of the stage in seconds, including nested stages.
+    self_time :
+        Wall time of the stage in seconds, excluding nested stages that ran in the
+        same thread. Over all stages of a metric call that runs in a single thread,
+        the self times sum to the wall time of the call. Stages in other threads
+        (e.g. jobs of :func:`probnumeval.evaluate_many`) overlap in time, so they
+        are not subtracted.
+    shape :
+        Shape of the data that the stage processed,
+        e.g. (N, d, d) for a stack of covariances.
+    details :
+        Further information, e.g. the time steps that needed a fallback.
+    """
+
+    metric: Optional[str]
+    stage: str
+    wall_time: Optional[float] = None
+    self_time: Optional[float] = None
+    shape: Optional[Tuple[int, ...]] = None
+    details: Optional[Dict[str, Any]] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class StageSummary:
+    """Aggregated events of one stage of one metric.
+
+    Attributes
+    ----------
+    calls :
+        Number of events.
+    wall_time :
+        Total wall time in seconds, including nested stages.
+    self_time :
+        Total wall time in seconds, excluding nested stages.
+    """
+
+    calls: int
+    wall_time: float
+    self_time: float
+
+
+class Instrumentation:
+    """Context manager that passes events of all metric evaluations to sinks.
+
+    Parameters
+    ----------
+    sinks :
+        Callables that accept an :class:`Event`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from probnumeval import instrumentation, timeseries
+    >>> stats = instrumentation.InMemorySink()
+    >>> with instrumentation.Instrumentation(stats):
+    ...     rmse = timeseries.rmse(np.sin, np.cos, np.linspace(0.0, 1.0, 10))
+    >>> print(sorted(stage for (_, stage) in stats.summary()))
+    ['call', 'evaluate_approximate_solution', 'evaluate_reference_solution']
+    >>> print(stats.summary()["timeseries.rmse", "call"].calls)
+    1
+    """
+
+    def __init__(self, *sinks: Callable[[Event], None]):
+        if not sinks:
+            raise ValueError("The instrumentation needs at least one sink.")
+        self.sinks = list(sinks)
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self):
+        self._token = _ACTIVE_INSTRUMENTATION.set(self)
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        _ACTIVE_INSTRUMENTATION.reset(self._token)
+        self._token = None
+
+    def emit(self, event: Event):
+        """Pass an event to all sinks."""
+        for sink in self.sinks:
+            sink(event)
+
+
+class InMemorySink:
+    """Sink that stores all events.
+
+    Events can be emitted from several threads at once.
+    """
+
+    def __init__(self):
+        self.events: List[Event] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self) -> Dict[Tuple[Optional[str], str], StageSummary]:
+        """Number of calls and total wall times per metric and stage."""
+        summaries = {}
+        for event in list(self.events):
+            key = (event.metric, event.stage)
+            calls, wall_time, self_time = (
+                dataclasses.astuple(summaries[key])
+                if key in summaries
+                else (0, 0.0, 0.0)
+            )
+            summaries[key] = StageSummary(
+                calls=calls + 1,
+                wall_time=wall_time + (event.wall_time or 0.0),
+                self_time=self_time + (event.self_time or 0.0),
+            )
+        return summaries
+
+
+class LoggingSink:
+    """Sink that logs every event.
+
+    Parameters
+    ----------
+    logger :
+        Logger. Optional. Default is the ``"probnumeval"`` logger.
+    level :
+        Logging level. Optional. Default is ``logging.INFO``.
+    """
+
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.INFO
+    ):
+        self.logger = logger if logger is not None else logging.getLogger("probnumeval")
+        self.level = level
+
+    def __call__(self, event: Event):
+        self.logger.log(
+            self.level,
+            "%s: %s (wall time %s s, self time %s s, shape %s, details %s)",
+            event.metric,
+            event.stage,
+            event.wall_time,
+            event.self_time,
+            event.shape,
+            event.details,
+        )
+
+
+class JSONLinesSink:
+    """Sink that writes every event as one line of JSON.
+
+    Parameters
+    ----------
+    file :
+        Path of the file (to which the events are appended), or a writable text
+        file object. A file that is opened by the sink is closed with :meth:`close`,
+        or at the end of a ``with`` block.
+    """
+
+    def __init__(self, file):
+        if isinstance(file, (str, os.PathLike)):
+            self._file = open(  # pylint: disable=consider-using-with
+                file, "a", encoding="utf-8"
+            )
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        line = json.dumps(dataclasses.asdict(event), default=_to_json)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        """Close the file, if it was opened by the sink."""
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+
+def _to_json(value):
+    """Convert NumPy arrays and scalars (e.g. in the details of an event)."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_ACTIVE_INSTRUMENTATION = contextvars.ContextVar("instrumentation", default=None)
+"""Instrumentation that is currently active (if any)."""
+
+_CURRENT_STAGE = contextvars.ContextVar("instrumented_stage", default=None)
+"""Innermost stage that is currently running (if any)."""
+
+
+class stage:
+    """Context manager that times a stage of a metric evaluation.
+
+    Stages can be nested. The time spent in nested stages is subtracted from
+    the self time of the enclosing stage, unless they run in another thread.
+
+    Parameters
+    ----------
+    name :
+        Name of the stage.
+    shape :
+        Shape of the data that the stage processes. Optional.
+    metric :
+        Name of the metric. Optional. Default is the metric of the enclosing stage.
+    """
+
+    __slots__ = (
+        "name",
+        "shape",
+        "metric",
+        "_instrumentation",
+        "_start",
+        "_nested_time",
+        "_token",
+        "_thread",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        shape: Optional[Tuple[int, ...]] = None,
+        metric: Optional[str] = None,
+    ):
+        self.name = name
+        self.shape = shape
+        self.metric = metric
+        self._instrumentation = None
+        self._start = 0.0
+        self._nested_time = 0.0
+        self._token = None
+        self._thread = None
+
+    def __enter__(self):
+        self._instrumentation = _ACTIVE_INSTRUMENTATION.get()
+        if self._instrumentation is None:
+            return self
+
+        enclosing_stage = _CURRENT_STAGE.get()
+        if self.metric is None and enclosing_stage is not None:
+            self.metric = enclosing_stage.metric
+        self._nested_time = 0.0
+        self._thread = threading.get_ident()
+        self._token = _CURRENT_STAGE.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        if self._instrumentation is None:
+            return
+        wall_time = time.perf_counter() - self._start
+        _CURRENT_STAGE.reset(self._token)
+        enclosing_stage = _CURRENT_STAGE.get()
+        # Jobs of evaluate_many share the enclosing stage of the calling thread.
+        if enclosing_stage is not None and enclosing_stage._thread == self._thread:
+            enclosing_stage._nested_time += wall_time
+        self._instrumentation.emit(
+            Event(
+                metric=self.metric,
+                stage=self.name,
+                wall_time=wall_time,
+                self_time=wall_time - self._nested_time,
+                shape=None if self.shape is None else tuple(self.shape),
+            )
+        )
+
+
+def instrumented(metric: str):
+    """Decorate a metric, such that its calls are instrumented.
+
+    Calls of instrumented metrics inside another instrumented metric are part of the
+    outer call, i.e. their stages are attributed to the outer metric.
+
+    Parameters
+    ----------
+    metric :
+        Name of the metric in the events, e.g. ``"timeseries.anees"``.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def instrumented_function(*args, **kwargs):
+            if (
+                _ACTIVE_INSTRUMENTATION.get() is None
+                or _CURRENT_STAGE.get() is not None
+            ):
+                return function(*args, **kwargs)
+            with stage("call", metric=metric):
+                return function(*args, **kwargs)
+
+        return instrumented_function
+
+    return decorator
+
+
+def record(name: str, shape: Optional[Tuple[int, ...]] = None, **details):
+    """Emit an event without wall time, e.g. to report a factorization fallback."""
+    instrumentation = _ACTIVE_INSTRUMENTATION.get()
+    if instrumentation is None:
+        return
+    enclosing_stage = _CURRENT_STAGE.get()
+    instrumentation.emit(
+        Event(
+            metric=None if enclosing_stage is None else enclosing_stage.metric,
+            stage=name,
+            shape=None if shape is None else tuple(shape),
+            details=details,
+        )
+    )
@@ -1,26 +1,64 @@
 """Error analysis and calibration analysis for finite-dimensional problems."""
 
-from ._calibration_measures import anees, inclination_index, non_credibility_index
-from ._error_measures import (
-    mae,
-    max_error,
-    mean_error,
-    relative_mae,
-    relative_max_error,
-    relative_mean_error,
-    relative_rmse,
-    rmse,
-)
-from ._sample_analysis import (
-    gaussianity_p_value,
-    sample_reference_distance,
-    sample_sample_distance,
+from probnumeval import _lazy
+
+# The submodules (and their dependencies, e.g. probnum and scipy) are only imported
+# once one of their attributes is accessed.
+__getattr__, __dir__ = _lazy.attach(
+    __name__,
+    submodule_attributes={
+        "_accumulators": [
+            "ANEESAccumulator",
+            "CalibrationAccumulator",
+            "MeanErrorAccumulator",
+            "RelativeMeanErrorAccumulator",
+        ],
+        "_calibration_measures": [
+            "anees",
+            "inclination_index",
+            "non_credibility_index",
+        ],
+        "_calibration_monitor": [
+            "SlidingWindowCalibrationMonitor",
+            "sliding_window_calibration",
+        ],
+        "_calibration_report": ["CalibrationReport", "calibration_report"],
+        "_error_measures": [
+            "mae",
+            "max_error",
+            "mean_error",
+            "relative_mae",
+            "relative_max_error",
+            "relative_mean_error",
+            "relative_rmse",
+            "rmse",
+        ],
+        "_inversion_diagnostics": ["InversionDiagnostics", "InversionRecord"],
+        "_sample_analysis": [
+            "gaussianity_p_value",
+            "mean_sample_sample_distance",
+            "sample_reference_distance",
+            "sample_sample_distance",
+        ],
+        "_two_sample": [
+            "energy_distance",
+            "linear_time_mmd",
+            "random_features_mmd",
+            "sliced_wasserstein_distance",
+        ],
+    },
 )
 
+# The names are provided by the lazy __getattr__:
+# pylint: disable=undefined-all-variable
 __all__ = [
     "anees",
     "non_credibility_index",
     "inclination_index",
+    "calibration_report",
+    "CalibrationReport",
+    "sliding_window_calibration",
+    "SlidingWindowCalibrationMonitor",
     "rmse",
     "relative_rmse",
     "mae",
@@ -32,4 +70,15 @@ __all__ = [
     "gaussianity_p_value",
     "sample_reference_distance",
     "sample_sample_distance",
+    "mean_sample_sample_distance",
+    "sliced_wasserstein_distance",
+    "MeanErrorAccumulator",
+    "RelativeMeanErrorAccumulator",
+    "ANEESAccumulator",
+    "CalibrationAccumulator",
+    "linear_time_mmd",
+    "random_features_mmd",
+    "energy_distance",
+    "InversionDiagnostics",
+    "InversionRecord",
 ]
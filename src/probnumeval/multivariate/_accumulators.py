@@ -0,0 +1,282 @@
+"""Accumulate error and calibration measures incrementally.
+
+The accumulators process data chunk by chunk (e.g. while a filter is running),
+and their result coincides with the result of the respective function on the full data.
+"""
+
+import numpy as np
+
+from probnumeval import utils
+
+from . import _inversion_diagnostics
+from ._calibration_measures import (
+    _compute_normalized_discrepancies,
+    _compute_normalized_discrepancies_shared_covariance,
+    _ii_from_discrepancies,
+    _nci_from_discrepancies,
+)
+from ._calibration_report import CalibrationReport
+
+__all__ = [
+    "MeanErrorAccumulator",
+    "RelativeMeanErrorAccumulator",
+    "ANEESAccumulator",
+    "CalibrationAccumulator",
+]
+
+# The following pylint-exception is for the access of the diagnostics recorder:
+# pylint: disable=protected-access
+
+
+class MeanErrorAccumulator:
+    """Accumulate the mean error incrementally.
+
+    The result coincides with :func:`mean_error` on the concatenation of all chunks.
+
+    Parameters
+    ----------
+    p :
+        Order of the underlying norm.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> accumulator = MeanErrorAccumulator(p=2)
+    >>> accumulator.update(np.ones((3, 2)), None, np.zeros((3, 2)))
+    >>> accumulator.update(np.ones((2, 2)), None, np.zeros((2, 2)))
+    >>> print(accumulator.result())
+    1.0
+    """
+
+    def __init__(self, p: int):
+        self.p = p
+        self.size = 0
+        self._accumulated_error = 0.0
+
+    def update(self, mean_chunk, cov_chunk, reference_chunk):
+        """Process a chunk of data.
+
+        Parameters
+        ----------
+        mean_chunk :
+            Chunk of the approximate solution.
+        cov_chunk :
+            Covariances of the approximate solution. Ignored by the error measures;
+            the argument only exists for a common interface of all accumulators.
+        reference_chunk :
+            Chunk of the reference solution.
+        """
+        # pylint: disable=unused-argument
+        reference_chunk = np.asarray(reference_chunk)
+        diff = np.abs(self._difference(np.asarray(mean_chunk), reference_chunk))
+        diff = diff.flatten()
+
+        self.size += reference_chunk.size
+        if np.isinf(self.p):
+            self._accumulated_error = max(
+                self._accumulated_error, np.amax(diff, initial=0.0)
+            )
+        else:
+            self._accumulated_error += np.sum(diff ** self.p)
+
+    def result(self):
+        """Mean error of all data processed so far."""
+        if self.size == 0:
+            return np.nan
+        if np.isinf(self.p):
+            return self._accumulated_error
+        return (self._accumulated_error / self.size) ** (1.0 / self.p)
+
+    @staticmethod
+    def _difference(mean_chunk, reference_chunk):
+        return mean_chunk - reference_chunk
+
+
+class RelativeMeanErrorAccumulator(MeanErrorAccumulator):
+    """Accumulate the relative mean error incrementally.
+
+    The result coincides with :func:`relative_mean_error` on the concatenation of all chunks.
+
+    Parameters
+    ----------
+    p :
+        Order of the underlying norm.
+    """
+
+    @staticmethod
+    def _difference(mean_chunk, reference_chunk):
+        return (mean_chunk - reference_chunk) / reference_chunk
+
+
+class ANEESAccumulator:
+    """Accumulate the average normalised estimation error squared incrementally.
+
+    The result coincides with :func:`anees` on the concatenation of all chunks.
+    Only a running sum is stored, so the memory footprint does not grow with the
+    number of processed time steps.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._sum_discrepancies = 0.0
+
+    def update(self, mean_chunk, cov_chunk, reference_chunk):
+        """Process a chunk of data.
+
+        Parameters
+        ----------
+        mean_chunk :
+            **Shape (N, d) or (d,).** Means of the approximate solution.
+        cov_chunk :
+            **Shape (N, d, d) or (d, d).** Covariances of the approximate solution.
+        reference_chunk :
+            **Shape (N, d) or (d,).** Reference solution.
+        """
+        centered_mean, cov_matrices = _center_chunk(
+            mean_chunk, cov_chunk, reference_chunk
+        )
+        normalized_discrepancies = _compute_normalized_discrepancies(
+            centered_mean, cov_matrices
+        )
+        self.count += len(normalized_discrepancies)
+        self._sum_discrepancies += np.sum(normalized_discrepancies)
+
+    def result(self):
+        """ANEES of all data processed so far."""
+        if self.count == 0:
+            return np.nan
+        return self._sum_discrepancies / self.count
+
+
+class CalibrationAccumulator:
+    """Accumulate ANEES, non-credibility index, and inclination index incrementally.
+
+    The result coincides with :func:`calibration_report` on the concatenation of all chunks.
+    The sample covariance of the centered means, which the NCI and the II compare
+    against, is updated online (with a Welford-style merge of each chunk).
+    Since every reference discrepancy depends on the final sample covariance,
+    the centered means (not the covariances) of all processed time steps are stored.
+
+    Parameters
+    ----------
+    perc :
+        Confidence level of the chi-squared confidence interval. Optional. Default is 0.95.
+    """
+
+    def __init__(self, perc: float = 0.95):
+        self.perc = perc
+        self._sample_covariance = _RunningCovariance()
+        self._centered_means = []
+        self._normalized_discrepancies = []
+        self._sum_discrepancies = 0.0
+        self._first_step = None
+
+    @property
+    def count(self):
+        """Number of processed time steps."""
+        return self._sample_covariance.count
+
+    def update(self, mean_chunk, cov_chunk, reference_chunk):
+        """Process a chunk of data.
+
+        Parameters
+        ----------
+        mean_chunk :
+            **Shape (N, d) or (d,).** Means of the approximate solution.
+        cov_chunk :
+            **Shape (N, d, d) or (d, d).** Covariances of the approximate solution.
+        reference_chunk :
+            **Shape (N, d) or (d,).** Reference solution.
+        """
+        centered_mean, cov_matrices = _center_chunk(
+            mean_chunk, cov_chunk, reference_chunk
+        )
+        if self._first_step is None:
+            self._first_step = _inversion_diagnostics._next_step()
+        normalized_discrepancies = _compute_normalized_discrepancies(
+            centered_mean, cov_matrices
+        )
+        self._sum_discrepancies += np.sum(normalized_discrepancies)
+        self._normalized_discrepancies.append(normalized_discrepancies)
+        self._centered_means.append(centered_mean)
+        self._sample_covariance.update(centered_mean)
+
+    def result(self) -> CalibrationReport:
+        """Calibration measures of all data processed so far."""
+        if self.count < 2:
+            nan = float("nan")
+            return CalibrationReport(
+                anees=self._sum_discrepancies / self.count if self.count else nan,
+                non_credibility_index=nan,
+                inclination_index=nan,
+                chi2_confidence_interval=(nan, nan),
+            )
+
+        centered_mean = np.concatenate(self._centered_means)
+        normalized_discrepancies = np.concatenate(self._normalized_discrepancies)
+        self._centered_means = [centered_mean]
+        self._normalized_discrepancies = [normalized_discrepancies]
+
+        with _inversion_diagnostics._revisit_steps(self._first_step):
+            reference_discrepancies = (
+                _compute_normalized_discrepancies_shared_covariance(
+                    centered_mean, self._sample_covariance.covariance()
+                )
+            )
+        return CalibrationReport(
+            anees=self._sum_discrepancies / self.count,
+            non_credibility_index=_nci_from_discrepancies(
+                normalized_discrepancies, reference_discrepancies
+            ),
+            inclination_index=_ii_from_discrepancies(
+                normalized_discrepancies, reference_discrepancies
+            ),
+            chi2_confidence_interval=utils.chi2_confidence_intervals(
+                dim=centered_mean.shape[1], perc=self.perc
+            ),
+        )
+
+
+class _RunningCovariance:
+    """Sample covariance that is updated with one chunk of samples at a time.
+
+    Chunks are merged with the pairwise update formula of Chan et al.,
+    which is numerically more robust than accumulating raw second moments.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self.scatter = None
+
+    def update(self, samples):
+        samples = np.atleast_2d(samples)
+        chunk_count = len(samples)
+        chunk_mean = np.mean(samples, axis=0)
+        chunk_centered = samples - chunk_mean
+        chunk_scatter = chunk_centered.T @ chunk_centered
+
+        if self.count == 0:
+            self.count, self.mean, self.scatter = chunk_count, chunk_mean, chunk_scatter
+            return
+
+        total_count = self.count + chunk_count
+        delta = chunk_mean - self.mean
+        self.mean = self.mean + delta * chunk_count / total_count
+        self.scatter = (
+            self.scatter
+            + chunk_scatter
+            + np.outer(delta, delta) * self.count * chunk_count / total_count
+        )
+        self.count = total_count
+
+    def covariance(self):
+        """Unbiased sample covariance (like ``np.cov``)."""
+        return self.scatter / (self.count - 1)
+
+
+def _center_chunk(mean_chunk, cov_chunk, reference_chunk):
+    centered_mean = np.atleast_2d(np.asarray(mean_chunk) - np.asarray(reference_chunk))
+    dim = centered_mean.shape[1]
+    cov_matrices = np.asarray(cov_chunk).reshape((-1, dim, dim))
+    return centered_mean, cov_matrices
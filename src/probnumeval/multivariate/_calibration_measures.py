@@ -1,13 +1,21 @@
 """Uncertainty calibration measures."""
 
-from typing import Union
+import functools
+from typing import Optional, Union
 
 import numpy as np
 import scipy.linalg
 import scipy.stats
 from probnum import _randomvariablelist, randvars
 
-from probnumeval import config
+from probnumeval import config, instrumentation
+
+from . import (
+    _inversion_diagnostics,
+    _matrix_free,
+    _robust_inversion,
+    _structured_covariances,
+)
 
 __all__ = [
     "anees",
@@ -19,11 +27,13 @@ __all__ = [
 # pylint: disable=protected-access
 
 
+@instrumentation.instrumented("multivariate.anees")
 def anees(
     approximate_solution: Union[
         randvars.Normal, _randomvariablelist._RandomVariableList
     ],
     reference_solution: np.ndarray,
+    precision_matrices: Optional[np.ndarray] = None,
 ):
     r"""Compute the average normalised estimation error squared.
 
@@ -49,6 +59,9 @@ def anees(
         Approximate solution as returned by a (Gaussian) probabilistic numerical method.
     reference_solution :
         Reference solution. This is an array, because it must be a deterministic point-estimate.
+    precision_matrices :
+        **Shape (N, d, d).** Precision matrices (i.e. inverse covariances) of the approximate solution.
+        Optional. If provided, they are used instead of inverting the covariances.
 
     Returns
     -------
@@ -62,21 +75,17 @@ def anees(
         An alternative calibration measure.
 
     """
-    centered_mean = approximate_solution.mean - reference_solution
-    cov_matrices = approximate_solution.cov
-
-    centered_mean = np.atleast_2d(centered_mean)
-    cov_matrices = np.atleast_3d(cov_matrices)
-
-    normalized_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, cov_matrices
+    _, normalized_discrepancies = _compute_solution_discrepancies(
+        approximate_solution, reference_solution, precision_matrices
     )
-    return np.mean(normalized_discrepancies)
+    return _anees_from_discrepancies(normalized_discrepancies)
 
 
+@instrumentation.instrumented("multivariate.non_credibility_index")
 def non_credibility_index(
     approximate_solution: _randomvariablelist._RandomVariableList,
     reference_solution: np.ndarray,
+    precision_matrices: Optional[np.ndarray] = None,
 ):
     r"""Compute the non-credibility index (NCI).
 
@@ -90,6 +99,9 @@ def non_credibility_index(
         Approximate solution as returned by a (Gaussian) probabilistic numerical method.
     reference_solution :
         Reference solution. This is an array, because it must be a deterministic point-estimate.
+    precision_matrices :
+        **Shape (N, d, d).** Precision matrices (i.e. inverse covariances) of the approximate solution.
+        Optional. If provided, they are used instead of inverting the covariances.
 
     Returns
     -------
@@ -108,38 +120,23 @@ def non_credibility_index(
             "The non-credibility index is only valid for a collection of random variables."
         )
 
-    centered_mean = approximate_solution.mean - reference_solution
-    cov_matrices = approximate_solution.cov
-
-    centered_mean = np.atleast_2d(centered_mean)
-    cov_matrices = np.atleast_3d(cov_matrices)
-
-    normalized_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, cov_matrices
+    first_step = _inversion_diagnostics._next_step()
+    centered_mean, normalized_discrepancies = _compute_solution_discrepancies(
+        approximate_solution, reference_solution, precision_matrices
     )
-
-    sample_covariance_matrix = np.tile(
-        np.cov(centered_mean.T), reps=(len(centered_mean), 1, 1)
+    reference_discrepancies = _compute_reference_discrepancies(
+        centered_mean, first_step
     )
-
-    reference_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, sample_covariance_matrix
-    )
-    nci = 10 * (
-        np.mean(
-            np.abs(
-                np.log10(normalized_discrepancies) - np.log10(reference_discrepancies)
-            )
-        )
-    )
-    return nci
+    return _nci_from_discrepancies(normalized_discrepancies, reference_discrepancies)
 
 
+@instrumentation.instrumented("multivariate.inclination_index")
 def inclination_index(
     approximate_solution: Union[
         randvars.Normal, _randomvariablelist._RandomVariableList
     ],
     reference_solution: np.ndarray,
+    precision_matrices: Optional[np.ndarray] = None,
 ):
     r"""Compute the inclination index (II).
 
@@ -154,6 +151,9 @@ def inclination_index(
         Approximate solution as returned by a (Gaussian) probabilistic numerical method.
     reference_solution :
         Reference solution. This is an array, because it must be a deterministic point-estimate.
+    precision_matrices :
+        **Shape (N, d, d).** Precision matrices (i.e. inverse covariances) of the approximate solution.
+        Optional. If provided, they are used instead of inverting the covariances.
 
     Returns
     -------
@@ -171,51 +171,413 @@ def inclination_index(
             "The inclination index is only valid for a collection of random variables."
         )
 
-    cov_matrices = approximate_solution.cov
-    centered_mean = approximate_solution.mean - reference_solution
+    first_step = _inversion_diagnostics._next_step()
+    centered_mean, normalized_discrepancies = _compute_solution_discrepancies(
+        approximate_solution, reference_solution, precision_matrices
+    )
+    reference_discrepancies = _compute_reference_discrepancies(
+        centered_mean, first_step
+    )
+    return _ii_from_discrepancies(normalized_discrepancies, reference_discrepancies)
 
+
+def _center_and_stack(approximate_solution, reference_solution):
+    """Stack the centered means and the covariances of the approximate solution.
+
+    Dense covariances are stacked into an array of shape (N, d, d). Covariances that are
+    linear operators are kept as a list, so their structure can be exploited.
+    """
+    if isinstance(approximate_solution, _randomvariablelist._RandomVariableList):
+        random_variables = list(approximate_solution)
+    else:
+        random_variables = [approximate_solution]
+    num_steps = len(random_variables)
+
+    with instrumentation.stage("stack", shape=(num_steps,)):
+        cov_matrices = [rv.cov for rv in random_variables]
+        if _structured_covariances._contains_linear_operators(cov_matrices):
+            mean = np.stack([np.ravel(rv.mean) for rv in random_variables])
+            centered_mean = mean - np.reshape(reference_solution, mean.shape)
+            return centered_mean, cov_matrices
+
+        centered_mean = approximate_solution.mean - reference_solution
+        centered_mean = np.reshape(centered_mean, (num_steps, -1))
+        dim = centered_mean.shape[1]
+        cov_matrices = np.reshape(approximate_solution.cov, (num_steps, dim, dim))
+        return centered_mean, cov_matrices
+
+
+def _stack_cholesky_factors(approximate_solution, centered_mean):
+    """Stack the Cholesky factors of the covariances of the approximate solution, if
+    they shall be used.
+
+    For the ``"cholesky"`` strategy, the factors are reused if all random variables
+    carry a precomputed one (e.g. from a square-root filter).
+    The ``"cov_cholesky"`` strategy always uses the random variables' factors and
+    computes (and caches) them if necessary.
+    The factors are not used by either strategy if they do not factorize the
+    covariances that are configured, i.e. if the covariances are damped, or if they
+    are symmetrized and not already symmetric. Then, the damped and symmetrized
+    covariances are factorized instead.
+
+    Returns
+    -------
+    np.ndarray or None
+        **Shape (N, d, d).** Lower Cholesky factors, or None if they shall not be used.
+    """
+    if isinstance(approximate_solution, _randomvariablelist._RandomVariableList):
+        random_variables = list(approximate_solution)
+    else:
+        random_variables = [approximate_solution]
+
+    num_steps, dim = centered_mean.shape
+    strategy = config.COVARIANCE_INVERSION["strategy"]
+    reusable = (
+        strategy in ("cholesky", "cov_cholesky")
+        and config.COVARIANCE_INVERSION["damping"] == 0.0
+        and all(isinstance(rv, randvars.Normal) for rv in random_variables)
+        and (
+            strategy == "cov_cholesky"
+            or all(rv.cov_cholesky_is_precomputed for rv in random_variables)
+        )
+    )
+    if reusable:
+        cov_matrices = [rv.cov for rv in random_variables]
+        reusable = not _structured_covariances._contains_linear_operators(cov_matrices)
+    if reusable and config.COVARIANCE_INVERSION["symmetrize"]:
+        cov_matrices = np.reshape(cov_matrices, (num_steps, dim, dim))
+        reusable = np.allclose(cov_matrices, np.swapaxes(cov_matrices, -1, -2))
+
+    if not reusable:
+        return None
+    cholesky_factors = [rv.cov_cholesky for rv in random_variables]
+    return np.reshape(cholesky_factors, (num_steps, dim, dim))
+
+
+def _compute_solution_discrepancies(
+    approximate_solution, reference_solution, precision_matrices=None
+):
+    """Center the approximate solution and compute its normalized discrepancies."""
+    centered_mean, cov_matrices = _center_and_stack(
+        approximate_solution, reference_solution
+    )
     normalized_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, cov_matrices
+        centered_mean,
+        cov_matrices,
+        cholesky_factors=_stack_cholesky_factors(approximate_solution, centered_mean),
+        precision_matrices=precision_matrices,
     )
+    return centered_mean, normalized_discrepancies
 
-    sample_covariance_matrix = np.tile(
-        np.cov(centered_mean.T), reps=(len(centered_mean), 1, 1)
+
+def _compute_reference_discrepancies(centered_mean, first_step):
+    """Normalized discrepancies w.r.t. the sample covariance of the centered mean.
+
+    ``first_step`` is the index that the inversion diagnostics assigned to the first
+    time step of the centered mean.
+    """
+    sample_covariance_matrix = np.atleast_2d(np.cov(centered_mean.T))
+    with _inversion_diagnostics._revisit_steps(first_step):
+        return _compute_normalized_discrepancies_shared_covariance(
+            centered_mean, sample_covariance_matrix
+        )
+
+
+def _anees_from_discrepancies(normalized_discrepancies):
+    with instrumentation.stage("reduce", shape=np.shape(normalized_discrepancies)):
+        return np.mean(normalized_discrepancies)
+
+
+def _nci_from_discrepancies(normalized_discrepancies, reference_discrepancies):
+    with instrumentation.stage("reduce", shape=np.shape(normalized_discrepancies)):
+        return 10 * (
+            np.mean(
+                np.abs(
+                    np.log10(normalized_discrepancies)
+                    - np.log10(reference_discrepancies)
+                )
+            )
+        )
+
+
+def _ii_from_discrepancies(normalized_discrepancies, reference_discrepancies):
+    with instrumentation.stage("reduce", shape=np.shape(normalized_discrepancies)):
+        return 10 * (
+            np.mean(np.log10(normalized_discrepancies))
+            - np.mean(np.log10(reference_discrepancies))
+        )
+
+
+def _compute_normalized_discrepancies(
+    centered_mean, cov_matrices, cholesky_factors=None, precision_matrices=None
+):
+    r"""Compute the normalized discrepancies of a stack of centered means.
+
+    All N quadratic forms :math:`m_n^\top C_n^{-1} m_n` are evaluated at once,
+    i.e. the covariances are symmetrized and damped in bulk and
+    one stacked factorization (and solve) is computed per call.
+
+    Parameters
+    ----------
+    centered_mean :
+        **Shape (N, d).** Stack of centered means.
+    cov_matrices :
+        **Shape (N, d, d).** Stack of covariance matrices. Alternatively, a list of
+        linear operators (or, for the ``"cg"`` strategy, of matvec callables).
+    cholesky_factors :
+        **Shape (N, d, d).** Lower Cholesky factors of the covariance matrices. Optional.
+        If provided, no covariance matrix is factorized.
+    precision_matrices :
+        **Shape (N, d, d).** Inverses of the covariance matrices. Optional.
+        If provided, no covariance matrix is inverted.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (N,).** Normalized discrepancies.
+    """
+    centered_mean = np.asarray(centered_mean)
+    with instrumentation.stage("factorize", shape=np.shape(cov_matrices)):
+        if precision_matrices is not None:
+            precision_matrices = np.reshape(
+                precision_matrices, centered_mean.shape + centered_mean.shape[-1:]
+            )
+            return np.einsum(
+                "ni,nij,nj->n", centered_mean, precision_matrices, centered_mean
+            )
+        if cholesky_factors is not None:
+            whitened_mean = _batched_forward_substitution(
+                cholesky_factors, centered_mean
+            )
+            return np.einsum("ni,ni->n", whitened_mean, whitened_mean)
+        if config.COVARIANCE_INVERSION["strategy"] == "cg":
+            return _matrix_free._conjugate_gradient_discrepancies(
+                centered_mean, cov_matrices
+            )
+
+        if _structured_covariances._contains_linear_operators(cov_matrices):
+            return _compute_structured_discrepancies(centered_mean, cov_matrices)
+
+        cov_matrices = np.asarray(cov_matrices)
+        diagonals = _structured_covariances._diagonals_if_diagonal(cov_matrices)
+        if diagonals is not None:
+            normalized_discrepancies = _structured_covariances._diagonal_discrepancies(
+                centered_mean, diagonals
+            )
+            if normalized_discrepancies is not None:
+                return normalized_discrepancies
+        return _compute_dense_discrepancies(centered_mean, cov_matrices)
+
+
+def _compute_structured_discrepancies(centered_mean, cov_matrices):
+    """Compute the normalized discrepancies for a list of covariance operators.
+
+    The covariances are grouped by their structure (diagonal, Kronecker, low-rank plus
+    diagonal), and each group is processed with the matching fast path. Everything else
+    (and every group to which the fast path does not apply) is densified.
+    """
+    normalized_discrepancies = np.empty(len(centered_mean))
+    groups = _structured_covariances._group_by_structure(cov_matrices)
+    for (kind, *_), (indices, representations) in groups.items():
+        group_discrepancies = None
+        if kind in _structured_covariances._FAST_PATHS:
+            group_discrepancies = _structured_covariances._FAST_PATHS[kind](
+                centered_mean[indices], *representations
+            )
+        if group_discrepancies is None:
+            group_dense_covs = (
+                representations[0]
+                if kind == "dense"
+                else np.stack(
+                    [_structured_covariances._todense(cov_matrices[i]) for i in indices]
+                )
+            )
+            group_discrepancies = _compute_dense_discrepancies(
+                centered_mean[indices], group_dense_covs
+            )
+        normalized_discrepancies[indices] = group_discrepancies
+    return normalized_discrepancies
+
+
+def _compute_dense_discrepancies(centered_mean, cov_matrices):
+    """Compute the normalized discrepancies for a dense stack of covariance matrices."""
+    strategy = _resolve_strategy(_DENSE_STRATEGIES)
+    return strategy(centered_mean, _symmetrize_and_damp(cov_matrices))
+
+
+def _compute_normalized_discrepancies_shared_covariance(centered_mean, cov_matrix):
+    """Compute the normalized discrepancies of a stack of centered means that all
+    share the same covariance matrix.
+
+    The covariance matrix is factorized once and all N quadratic forms are evaluated
+    with a single solve, which requires :math:`O(Nd + d^2)` memory
+    instead of the :math:`O(Nd^2)` of a tiled covariance stack.
+
+    Parameters
+    ----------
+    centered_mean :
+        **Shape (N, d).** Stack of centered means.
+    cov_matrix :
+        **Shape (d, d).** Covariance matrix.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (N,).** Normalized discrepancies.
+    """
+    with instrumentation.stage("factorize", shape=np.shape(cov_matrix)):
+        shared_covariance_discrepancies = _factorize_shared_covariance(cov_matrix)
+        return shared_covariance_discrepancies(np.asarray(centered_mean))
+
+
+def _factorize_shared_covariance(cov_matrix):
+    """Factorize a covariance matrix that a stack of centered means shares.
+
+    The factorization can be reused for several stacks of centered means,
+    e.g. for all chunks of a long grid of locations.
+
+    Parameters
+    ----------
+    cov_matrix :
+        **Shape (d, d).** Covariance matrix.
+
+    Returns
+    -------
+    callable
+        Function that maps a stack of centered means (of shape (N, d))
+        to their normalized discrepancies (of shape (N,)).
+    """
+    factorize = _resolve_strategy(_SHARED_COVARIANCE_FACTORIZATIONS)
+    if config.COVARIANCE_INVERSION["strategy"] == "cg":
+        return factorize(cov_matrix)
+    return factorize(_symmetrize_and_damp(np.asarray(cov_matrix)))
+
+
+def _resolve_strategy(strategies):
+    """Look up the function that implements the configured strategy (once per call)."""
+    try:
+        return strategies[config.COVARIANCE_INVERSION["strategy"]]
+    except KeyError:
+        raise ValueError("Covariance inversion parameters are not known.") from None
+
+
+def _dense_inv(centered_mean, cov_matrices):
+    return np.einsum(
+        "ni,nij,nj->n", centered_mean, np.linalg.inv(cov_matrices), centered_mean
+    )
+
+
+def _dense_pinv(centered_mean, cov_matrices):
+    return np.einsum(
+        "ni,nij,nj->n", centered_mean, np.linalg.pinv(cov_matrices), centered_mean
     )
 
-    reference_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, sample_covariance_matrix
+
+def _dense_solve(centered_mean, cov_matrices):
+    solution = np.linalg.solve(cov_matrices, centered_mean[..., None])[..., 0]
+    return np.einsum("ni,ni->n", centered_mean, solution)
+
+
+def _dense_cholesky(centered_mean, cov_matrices):
+    cholesky_factors = np.linalg.cholesky(cov_matrices)
+    whitened_mean = _batched_forward_substitution(cholesky_factors, centered_mean)
+    return np.einsum("ni,ni->n", whitened_mean, whitened_mean)
+
+
+def _dense_auto(centered_mean, cov_matrices):
+    return _robust_inversion._robust_cholesky_discrepancies(
+        centered_mean, cov_matrices, whiten=_batched_forward_substitution
     )
-    ii = 10 * (
-        np.mean(np.log10(normalized_discrepancies))
-        - np.mean(np.log10(reference_discrepancies))
+
+
+def _shared_inv(cov_matrix):
+    return functools.partial(_shared_quadratic_form, np.linalg.inv(cov_matrix))
+
+
+def _shared_pinv(cov_matrix):
+    return functools.partial(_shared_quadratic_form, np.linalg.pinv(cov_matrix))
+
+
+def _shared_solve(cov_matrix):
+    return functools.partial(_shared_lu_solve, scipy.linalg.lu_factor(cov_matrix))
+
+
+def _shared_cholesky(cov_matrix):
+    return functools.partial(
+        _shared_forward_substitution, scipy.linalg.cholesky(cov_matrix, lower=True)
     )
-    return ii
 
 
-def _compute_normalized_discrepancies(centered_mean, cov_matrices):
-    return np.array(
-        [
-            _compute_normalized_discrepancy(m, C)
-            for (m, C) in zip(centered_mean, cov_matrices)
-        ]
+def _shared_cg(cov_matrix):
+    return functools.partial(
+        _matrix_free._conjugate_gradient_discrepancies,
+        cov_matrices=cov_matrix,
+        shared=True,
     )
 
 
-def _compute_normalized_discrepancy(mean, cov):
+def _shared_quadratic_form(precision_matrix, centered_mean):
+    return np.einsum("ni,ij,nj->n", centered_mean, precision_matrix, centered_mean)
+
 
-    if config.COVARIANCE_INVERSION["symmetrize"]:
-        cov = 0.5 * (cov + cov.T)
-    if config.COVARIANCE_INVERSION["damping"] > 0.0:
-        cov += config.COVARIANCE_INVERSION["damping"] * np.eye(len(cov))
+def _shared_lu_solve(lu_and_piv, centered_mean):
+    solution = scipy.linalg.lu_solve(lu_and_piv, centered_mean.T)
+    return np.einsum("in,in->n", centered_mean.T, solution)
 
-    if config.COVARIANCE_INVERSION["strategy"] == "inv":
-        return mean @ np.linalg.inv(cov) @ mean
-    if config.COVARIANCE_INVERSION["strategy"] == "pinv":
-        return mean @ np.linalg.pinv(cov) @ mean
-    if config.COVARIANCE_INVERSION["strategy"] == "solve":
-        return mean @ np.linalg.solve(cov, mean)
-    if config.COVARIANCE_INVERSION["strategy"] == "cholesky":
-        L, lower = scipy.linalg.cho_factor(cov, lower=True)
-        return mean @ scipy.linalg.cho_solve((L, lower), mean)
 
-    raise ValueError("Covariance inversion parameters are not known.")
+def _shared_forward_substitution(cholesky_factor, centered_mean):
+    whitened_mean = scipy.linalg.solve_triangular(
+        cholesky_factor, centered_mean.T, lower=True
+    )
+    return np.einsum("in,in->n", whitened_mean, whitened_mean)
+
+
+_DENSE_STRATEGIES = {
+    "inv": _dense_inv,
+    "pinv": _dense_pinv,
+    "solve": _dense_solve,
+    "cholesky": _dense_cholesky,
+    "cov_cholesky": _dense_cholesky,
+    "auto": _dense_auto,
+    "cg": _matrix_free._conjugate_gradient_discrepancies,
+}
+"""Normalized discrepancies for a (symmetrized and damped) stack of covariances."""
+
+_SHARED_COVARIANCE_FACTORIZATIONS = {
+    "inv": _shared_inv,
+    "pinv": _shared_pinv,
+    "solve": _shared_solve,
+    "cholesky": _shared_cholesky,
+    "cov_cholesky": _shared_cholesky,
+    "auto": _robust_inversion._robust_cholesky_factorization_shared_covariance,
+    "cg": _shared_cg,
+}
+"""Factorizations of a single (symmetrized and damped) covariance. Each returns a
+function that maps a stack of centered means to their normalized discrepancies."""
+
+
+def _symmetrize_and_damp(cov_matrices):
+    """Symmetrize and damp a (stack of) covariance matrices according to the config."""
+    with instrumentation.stage("symmetrize", shape=cov_matrices.shape):
+        if config.COVARIANCE_INVERSION["symmetrize"]:
+            cov_matrices = 0.5 * (cov_matrices + np.swapaxes(cov_matrices, -1, -2))
+        if config.COVARIANCE_INVERSION["damping"] > 0.0:
+            cov_matrices = cov_matrices + config.COVARIANCE_INVERSION[
+                "damping"
+            ] * np.eye(cov_matrices.shape[-1])
+        return cov_matrices
+
+
+def _batched_forward_substitution(lower_triangular_matrices, rhs):
+    """Solve a stack of lower-triangular systems :math:`L_n x_n = b_n`.
+
+    The loop runs over the (small) dimension d, not over the (large) number N of
+    systems, so all N solves are carried out simultaneously.
+    """
+    solution = np.empty_like(rhs, dtype=np.result_type(rhs, lower_triangular_matrices))
+    for i in range(rhs.shape[-1]):
+        partial_sum = np.einsum(
+            "ni,ni->n", lower_triangular_matrices[:, i, :i], solution[:, :i]
+        )
+        solution[:, i] = (rhs[:, i] - partial_sum) / lower_triangular_matrices[:, i, i]
+    return solution
@@ -0,0 +1,255 @@
+"""Monitor the calibration of a running filter over a sliding window."""
+
+import collections
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import scipy.linalg
+from probnum import _randomvariablelist
+
+from probnumeval import instrumentation
+
+from ._calibration_measures import _center_and_stack, _compute_normalized_discrepancies
+
+__all__ = ["SlidingWindowCalibrationMonitor", "sliding_window_calibration"]
+
+# The following pylint-exception is for the _randomvariablelist access:
+# pylint: disable=protected-access
+
+
+class SlidingWindowCalibrationMonitor:
+    r"""Non-credibility index and inclination index over the last W time steps.
+
+    After each step, the monitor emits the NCI and the II of the window of the
+    most recent ``window_size`` steps.
+    Instead of recomputing (and refactorizing) the sample covariance of the window from scratch,
+    the Cholesky factor of the window's scatter matrix is maintained with one rank-one update
+    (for the incoming step) and one rank-one downdate (for the outgoing step), which costs
+    :math:`O(d^2)`. The log-discrepancies enter a rolling sum.
+    Since every reference discrepancy in the window changes with the sample covariance,
+    evaluating them requires one triangular solve with :math:`W` right-hand sides,
+    i.e. :math:`O(Wd^2)` per step instead of the :math:`O(Wd^3)` of :func:`non_credibility_index`.
+
+    Parameters
+    ----------
+    window_size :
+        Number of time steps in the window.
+    min_periods :
+        Number of time steps that need to be in the window before NCI and II are emitted.
+        Optional. Default is ``window_size``. Before, ``nan`` is emitted.
+        Must exceed the dimension of the solution,
+        because otherwise the sample covariance of the window is singular.
+        Since the monitor learns the dimension from the first step,
+        this is checked there.
+
+    See also
+    --------
+    non_credibility_index
+        Non-credibility index.
+    inclination_index
+        Inclination index.
+    sliding_window_calibration
+        Sliding-window NCI and II of a complete approximate solution.
+    """
+
+    def __init__(self, window_size: int, min_periods: Optional[int] = None):
+        min_periods = window_size if min_periods is None else min_periods
+        if not 2 <= min_periods <= window_size:
+            raise ValueError("The window needs 2 <= min_periods <= window_size.")
+        self.window_size = window_size
+        self.min_periods = min_periods
+
+        self._centered_means = collections.deque()
+        self._log_discrepancies = collections.deque()
+        self._sum_log_discrepancies = 0.0
+
+        # Mean and lower Cholesky factor of the scatter matrix of the window
+        self._window_mean = None
+        self._scatter_cholesky = None
+
+    def __len__(self):
+        return len(self._centered_means)
+
+    def step(self, mean, cov, reference) -> Tuple[float, float]:
+        """Process a single time step.
+
+        Parameters
+        ----------
+        mean :
+            **Shape (d,).** Mean of the approximate solution.
+        cov :
+            **Shape (d, d).** Covariance of the approximate solution.
+        reference :
+            **Shape (d,).** Reference solution.
+
+        Returns
+        -------
+        tuple
+            Non-credibility index and inclination index of the current window.
+        """
+        centered_mean = np.asarray(mean) - np.asarray(reference)
+        if not self._centered_means:
+            _check_min_periods(self.min_periods, centered_mean.size)
+        normalized_discrepancy = _compute_normalized_discrepancies(
+            centered_mean[None, :], np.asarray(cov)[None, :, :]
+        )[0]
+
+        # Update before downdating, so the intermediate scatter matrix stays regular
+        self._append(centered_mean, np.log10(normalized_discrepancy))
+        if len(self) > self.window_size:
+            self._remove_oldest()
+
+        if len(self) < self.min_periods:
+            return np.nan, np.nan
+        return self._window_measures()
+
+    def run(self, means, covs, references) -> Iterable[Tuple[float, float]]:
+        """Process a sequence of time steps and yield NCI and II after each step."""
+        for mean, cov, reference in zip(means, covs, references):
+            yield self.step(mean, cov, reference)
+
+    def _append(self, centered_mean, log_discrepancy):
+        self._centered_means.append(centered_mean)
+        self._log_discrepancies.append(log_discrepancy)
+        self._sum_log_discrepancies += log_discrepancy
+
+        count = len(self)
+        if count < self.min_periods:
+            return
+        if self._scatter_cholesky is None:
+            self._refactorize()
+            return
+
+        # Welford: C' = C + (n-1)/n (x - mu)(x - mu)^T, where n is the new count
+        delta = centered_mean - self._window_mean
+        self._window_mean = self._window_mean + delta / count
+        self._rank_one_update(np.sqrt((count - 1) / count) * delta, downdate=False)
+
+    def _remove_oldest(self):
+        centered_mean = self._centered_means.popleft()
+        self._sum_log_discrepancies -= self._log_discrepancies.popleft()
+
+        count = len(self)
+        # Inverse Welford: C' = C - (n+1)/n (y - mu)(y - mu)^T, where n is the new count
+        delta = centered_mean - self._window_mean
+        self._window_mean = self._window_mean - delta / count
+        self._rank_one_update(np.sqrt((count + 1) / count) * delta, downdate=True)
+
+    def _rank_one_update(self, vector, downdate):
+        try:
+            self._scatter_cholesky = _cholesky_rank_one_update(
+                self._scatter_cholesky, vector, downdate=downdate
+            )
+        except np.linalg.LinAlgError:
+            # Downdates can break down due to round-off. Refactorize from scratch.
+            self._refactorize()
+
+    def _refactorize(self):
+        centered_means = np.asarray(self._centered_means)
+        self._window_mean = np.mean(centered_means, axis=0)
+        deviations = centered_means - self._window_mean
+        self._scatter_cholesky = scipy.linalg.cholesky(
+            deviations.T @ deviations, lower=True
+        )
+
+    def _window_measures(self):
+        count = len(self)
+        centered_means = np.asarray(self._centered_means)
+        log_discrepancies = np.asarray(self._log_discrepancies)
+
+        # m^T S^{-1} m = (n - 1) * ||L^{-1} m||^2, where S = L L^T / (n - 1)
+        whitened_means = scipy.linalg.solve_triangular(
+            self._scatter_cholesky, centered_means.T, lower=True
+        )
+        log_reference_discrepancies = np.log10(
+            (count - 1) * np.einsum("in,in->n", whitened_means, whitened_means)
+        )
+
+        nci = 10 * np.mean(np.abs(log_discrepancies - log_reference_discrepancies))
+        ii = 10 * (
+            self._sum_log_discrepancies / count - np.mean(log_reference_discrepancies)
+        )
+        return nci, ii
+
+
+@instrumentation.instrumented("multivariate.sliding_window_calibration")
+def sliding_window_calibration(
+    approximate_solution: _randomvariablelist._RandomVariableList,
+    reference_solution: np.ndarray,
+    window_size: int,
+    min_periods: Optional[int] = None,
+):
+    """Compute the non-credibility index and the inclination index over a sliding
+    window.
+
+    Parameters
+    ----------
+    approximate_solution :
+        Approximate solution as returned by a (Gaussian) probabilistic numerical method.
+    reference_solution :
+        Reference solution. This is an array, because it must be a deterministic point-estimate.
+    window_size :
+        Number of time steps in the window.
+    min_periods :
+        Number of time steps that need to be in the window before NCI and II are computed.
+        Optional. Default is ``window_size``.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (N,).** Non-credibility index of the window that ends at each time step.
+    np.ndarray
+        **Shape (N,).** Inclination index of the window that ends at each time step.
+
+    See also
+    --------
+    SlidingWindowCalibrationMonitor
+        Sliding-window NCI and II for streaming data.
+    """
+    if not isinstance(approximate_solution, _randomvariablelist._RandomVariableList):
+        raise TypeError(
+            "Sliding-window calibration is only valid for a collection of random variables."
+        )
+    centered_mean, cov_matrices = _center_and_stack(
+        approximate_solution, reference_solution
+    )
+    monitor = SlidingWindowCalibrationMonitor(
+        window_size=window_size, min_periods=min_periods
+    )
+    _check_min_periods(monitor.min_periods, centered_mean.shape[1])
+    measures = np.array(
+        list(monitor.run(centered_mean, cov_matrices, np.zeros_like(centered_mean)))
+    ).reshape((-1, 2))
+    return measures[:, 0], measures[:, 1]
+
+
+def _check_min_periods(min_periods, dim):
+    if min_periods <= dim:
+        raise ValueError(
+            f"The window needs min_periods > d, but min_periods={min_periods} and "
+            f"d={dim}. Otherwise, the sample covariance of the window is singular."
+        )
+
+
+def _cholesky_rank_one_update(cholesky_factor, vector, downdate=False):
+    """Compute the lower Cholesky factor of :math:`LL^\\top \\pm xx^\\top` in
+    :math:`O(d^2)`."""
+    cholesky_factor = cholesky_factor.copy()
+    vector = vector.copy()
+    sign = -1.0 if downdate else 1.0
+    for k in range(len(vector)):
+        diagonal = cholesky_factor[k, k]
+        new_diagonal_squared = diagonal ** 2 + sign * vector[k] ** 2
+        if new_diagonal_squared <= 0.0:
+            raise np.linalg.LinAlgError(
+                "The downdated matrix is not positive definite."
+            )
+        new_diagonal = np.sqrt(new_diagonal_squared)
+        cosine, sine = new_diagonal / diagonal, vector[k] / diagonal
+
+        cholesky_factor[k, k] = new_diagonal
+        cholesky_factor[k + 1 :, k] = (
+            cholesky_factor[k + 1 :, k] + sign * sine * vector[k + 1 :]
+        ) / cosine
+        vector[k + 1 :] = cosine * vector[k + 1 :] - sine * cholesky_factor[k + 1 :, k]
+    return cholesky_factor
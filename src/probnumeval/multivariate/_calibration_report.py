@@ -0,0 +1,115 @@
+"""Compute all calibration measures in a single pass."""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from probnum import _randomvariablelist
+
+from probnumeval import instrumentation, utils
+
+from . import _inversion_diagnostics
+from ._calibration_measures import (
+    _anees_from_discrepancies,
+    _compute_reference_discrepancies,
+    _compute_solution_discrepancies,
+    _ii_from_discrepancies,
+    _nci_from_discrepancies,
+)
+
+__all__ = ["CalibrationReport", "calibration_report"]
+
+# The following pylint-exception is for the _randomvariablelist access:
+# pylint: disable=protected-access
+
+
+@dataclass(frozen=True)
+class CalibrationReport:
+    """Collection of calibration measures of an approximate solution.
+
+    Attributes
+    ----------
+    anees :
+        Average normalised estimation error squared.
+    non_credibility_index :
+        Non-credibility index.
+    inclination_index :
+        Inclination index.
+    chi2_confidence_interval :
+        Lower and upper bound of the chi-squared confidence interval
+        that the ANEES is compared to.
+    """
+
+    anees: float
+    non_credibility_index: float
+    inclination_index: float
+    chi2_confidence_interval: Tuple[float, float]
+
+
+@instrumentation.instrumented("multivariate.calibration_report")
+def calibration_report(
+    approximate_solution: _randomvariablelist._RandomVariableList,
+    reference_solution: np.ndarray,
+    perc: float = 0.95,
+    precision_matrices: Optional[np.ndarray] = None,
+) -> CalibrationReport:
+    r"""Compute the ANEES, the NCI, and the inclination index at once.
+
+    Calling :func:`anees`, :func:`non_credibility_index`, and :func:`inclination_index`
+    one after another centers the mean and factorizes all covariance matrices three times.
+    This function computes the normalized discrepancies (and the reference discrepancies)
+    only once and derives all three statistics from them.
+
+    Parameters
+    ----------
+    approximate_solution :
+        Approximate solution as returned by a (Gaussian) probabilistic numerical method.
+    reference_solution :
+        Reference solution. This is an array, because it must be a deterministic point-estimate.
+    perc :
+        Confidence level of the chi-squared confidence interval. Optional. Default is 0.95.
+    precision_matrices :
+        **Shape (N, d, d).** Precision matrices (i.e. inverse covariances) of the approximate solution.
+        Optional. If provided, they are used instead of inverting the covariances.
+
+    Returns
+    -------
+    CalibrationReport
+        ANEES, NCI, inclination index, and the chi-squared confidence interval.
+
+    See also
+    --------
+    anees
+        Average normalised estimation error squared.
+    non_credibility_index
+        Non-credibility index.
+    inclination_index
+        Inclination index.
+    chi2_confidence_intervals
+        Confidence intervals for the ANEES test statistic.
+    """
+    if not isinstance(approximate_solution, _randomvariablelist._RandomVariableList):
+        raise TypeError(
+            "The calibration report is only valid for a collection of random variables."
+        )
+
+    first_step = _inversion_diagnostics._next_step()
+    centered_mean, normalized_discrepancies = _compute_solution_discrepancies(
+        approximate_solution, reference_solution, precision_matrices
+    )
+    reference_discrepancies = _compute_reference_discrepancies(
+        centered_mean, first_step
+    )
+
+    return CalibrationReport(
+        anees=_anees_from_discrepancies(normalized_discrepancies),
+        non_credibility_index=_nci_from_discrepancies(
+            normalized_discrepancies, reference_discrepancies
+        ),
+        inclination_index=_ii_from_discrepancies(
+            normalized_discrepancies, reference_discrepancies
+        ),
+        chi2_confidence_interval=utils.chi2_confidence_intervals(
+            dim=centered_mean.shape[1], perc=perc
+        ),
+    )
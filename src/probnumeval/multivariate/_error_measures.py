@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from probnumeval import instrumentation
+
 __all__ = [
     "rmse",
     "relative_rmse",
@@ -14,6 +16,7 @@ __all__ = [
 ]
 
 
+@instrumentation.instrumented("multivariate.rmse")
 def rmse(
     approximate_solution: np.ndarray,
     reference_solution: np.ndarray,
@@ -26,6 +29,7 @@ def rmse(
     )
 
 
+@instrumentation.instrumented("multivariate.relative_rmse")
 def relative_rmse(
     approximate_solution: np.ndarray,
     reference_solution: np.ndarray,
@@ -38,6 +42,7 @@ def relative_rmse(
     )
 
 
+@instrumentation.instrumented("multivariate.max_error")
 def max_error(
     approximate_solution: np.ndarray,
     reference_solution: np.ndarray,
@@ -50,6 +55,7 @@ def max_error(
     )
 
 
+@instrumentation.instrumented("multivariate.relative_max_error")
 def relative_max_error(
     approximate_solution: np.ndarray,
     reference_solution: np.ndarray,
@@ -62,6 +68,7 @@ def relative_max_error(
     )
 
 
+@instrumentation.instrumented("multivariate.mae")
 def mae(
     approximate_solution: np.ndarray,
     reference_solution: np.ndarray,
@@ -74,6 +81,7 @@ def mae(
     )
 
 
+@instrumentation.instrumented("multivariate.relative_mae")
 def relative_mae(
     approximate_solution: np.ndarray,
     reference_solution: np.ndarray,
@@ -86,6 +94,7 @@ def relative_mae(
     )
 
 
+@instrumentation.instrumented("multivariate.mean_error")
 def mean_error(
     approximate_solution: np.ndarray, reference_solution: np.ndarray, p: int
 ):
@@ -102,6 +111,7 @@ def mean_error(
     return error / normalization
 
 
+@instrumentation.instrumented("multivariate.relative_mean_error")
 def relative_mean_error(
     approximate_solution: np.ndarray, reference_solution: np.ndarray, p: int
 ):
@@ -0,0 +1,181 @@
+"""Record diagnostics of the covariance inversion."""
+
+import contextlib
+import contextvars
+import dataclasses
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+__all__ = ["InversionDiagnostics", "InversionRecord"]
+
+# The following pylint-exception is for the access of the diagnostics recorder:
+# pylint: disable=protected-access
+
+
+@dataclasses.dataclass(frozen=True)
+class InversionRecord:
+    """Diagnostics of one batch of normalized discrepancies.
+
+    Attributes
+    ----------
+    strategy :
+        Strategy that computed the normalized discrepancies.
+    num_steps :
+        Number of time steps in the batch.
+    iterations :
+        **Shape (N,).** Number of conjugate-gradient iterations per time step.
+        Only available for the ``"cg"`` strategy.
+    converged :
+        **Shape (N,).** Whether the conjugate-gradient iteration reached the tolerance.
+        Only available for the ``"cg"`` strategy.
+    jittered_steps :
+        Indices of the time steps whose Cholesky factorization only succeeded after adding
+        jitter to the diagonal. Only available for the ``"auto"`` strategy.
+    jitter :
+        Jitter that was added for each of the ``jittered_steps``.
+    eigendecomposed_steps :
+        Indices of the time steps that needed an eigendecomposition.
+        Only available for the ``"auto"`` strategy.
+    first_step :
+        Index of the first time step of the batch among all recorded time steps.
+        Set by :class:`InversionDiagnostics`.
+
+    The indices of the ``jittered_steps`` and ``eigendecomposed_steps`` are relative
+    to the batch.
+    """
+
+    strategy: str
+    num_steps: int
+    iterations: Optional[np.ndarray] = None
+    converged: Optional[np.ndarray] = None
+    jittered_steps: Optional[np.ndarray] = None
+    jitter: Optional[np.ndarray] = None
+    eigendecomposed_steps: Optional[np.ndarray] = None
+    first_step: int = 0
+
+
+class InversionDiagnostics:
+    """Context manager that records diagnostics of the covariance inversion.
+
+    Inside the context, every batch of normalized discrepancies that is computed with a
+    strategy that produces diagnostics (the number of iterations of the ``"cg"`` strategy,
+    or the fallbacks of the ``"auto"`` strategy) appends an :class:`InversionRecord`.
+    Time steps are numbered consecutively across all records. The reference
+    discrepancies of the non-credibility index and the inclination index are computed
+    for the same time steps as the normalized discrepancies, so their records
+    (e.g. of a fallback for the shared sample covariance) revisit these time steps.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from probnum import randvars
+    >>> from probnumeval import config, multivariate
+    >>> rv = randvars.Normal(mean=np.ones(3), cov=np.diag([1.0, 2.0, 4.0]))
+    >>> with config.covariance_inversion_context(strategy="cg"):
+    ...     with multivariate.InversionDiagnostics() as diagnostics:
+    ...         chi2 = multivariate.anees(rv, np.zeros(3))
+    >>> print(diagnostics.iterations)
+    [1]
+    """
+
+    def __init__(self):
+        self.records: List[InversionRecord] = []
+        self._num_steps = 0
+        self._lock = threading.Lock()
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self):
+        self._token = _ACTIVE_DIAGNOSTICS.set(self)
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        _ACTIVE_DIAGNOSTICS.reset(self._token)
+        self._token = None
+
+    @property
+    def iterations(self) -> np.ndarray:
+        """Conjugate-gradient iterations of all recorded time steps."""
+        return _concatenate(record.iterations for record in self.records)
+
+    @property
+    def converged(self) -> np.ndarray:
+        """Convergence flags of all recorded time steps."""
+        return _concatenate(record.converged for record in self.records)
+
+    @property
+    def jittered_steps(self) -> np.ndarray:
+        """Time steps whose Cholesky factorization needed jitter."""
+        return self._steps("jittered_steps")
+
+    @property
+    def eigendecomposed_steps(self) -> np.ndarray:
+        """Time steps that needed an eigendecomposition."""
+        return self._steps("eigendecomposed_steps")
+
+    @property
+    def fallback_steps(self) -> np.ndarray:
+        """Time steps that needed any fallback."""
+        return np.union1d(self.jittered_steps, self.eigendecomposed_steps)
+
+    def _steps(self, attribute):
+        return np.unique(
+            _concatenate(
+                np.asarray(getattr(record, attribute), dtype=int) + record.first_step
+                for record in self.records
+                if getattr(record, attribute) is not None
+            )
+        )
+
+
+_ACTIVE_DIAGNOSTICS = contextvars.ContextVar("inversion_diagnostics", default=None)
+"""Diagnostics recorder that is currently active (if any)."""
+
+_REVISITED_STEPS = contextvars.ContextVar("revisited_inversion_steps", default=None)
+"""Index of the next revisited time step (if time steps are revisited)."""
+
+
+def _next_step() -> int:
+    """Index of the time step that the active diagnostics record next."""
+    diagnostics = _ACTIVE_DIAGNOSTICS.get()
+    return 0 if diagnostics is None else diagnostics._num_steps
+
+
+@contextlib.contextmanager
+def _revisit_steps(first_step: int):
+    """Number the time steps of the records in the context from ``first_step`` on.
+
+    This is for time steps whose normalized discrepancies were computed before,
+    e.g. in the computation of the reference discrepancies.
+    """
+    token = _REVISITED_STEPS.set([first_step])
+    try:
+        yield
+    finally:
+        _REVISITED_STEPS.reset(token)
+
+
+def _record(record: InversionRecord):
+    """Append a record to the active diagnostics, if there are any."""
+    diagnostics = _ACTIVE_DIAGNOSTICS.get()
+    if diagnostics is None:
+        return
+    revisited_steps = _REVISITED_STEPS.get()
+    with diagnostics._lock:
+        if revisited_steps is None:
+            first_step = diagnostics._num_steps
+        else:
+            first_step = revisited_steps[0]
+            revisited_steps[0] += record.num_steps
+        diagnostics._num_steps = max(
+            diagnostics._num_steps, first_step + record.num_steps
+        )
+        diagnostics.records.append(dataclasses.replace(record, first_step=first_step))
+
+
+def _concatenate(arrays):
+    arrays = [array for array in arrays if array is not None]
+    if not arrays:
+        return np.array([], dtype=int)
+    return np.concatenate(arrays)
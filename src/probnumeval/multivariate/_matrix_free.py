@@ -0,0 +1,157 @@
+"""Matrix-free normalized discrepancies with conjugate gradients.
+
+For very high-dimensional states (e.g. spatial discretizations of PDEs), covariance
+matrices can neither be formed nor factorized. The quadratic forms :math:`m^\\top C^{-1} m`
+then only require matrix-vector products with :math:`C`: the conjugate-gradient iteration
+solves :math:`Cx = m` to a relative tolerance, and :math:`m^\\top x` approximates the quadratic
+form from below. The iteration runs on all N time steps in lockstep, and each time step
+only stores a handful of vectors of length d.
+
+Covariances are dense arrays, ProbNum linear operators (e.g. ``linops.LinearOperator(shape,
+dtype, matmul=matvec)``), or plain matvec callables. The iteration is preconditioned with
+the diagonal of the covariance (Jacobi), wherever it is available without densifying.
+"""
+
+import numpy as np
+from probnum import linops
+
+from probnumeval import config
+
+from . import _inversion_diagnostics, _structured_covariances
+
+# The following pylint-exception is for the access of the structured-covariance helpers:
+# pylint: disable=protected-access
+
+
+def _conjugate_gradient_discrepancies(centered_mean, cov_matrices, shared=False):
+    """Normalized discrepancies via (batched) preconditioned conjugate gradients.
+
+    Parameters
+    ----------
+    centered_mean :
+        **Shape (N, d).** Stack of centered means.
+    cov_matrices :
+        Stack (or list) of N covariances, or a single covariance if ``shared`` is true.
+    shared :
+        Whether all time steps share a single covariance.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (N,).** Normalized discrepancies.
+    """
+    centered_mean = np.asarray(centered_mean, dtype=float)
+    num_steps, dim = centered_mean.shape
+    damping = config.COVARIANCE_INVERSION["damping"]
+    maxiter = config.CONJUGATE_GRADIENTS["maxiter"]
+    maxiter = 10 * dim if maxiter is None else maxiter
+
+    if not shared and not isinstance(cov_matrices, np.ndarray):
+        cov_matrices = list(cov_matrices)
+        if all(cov is cov_matrices[0] for cov in cov_matrices):
+            cov_matrices, shared = cov_matrices[0], True
+    matvec = _batched_matvec(cov_matrices, shared)
+    inverse_preconditioner = 1.0 / _jacobi_diagonals(
+        cov_matrices, shared, num_steps, dim, damping
+    )
+
+    solution = np.zeros_like(centered_mean)
+    residual = centered_mean.copy()
+    preconditioned_residual = inverse_preconditioner * residual
+    direction = preconditioned_residual.copy()
+    residual_inner = np.einsum("ni,ni->n", residual, preconditioned_residual)
+
+    tolerance = config.CONJUGATE_GRADIENTS["rtol"] * np.linalg.norm(
+        centered_mean, axis=1
+    )
+    iterations = np.zeros(num_steps, dtype=int)
+    active = np.linalg.norm(residual, axis=1) > tolerance
+
+    for _ in range(maxiter):
+        indices = np.flatnonzero(active)
+        if len(indices) == 0:
+            break
+        step_direction = direction[indices]
+        cov_direction = matvec(step_direction, indices) + damping * step_direction
+        curvature = np.einsum("ni,ni->n", step_direction, cov_direction)
+        if np.any(curvature <= 0.0):
+            raise np.linalg.LinAlgError("The covariance is not positive definite.")
+
+        step_size = residual_inner[indices] / curvature
+        solution[indices] += step_size[:, None] * step_direction
+        residual[indices] -= step_size[:, None] * cov_direction
+        iterations[indices] += 1
+
+        step_preconditioned = inverse_preconditioner[indices] * residual[indices]
+        new_residual_inner = np.einsum(
+            "ni,ni->n", residual[indices], step_preconditioned
+        )
+        direction[indices] = (
+            step_preconditioned
+            + (new_residual_inner / residual_inner[indices])[:, None] * step_direction
+        )
+        residual_inner[indices] = new_residual_inner
+        active[indices] = np.linalg.norm(residual[indices], axis=1) > tolerance[indices]
+
+    _inversion_diagnostics._record(
+        _inversion_diagnostics.InversionRecord(
+            strategy="cg",
+            num_steps=num_steps,
+            iterations=iterations,
+            converged=~active,
+        )
+    )
+    return np.einsum("ni,ni->n", centered_mean, solution)
+
+
+def _batched_matvec(cov_matrices, shared):
+    """Return a function that multiplies the covariances of a subset of the time steps
+    with one vector each."""
+    if shared:
+        if isinstance(cov_matrices, (np.ndarray, linops.LinearOperator)):
+            return lambda vectors, indices: (cov_matrices @ vectors.T).T
+        return lambda vectors, indices: np.stack(
+            [cov_matrices(vector) for vector in vectors]
+        )
+    if isinstance(cov_matrices, np.ndarray):
+        return lambda vectors, indices: np.einsum(
+            "nij,nj->ni", cov_matrices[indices], vectors
+        )
+    return lambda vectors, indices: np.stack(
+        [_matvec(cov_matrices[i], vector) for i, vector in zip(indices, vectors)]
+    )
+
+
+def _matvec(cov, vector):
+    if isinstance(cov, (np.ndarray, linops.LinearOperator)):
+        return cov @ vector
+    return np.asarray(cov(vector))
+
+
+def _jacobi_diagonals(cov_matrices, shared, num_steps, dim, damping):
+    """Diagonals of the (damped) covariances, or ones where they are unknown or not
+    positive."""
+    if shared:
+        diagonals = np.broadcast_to(_diagonal(cov_matrices, dim), (num_steps, dim))
+    elif isinstance(cov_matrices, np.ndarray):
+        diagonals = np.diagonal(cov_matrices, axis1=-2, axis2=-1)
+    else:
+        diagonals = np.stack([_diagonal(cov, dim) for cov in cov_matrices])
+    diagonals = diagonals + damping
+    return np.where(diagonals > 0.0, diagonals, 1.0)
+
+
+def _diagonal(cov, dim):
+    if isinstance(cov, np.ndarray):
+        return np.diagonal(cov)
+    if isinstance(cov, linops.Identity):
+        return np.ones(dim)
+    if isinstance(cov, linops.Scaling):
+        return _structured_covariances._scaling_diagonal(cov)
+    if isinstance(cov, linops.Kronecker):
+        return np.kron(
+            _diagonal(cov.A, cov.A.shape[0]), _diagonal(cov.B, cov.B.shape[0])
+        )
+    if isinstance(cov, linops.Matrix):
+        return np.diagonal(_structured_covariances._todense(cov))
+    return np.ones(dim)
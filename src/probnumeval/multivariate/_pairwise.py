@@ -0,0 +1,134 @@
+"""Blockwise reductions over all pairs of samples.
+
+Pairwise quantities of two sample sets :math:`x_1, ..., x_N` and :math:`y_1, ..., y_M`
+(e.g. distances) are computed tile by tile, and only the row sums are accumulated.
+Peak memory is therefore :math:`O(b^2)` for block size :math:`b` (per thread),
+instead of the :math:`O(NM)` of the full matrix.
+Row blocks are independent and can be processed in a thread pool.
+"""
+
+import concurrent.futures
+
+import numpy as np
+import scipy.spatial
+
+DEFAULT_BLOCK_SIZE = 1024
+"""Default number of samples per block, i.e. tiles have at most 1024 x 1024 entries."""
+
+
+def _pairwise_row_sums(x, y, tile_function, block_size=None, max_workers=None):
+    """Compute :math:`s_k = \\sum_{n} f(x_k, y_n)` tile by tile.
+
+    Parameters
+    ----------
+    x :
+        **Shape (N, d).** First set of samples.
+    y :
+        **Shape (M, d).** Second set of samples.
+    tile_function :
+        Function that maps a block of x (and its row offset), and a block of y (and its
+        row offset) to the corresponding tile of the pairwise matrix.
+    block_size :
+        Number of samples per block. Optional. Default is ``DEFAULT_BLOCK_SIZE``.
+    max_workers :
+        Number of threads that process row blocks in parallel. Optional.
+        Default is None, in which case the blocks are processed sequentially.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (N,).** Row sums.
+    """
+    block_size = DEFAULT_BLOCK_SIZE if block_size is None else block_size
+    if block_size < 1:
+        raise ValueError("The block size must be a positive integer.")
+
+    row_sums = np.zeros(len(x))
+
+    def _process_row_block(row_start):
+        x_block = x[row_start : row_start + block_size]
+        block_sums = np.zeros(len(x_block))
+        for column_start in range(0, len(y), block_size):
+            y_block = y[column_start : column_start + block_size]
+            block_sums += np.sum(
+                tile_function(x_block, row_start, y_block, column_start), axis=1
+            )
+        # Row blocks are disjoint, so threads never write to the same entries.
+        row_sums[row_start : row_start + block_size] = block_sums
+
+    row_starts = range(0, len(x), block_size)
+    if max_workers is None:
+        for row_start in row_starts:
+            _process_row_block(row_start)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [
+                executor.submit(_process_row_block, row_start)
+                for row_start in row_starts
+            ]:
+                future.result()
+    return row_sums
+
+
+def _distance_tile_function(p):
+    """Tiles of the Minkowski distance matrix of order p."""
+    if p == 1:
+        metric, kwargs = "cityblock", {}
+    elif p == 2:
+        metric, kwargs = "euclidean", {}
+    elif np.isinf(p):
+        metric, kwargs = "chebyshev", {}
+    else:
+        metric, kwargs = "minkowski", {"p": p}
+
+    def tile_function(x_block, _, y_block, __):
+        return scipy.spatial.distance.cdist(x_block, y_block, metric=metric, **kwargs)
+
+    return tile_function
+
+
+def _batched_distance_tiles(x, y, p):
+    """Minkowski distances of order p between two sets of samples at several locations.
+
+    Parameters
+    ----------
+    x :
+        **Shape (T, N, d).** First set of samples at T locations.
+    y :
+        **Shape (T, M, d).** Second set of samples at the same locations.
+    p :
+        Order of the norm.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (T, N, M).** Distances.
+    """
+    return np.linalg.norm(x[:, :, None, :] - y[:, None, :, :], ord=p, axis=-1)
+
+
+def _gram_distance_tile_function(x, y, same_samples):
+    r"""Tiles of the Euclidean distance matrix via the Gram-matrix identity.
+
+    :math:`\| x - y \|_2^2 = \|x\|_2^2 + \|y\|_2^2 - 2 x^\top y`, i.e. each tile is
+    dominated by a single matrix-matrix product (GEMM). Squared distances that are
+    negative due to round-off are clipped, and if both sets of samples coincide,
+    the diagonal is exactly zero.
+    """
+    squared_norms_x = np.einsum("nd,nd->n", x, x)
+    squared_norms_y = np.einsum("nd,nd->n", y, y)
+
+    def tile_function(x_block, row_start, y_block, column_start):
+        squared_distances = (
+            squared_norms_x[row_start : row_start + len(x_block), None]
+            + squared_norms_y[None, column_start : column_start + len(y_block)]
+            - 2.0 * (x_block @ y_block.T)
+        )
+        np.maximum(squared_distances, 0.0, out=squared_distances)
+        if same_samples:
+            rows = np.arange(len(x_block)) + row_start
+            columns = np.arange(len(y_block)) + column_start
+            squared_distances[rows[:, None] == columns[None, :]] = 0.0
+        return np.sqrt(squared_distances)
+
+    return tile_function
@@ -0,0 +1,215 @@
+"""Batched Cholesky factorization with per-step fallbacks.
+
+A single covariance that is (numerically) indefinite makes a batched Cholesky
+factorization fail for the whole batch. The ``"auto"`` strategy factorizes the
+batch first, and if that fails, locates the failing time steps by bisection
+(i.e. with :math:`O(k \\log N)` additional batched factorizations for k failures).
+Only the failing time steps fall back to
+
+1. a Cholesky factorization with increasing jitter on the diagonal, and
+2. an eigendecomposition, whose negative and tiny eigenvalues are pseudo-inverted to zero.
+"""
+
+import functools
+
+import numpy as np
+import scipy.linalg
+
+from probnumeval import instrumentation
+
+from . import _inversion_diagnostics
+
+# The following pylint-exception is for the access of the diagnostics recorder:
+# pylint: disable=protected-access
+
+_RELATIVE_JITTERS = (1e-10, 1e-8, 1e-6)
+"""Jitter (relative to the mean diagonal entry) that is tried before the eigendecomposition."""
+
+
+def _robust_cholesky_discrepancies(centered_mean, cov_matrices, whiten):
+    """Normalized discrepancies for a stack of covariances that may contain indefinite ones.
+
+    Parameters
+    ----------
+    centered_mean :
+        **Shape (N, d).** Stack of centered means.
+    cov_matrices :
+        **Shape (N, d, d).** Stack of (symmetrized and damped) covariance matrices.
+    whiten :
+        Function that computes the whitened means from a stack of Cholesky factors
+        and a stack of centered means.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (N,).** Normalized discrepancies.
+    """
+    num_steps = len(centered_mean)
+    cholesky_factors, success = _cholesky_where_possible(cov_matrices)
+
+    normalized_discrepancies = np.empty(num_steps)
+    whitened_mean = whiten(cholesky_factors[success], centered_mean[success])
+    normalized_discrepancies[success] = np.einsum(
+        "ni,ni->n", whitened_mean, whitened_mean
+    )
+
+    fallbacks = []
+    for index in np.flatnonzero(~success):
+        discrepancies, jitter = _fallback_discrepancies(
+            cov_matrices[index], centered_mean[index : index + 1]
+        )
+        normalized_discrepancies[index] = discrepancies[0]
+        fallbacks.append((index, jitter))
+
+    _record_fallbacks("auto", num_steps, fallbacks)
+    return normalized_discrepancies
+
+
+def _robust_cholesky_factorization_shared_covariance(cov_matrix):
+    """Factorize a single covariance that may be indefinite.
+
+    Returns
+    -------
+    callable
+        Function that maps a stack of centered means to their normalized discrepancies.
+    """
+    try:
+        cholesky_factor = scipy.linalg.cholesky(cov_matrix, lower=True)
+    except np.linalg.LinAlgError:
+        fallback_discrepancies, jitter = _fallback_factorization(cov_matrix)
+        return functools.partial(
+            _shared_fallback_discrepancies, fallback_discrepancies, jitter
+        )
+    return functools.partial(_whitened_discrepancies, cholesky_factor)
+
+
+def _shared_fallback_discrepancies(fallback_discrepancies, jitter, centered_mean):
+    """Normalized discrepancies w.r.t. a shared covariance that needed a fallback.
+
+    All time steps share the covariance, so all of them are recorded as fallbacks.
+    """
+    num_steps = len(centered_mean)
+    _record_fallbacks(
+        "auto", num_steps, [(index, jitter) for index in range(num_steps)]
+    )
+    return fallback_discrepancies(centered_mean)
+
+
+def _cholesky_where_possible(cov_matrices):
+    """Factorize a stack of matrices and bisect the stack wherever the factorization fails.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (N, d, d).** Cholesky factors (zero where the factorization failed).
+    np.ndarray
+        **Shape (N,).** Whether the factorization succeeded.
+    """
+    cholesky_factors = np.zeros_like(cov_matrices)
+    success = np.zeros(len(cov_matrices), dtype=bool)
+
+    def _factorize(indices):
+        try:
+            cholesky_factors[indices] = np.linalg.cholesky(cov_matrices[indices])
+            success[indices] = True
+        except np.linalg.LinAlgError:
+            if len(indices) > 1:
+                middle = len(indices) // 2
+                _factorize(indices[:middle])
+                _factorize(indices[middle:])
+
+    _factorize(np.arange(len(cov_matrices)))
+    return cholesky_factors, success
+
+
+def _fallback_discrepancies(cov_matrix, centered_mean):
+    """Normalized discrepancies w.r.t. a covariance whose Cholesky factorization failed.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (N,).** Normalized discrepancies.
+    float or None
+        Jitter that made the Cholesky factorization succeed,
+        or None if the eigendecomposition was used.
+    """
+    normalized_discrepancies, jitter = _fallback_factorization(cov_matrix)
+    return normalized_discrepancies(centered_mean), jitter
+
+
+def _fallback_factorization(cov_matrix):
+    """Factorize a covariance whose Cholesky factorization failed.
+
+    Returns
+    -------
+    callable
+        Function that maps a stack of centered means to their normalized discrepancies.
+    float or None
+        Jitter that made the Cholesky factorization succeed,
+        or None if the eigendecomposition was used.
+    """
+    dim = cov_matrix.shape[-1]
+    scale = np.mean(np.abs(np.diagonal(cov_matrix)))
+    scale = scale if scale > 0.0 else 1.0
+
+    for relative_jitter in _RELATIVE_JITTERS:
+        jitter = relative_jitter * scale
+        try:
+            cholesky_factor = scipy.linalg.cholesky(
+                cov_matrix + jitter * np.eye(dim), lower=True
+            )
+        except np.linalg.LinAlgError:
+            continue
+        return functools.partial(_whitened_discrepancies, cholesky_factor), jitter
+
+    eigvals, eigvecs = np.linalg.eigh(cov_matrix)
+    cutoff = dim * np.finfo(eigvals.dtype).eps * np.amax(np.abs(eigvals))
+    inverse_eigvals = np.where(
+        eigvals > cutoff, 1.0 / np.where(eigvals > cutoff, eigvals, 1.0), 0.0
+    )
+    return (
+        functools.partial(_eigendecomposed_discrepancies, eigvecs, inverse_eigvals),
+        None,
+    )
+
+
+def _whitened_discrepancies(cholesky_factor, centered_mean):
+    whitened_mean = scipy.linalg.solve_triangular(
+        cholesky_factor, centered_mean.T, lower=True
+    )
+    return np.einsum("in,in->n", whitened_mean, whitened_mean)
+
+
+def _eigendecomposed_discrepancies(eigvecs, inverse_eigvals, centered_mean):
+    rotated_mean = eigvecs.T @ centered_mean.T
+    return np.einsum("in,i,in->n", rotated_mean, inverse_eigvals, rotated_mean)
+
+
+def _record_fallbacks(strategy, num_steps, fallbacks):
+    """Record which time steps needed which fallback."""
+    jittered_steps, jitter, eigendecomposed_steps = [], [], []
+    for index, step_jitter in fallbacks:
+        if step_jitter is None:
+            eigendecomposed_steps.append(index)
+        else:
+            jittered_steps.append(index)
+            jitter.append(step_jitter)
+
+    _inversion_diagnostics._record(
+        _inversion_diagnostics.InversionRecord(
+            strategy=strategy,
+            num_steps=num_steps,
+            jittered_steps=np.asarray(jittered_steps, dtype=int),
+            jitter=np.asarray(jitter, dtype=float),
+            eigendecomposed_steps=np.asarray(eigendecomposed_steps, dtype=int),
+        )
+    )
+    if fallbacks:
+        instrumentation.record(
+            "fallback",
+            shape=(num_steps,),
+            strategy=strategy,
+            jittered_steps=jittered_steps,
+            jitter=jitter,
+            eigendecomposed_steps=eigendecomposed_steps,
+        )
@@ -1,17 +1,36 @@
 """Extract information out of a bunch of samples from a solution."""
 
+from typing import Optional, Tuple, Union
 
 import numpy as np
-import scipy.spatial
+import scipy.stats
+
+from probnumeval import instrumentation
+
+from . import _pairwise
 
 __all__ = [
     "sample_reference_distance",
     "sample_sample_distance",
+    "mean_sample_sample_distance",
     "gaussianity_p_value",
 ]
 
+# The following pylint-exception is for the access of the blockwise pairwise reductions:
+# pylint: disable=protected-access
+
 
-def sample_sample_distance(samples: np.ndarray, p: int = 2) -> np.ndarray:
+@instrumentation.instrumented("multivariate.sample_sample_distance")
+def sample_sample_distance(
+    samples: np.ndarray,
+    p: int = 2,
+    block_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    gram: bool = False,
+    approx: bool = False,
+    num_partners: int = 100,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
     r"""Compute the sample-sample distance.
 
 
@@ -21,17 +40,43 @@ def sample_sample_distance(samples: np.ndarray, p: int = 2) -> np.ndarray:
 
     for :math:`1 \leq p \leq \infty`. For :math:`p=2`, the root mean-squared error is recovered.
 
+    The distance matrix is never formed. Instead, its row sums are accumulated tile by tile,
+    which bounds the memory by the size of a tile (per thread).
+    If exact values are not required, ``approx=True`` estimates each :math:`E_k` from ``num_partners``
+    partners :math:`x_n` that are drawn uniformly (with replacement), which costs :math:`O(Nmd)`
+    instead of :math:`O(N^2d)` for :math:`m` partners. The estimates are unbiased, and come with their standard errors.
+
     Parameters
     ----------
     samples :
         **Shape (N, d).** Samples from the solution, evaluated at an end point.
     p :
         Order of the underlying norm that shall be used. At least 1, at most infinity. Default is 2, which corresponds to the RMSE.
+    block_size :
+        Number of samples per tile side. Optional. Default is 1024.
+    max_workers :
+        Number of threads that process tiles in parallel. Optional. Default is None, i.e. no parallelism.
+    gram :
+        Whether to compute Euclidean distances (``p=2`` only) via the Gram matrix, i.e. with matrix-matrix products.
+        This is considerably faster for large dimensions, but slightly less accurate. Optional. Default is False.
+    approx :
+        Whether to estimate the sample-sample distances from a random subset of partners. Optional. Default is False.
+    num_partners :
+        Number of partners per sample if ``approx`` is true. Optional. Default is 100.
+    random_state :
+        Seed (or generator) for drawing the partners if ``approx`` is true. Optional.
 
     Returns
     -------
     np.ndarray
         **Shape (N,).** Sample-sample distances :math:`E=(E_1, ..., E_N)`.
+    np.ndarray
+        **Shape (N,).** Standard errors of the estimated sample-sample distances. Only returned if ``approx`` is true.
+
+    See also
+    --------
+    sliced_wasserstein_distance
+        A scalable comparison of the full sample cloud with a reference sample cloud.
 
     Examples
     --------
@@ -43,12 +88,105 @@ def sample_sample_distance(samples: np.ndarray, p: int = 2) -> np.ndarray:
     >>> print(np.round(np.mean(rmse), 1))
     57.7
     """
-    distmat = scipy.spatial.distance_matrix(samples, samples, p=p) / samples.shape[1]
-    return np.mean(distmat, axis=0)
+    samples = np.asarray(samples, dtype=float)
+    if approx:
+        return _subsampled_sample_sample_distance(
+            samples,
+            p=p,
+            num_partners=num_partners,
+            block_size=block_size,
+            rng=np.random.default_rng(random_state),
+        )
+    if gram:
+        if p != 2:
+            raise ValueError("The Gram-matrix path is only available for p=2.")
+        # Distances are invariant under translations, and centering reduces cancellation.
+        samples = samples - np.mean(samples, axis=0)
+        tile_function = _pairwise._gram_distance_tile_function(
+            samples, samples, same_samples=True
+        )
+    else:
+        tile_function = _pairwise._distance_tile_function(p)
+
+    row_sums = _pairwise._pairwise_row_sums(
+        samples,
+        samples,
+        tile_function,
+        block_size=block_size,
+        max_workers=max_workers,
+    )
+    return row_sums / (samples.shape[0] * samples.shape[1])
+
+
+@instrumentation.instrumented("multivariate.mean_sample_sample_distance")
+def mean_sample_sample_distance(
+    samples: np.ndarray,
+    p: int = 2,
+    approx: bool = False,
+    num_pairs: int = 10000,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+) -> Union[float, Tuple[float, float]]:
+    r"""Compute the mean of the sample-sample distances.
+
+    This is the mean of :math:`E=(E_1, ..., E_N)` as computed by :func:`sample_sample_distance`, i.e.
+
+    .. math:: \bar{E} = \frac{1}{dN^2} \sum_{k=1}^N \sum_{n=1}^N \| x_k - x_n \|_p.
+
+    If ``approx`` is true, the mean is estimated from ``num_pairs`` pairs :math:`(x_k, x_n)`
+    that are drawn uniformly (with replacement), which costs :math:`O(md)` for :math:`m` pairs.
+
+    Parameters
+    ----------
+    samples :
+        **Shape (N, d).** Samples from the solution, evaluated at an end point.
+    p :
+        Order of the underlying norm that shall be used. At least 1, at most infinity. Default is 2, which corresponds to the RMSE.
+    approx :
+        Whether to estimate the mean from random pairs. Optional. Default is False.
+    num_pairs :
+        Number of random pairs if ``approx`` is true. Optional. Default is 10000.
+    random_state :
+        Seed (or generator) for drawing the pairs if ``approx`` is true. Optional.
+
+    Returns
+    -------
+    float
+        Mean sample-sample distance.
+    float
+        Standard error of the estimated mean. Only returned if ``approx`` is true.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> fake_samples = np.arange(0, 300).reshape((100, 3))
+    >>> print(np.round(mean_sample_sample_distance(fake_samples, p=2), 1))
+    57.7
+    """
+    samples = np.asarray(samples, dtype=float)
+    if not approx:
+        return np.mean(sample_sample_distance(samples, p=p))
 
+    rng = np.random.default_rng(random_state)
+    num_samples, dim = samples.shape
+    distances = np.empty(num_pairs)
+    for start in range(0, num_pairs, _pairwise.DEFAULT_BLOCK_SIZE):
+        stop = min(start + _pairwise.DEFAULT_BLOCK_SIZE, num_pairs)
+        first, second = rng.integers(num_samples, size=(2, stop - start))
+        distances[start:stop] = np.linalg.norm(
+            samples[first] - samples[second], ord=p, axis=-1
+        )
+    return (
+        np.mean(distances) / dim,
+        np.std(distances, ddof=1) / (np.sqrt(num_pairs) * dim),
+    )
 
+
+@instrumentation.instrumented("multivariate.sample_reference_distance")
 def sample_reference_distance(
-    samples: np.ndarray, reference: np.ndarray, p: int = 2
+    samples: np.ndarray,
+    reference: np.ndarray,
+    p: int = 2,
+    chunk_size: Optional[int] = None,
 ) -> np.ndarray:
     r"""Compute the sample-reference distance.
 
@@ -58,19 +196,24 @@ def sample_reference_distance(
 
     for :math:`1 \leq p \leq \infty`. For :math:`p=2`, the root mean-squared error is recovered.
 
+    Stacks of T sample sets and T references (e.g. one per time point) are processed in a single vectorized pass.
+
     Parameters
     ----------
     samples :
-        **Shape (N, d).** Samples from the solution, evaluated at an end point.
+        **Shape (N, d) or (T, N, d).** Samples from the solution, evaluated at an end point (or at T time points).
     reference :
-        **Shape (d,).** Reference solution..
+        **Shape (d,) or (T, d).** Reference solution..
     p :
         Order of the underlying norm that shall be used. At least 1, at most infinity. Default is 2, which corresponds to the RMSE.
+    chunk_size :
+        Number of time points that are processed at once. Optional. Default is None, in which case all time points are processed at once.
+        Memory is bounded by ``chunk_size * N * d``.
 
     Returns
     -------
     np.ndarray
-        **Shape (N,).** Sample-reference distances :math:`R=(R_1, ..., R_N)`.
+        **Shape (N,) or (T, N).** Sample-reference distances :math:`R=(R_1, ..., R_N)`.
 
     Examples
     --------
@@ -83,15 +226,178 @@ def sample_reference_distance(
     >>> print(np.round(np.mean(rmse), 1))
     80.2
     """
-    distmat = (
-        scipy.spatial.distance_matrix(samples, reference[None, :], p=p)
-        / samples.shape[1]
+    samples = np.asarray(samples)
+    reference = np.asarray(reference)
+    if samples.ndim == 2:
+        return sample_reference_distance(
+            samples[None, :, :], reference[None, :], p=p, chunk_size=chunk_size
+        )[0]
+
+    num_points, _, dim = samples.shape
+    chunk_size = num_points if chunk_size is None else chunk_size
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be a positive integer.")
+
+    distances = np.empty(samples.shape[:2])
+    for start in range(0, num_points, chunk_size):
+        stop = start + chunk_size
+        distances[start:stop] = np.linalg.norm(
+            samples[start:stop] - reference[start:stop, None, :], ord=p, axis=-1
+        )
+    return distances / dim
+
+
+def _subsampled_sample_sample_distance(samples, p, num_partners, block_size, rng):
+    """Estimate the sample-sample distances from random partners, block by block."""
+    num_samples, dim = samples.shape
+    block_size = _pairwise.DEFAULT_BLOCK_SIZE if block_size is None else block_size
+
+    estimates = np.empty(num_samples)
+    standard_errors = np.empty(num_samples)
+    for start in range(0, num_samples, block_size):
+        block = samples[start : start + block_size]
+        partners = samples[rng.integers(num_samples, size=(len(block), num_partners))]
+        distances = np.linalg.norm(block[:, None, :] - partners, ord=p, axis=-1)
+
+        estimates[start : start + block_size] = np.mean(distances, axis=1) / dim
+        standard_errors[start : start + block_size] = np.std(
+            distances, ddof=1, axis=1
+        ) / (np.sqrt(num_partners) * dim)
+    return estimates, standard_errors
+
+
+@instrumentation.instrumented("multivariate.gaussianity_p_value")
+def gaussianity_p_value(
+    samples: np.ndarray, method: str = "marginal", correction: Optional[str] = None
+) -> np.ndarray:
+    r"""Compute p-values that describe how closely a set of samples resembles samples
+    from a Gaussian distribution.
+
+    The null hypothesis is that the samples are Gaussian, i.e. small p-values indicate
+    that they are not. All tests are vectorized over the columns (and time points) of the samples.
+
+    - ``method="marginal"`` tests each column for normality with D'Agostino and Pearson's test
+      (:func:`scipy.stats.normaltest`), which combines the skewness and the kurtosis.
+    - ``method="mardia"`` tests for multivariate normality with Mardia's skewness and kurtosis tests.
+      The samples are centered and whitened once, and the statistics
+
+      .. math:: b_1 = \frac{1}{N^2} \sum_{k=1}^N \sum_{n=1}^N (z_k^\top z_n)^3, \quad b_2 = \frac{1}{N} \sum_{k=1}^N \| z_k \|_2^4
+
+      of the whitened samples :math:`z_1, ..., z_N` are compared to
+      a chi-squared distribution with :math:`d(d+1)(d+2)/6` degrees of freedom (:math:`Nb_1/6`)
+      and to a standard normal distribution (:math:`(b_2 - d(d+2)) / \sqrt{8d(d+2)/N}`), respectively.
+
+    Parameters
+    ----------
+    samples :
+        **Shape (N, d) or (T, N, d).** Samples from the solution, evaluated at an end point (or at T time points).
+    method :
+        Either ``"marginal"`` or ``"mardia"``. Optional. Default is ``"marginal"``.
+    correction :
+        Correction for multiple testing across all returned p-values. Either ``"bonferroni"``, ``"holm"``,
+        or ``"fdr_bh"`` (Benjamini-Hochberg). Optional. Default is None, i.e. no correction.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (d,) or (T, d).** p-values of the marginal tests, if ``method="marginal"``.
+        **Shape (2,) or (T, 2).** p-values of Mardia's skewness and kurtosis test, if ``method="mardia"``.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> rng = np.random.default_rng(1)
+    >>> gaussian_samples = rng.normal(size=(500, 3))
+    >>> p_values = gaussianity_p_value(gaussian_samples)
+    >>> print(p_values.shape, np.all(p_values > 0.01))
+    (3,) True
+    >>> skewed_samples = rng.exponential(size=(500, 3))
+    >>> p_values = gaussianity_p_value(skewed_samples, method="mardia")
+    >>> print(p_values.shape, np.all(p_values < 0.01))
+    (2,) True
+    """
+    samples = np.asarray(samples, dtype=float)
+    if samples.ndim not in (2, 3):
+        raise ValueError("The samples must have shape (N, d) or (T, N, d).")
+
+    if method == "marginal":
+        p_values = scipy.stats.normaltest(samples, axis=-2).pvalue
+    elif method == "mardia":
+        if samples.shape[-2] <= samples.shape[-1]:
+            raise ValueError(
+                "Mardia's tests need more samples than dimensions (N > d), "
+                "because the sample covariance is singular otherwise."
+            )
+        p_values = _mardia_p_values(samples)
+    else:
+        raise ValueError(f"The method {method} is not known.")
+
+    if correction is None:
+        return p_values
+    return _correct_p_values(p_values, correction)
+
+
+def _mardia_p_values(samples):
+    """p-values of Mardia's skewness and kurtosis tests, for (T, N, d) or (N, d) samples."""
+    batched_samples = samples if samples.ndim == 3 else samples[None, :, :]
+    _, num_samples, dim = batched_samples.shape
+
+    # Shared centering and whitening of all time points:
+    # z_n = L^{-1} (x_n - mean), where L L^T is the (biased) sample covariance.
+    centered = batched_samples - np.mean(batched_samples, axis=1, keepdims=True)
+    sample_covariances = np.einsum("tni,tnj->tij", centered, centered) / num_samples
+    try:
+        cholesky_factors = np.linalg.cholesky(sample_covariances)
+    except np.linalg.LinAlgError:
+        raise ValueError(
+            "The sample covariance is singular, i.e. the samples are degenerate."
+        ) from None
+    whitened = np.linalg.solve(
+        cholesky_factors, np.transpose(centered, axes=(0, 2, 1))
+    ).transpose((0, 2, 1))
+
+    # (1/N^2) sum_{n,m} (z_n^T z_m)^3 = sum_{ijk} M_{ijk}^2 with the third moments
+    # M_{ijk} = (1/N) sum_n z_ni z_nj z_nk, i.e. O(T N d^3) instead of O(T N^2 d).
+    third_moments = (
+        np.einsum("tni,tnj,tnk->tijk", whitened, whitened, whitened, optimize=True)
+        / num_samples
     )
-    return distmat.flatten()
+    skewness = np.sum(third_moments ** 2, axis=(1, 2, 3))
+    kurtosis = np.mean(np.einsum("tni,tni->tn", whitened, whitened) ** 2, axis=1)
+
+    skewness_p_values = scipy.stats.chi2.sf(
+        num_samples * skewness / 6.0, df=dim * (dim + 1) * (dim + 2) / 6.0
+    )
+    kurtosis_statistic = (kurtosis - dim * (dim + 2)) / np.sqrt(
+        8.0 * dim * (dim + 2) / num_samples
+    )
+    kurtosis_p_values = 2.0 * scipy.stats.norm.sf(np.abs(kurtosis_statistic))
+
+    p_values = np.stack([skewness_p_values, kurtosis_p_values], axis=-1)
+    return p_values if samples.ndim == 3 else p_values[0]
+
 
+def _correct_p_values(p_values, correction):
+    """Adjust p-values for multiple testing (the family consists of all p-values)."""
+    flat_p_values = np.ravel(p_values)
+    num_tests = len(flat_p_values)
 
-def gaussianity_p_value(samples):
-    """Compute a p-value that describes how closely a set of samples resembles samples
-    from a Gaussian process."""
-    # https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.normaltest.html#scipy.stats.normaltest
-    raise NotImplementedError
+    if correction == "bonferroni":
+        adjusted = num_tests * flat_p_values
+    elif correction == "holm":
+        order = np.argsort(flat_p_values)
+        sorted_adjusted = np.maximum.accumulate(
+            (num_tests - np.arange(num_tests)) * flat_p_values[order]
+        )
+        adjusted = np.empty(num_tests)
+        adjusted[order] = sorted_adjusted
+    elif correction == "fdr_bh":
+        order = np.argsort(flat_p_values)
+        sorted_adjusted = np.minimum.accumulate(
+            (num_tests / np.arange(1, num_tests + 1) * flat_p_values[order])[::-1]
+        )[::-1]
+        adjusted = np.empty(num_tests)
+        adjusted[order] = sorted_adjusted
+    else:
+        raise ValueError(f"The correction {correction} is not known.")
+    return np.minimum(adjusted, 1.0).reshape(np.shape(p_values))
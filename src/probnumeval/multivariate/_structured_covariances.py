@@ -0,0 +1,227 @@
+"""Normalized discrepancies for structured covariance matrices.
+
+Diagonal, Kronecker, and low-rank-plus-diagonal covariances admit quadratic forms
+:math:`m^\\top C^{-1} m` that are much cheaper than a dense factorization:
+
+- **Diagonal**: :math:`O(d)`.
+- **Kronecker** :math:`C = A \\otimes B`: eigendecompositions of the small factors
+  :math:`A \\in \\mathbb{R}^{a \\times a}`, :math:`B \\in \\mathbb{R}^{b \\times b}`,
+  i.e. :math:`O(a^3 + b^3 + ab(a + b))` instead of :math:`O(a^3b^3)`.
+- **Low-rank plus diagonal** :math:`C = D + UU^\\top` with :math:`U \\in \\mathbb{R}^{d \\times k}`:
+  the Woodbury identity, i.e. :math:`O(dk^2 + k^3)`.
+
+Covariances are either dense arrays (which are checked for diagonality)
+or ProbNum linear operators. Anything else is densified.
+"""
+
+import numpy as np
+from probnum import linops
+from probnum.linops._arithmetic import ProductLinearOperator, SumLinearOperator
+
+from probnumeval import config
+
+# The following pylint-exception is for the access of ProbNum's operator arithmetic:
+# pylint: disable=protected-access
+
+
+def _contains_linear_operators(cov_matrices):
+    if isinstance(cov_matrices, np.ndarray):
+        return False
+    return any(isinstance(cov, linops.LinearOperator) for cov in cov_matrices)
+
+
+def _diagonals_if_diagonal(cov_matrices: np.ndarray):
+    """Return the diagonals of a stack of covariance matrices if all of them are
+    diagonal, and None otherwise."""
+    N, d, _ = cov_matrices.shape
+    if d == 1:
+        return cov_matrices[:, :, 0]
+
+    # In the flattened (d*d,) matrix, the diagonal entries are spaced by d + 1.
+    # Reshaping the first d*d - 1 entries into (d - 1, d + 1) moves the diagonal
+    # into the first column and all off-diagonal entries into the remaining columns.
+    flat = cov_matrices.reshape((N, d * d))[:, :-1].reshape((N, d - 1, d + 1))
+    if np.any(flat[:, :, 1:]):
+        return None
+    return np.diagonal(cov_matrices, axis1=-2, axis2=-1)
+
+
+def _classify(cov):
+    """Determine the structure of a covariance operator.
+
+    Returns
+    -------
+    tuple
+        Kind of structure (``"diagonal"``, ``"kronecker"``, ``"low_rank_plus_diagonal"``,
+        or ``"dense"``), and the arrays that represent the covariance.
+    """
+    if isinstance(cov, np.ndarray):
+        return "dense", (cov,)
+    if isinstance(cov, linops.Identity):
+        return "diagonal", (np.ones(cov.shape[0]),)
+    if isinstance(cov, linops.Scaling):
+        return "diagonal", (_scaling_diagonal(cov),)
+    if isinstance(cov, linops.Kronecker):
+        return "kronecker", (_todense(cov.A), _todense(cov.B))
+    if isinstance(cov, SumLinearOperator):
+        low_rank_plus_diagonal = _low_rank_plus_diagonal(cov)
+        if low_rank_plus_diagonal is not None:
+            return "low_rank_plus_diagonal", low_rank_plus_diagonal
+    return "dense", (_todense(cov),)
+
+
+def _group_by_structure(cov_matrices):
+    """Group covariance operators by structure and shape of their representation.
+
+    Returns
+    -------
+    dict
+        Maps (kind, shapes) to the indices of the covariances and the stacked
+        arrays that represent them.
+    """
+    groups = {}
+    for index, cov in enumerate(cov_matrices):
+        kind, arrays = _classify(cov)
+        key = (kind,) + tuple(array.shape for array in arrays)
+        indices, representations = groups.setdefault(key, ([], []))
+        indices.append(index)
+        representations.append(arrays)
+
+    return {
+        key: (
+            np.asarray(indices),
+            tuple(np.stack(stack) for stack in zip(*representations)),
+        )
+        for key, (indices, representations) in groups.items()
+    }
+
+
+def _diagonal_discrepancies(centered_mean, diagonals):
+    """Normalized discrepancies for a stack of diagonal covariances.
+
+    Returns None if the diagonals are not positive (unless the strategy is ``pinv``),
+    so the caller can fall back to the dense strategy (and its error handling).
+    """
+    diagonals = diagonals + config.COVARIANCE_INVERSION["damping"]
+    inverse_diagonals = _invert_eigenvalues(diagonals)
+    if inverse_diagonals is None:
+        return None
+    return np.einsum("ni,ni,ni->n", centered_mean, inverse_diagonals, centered_mean)
+
+
+def _kronecker_discrepancies(centered_mean, factors_a, factors_b):
+    r"""Normalized discrepancies for a stack of Kronecker covariances :math:`A \otimes B`.
+
+    With eigendecompositions :math:`A = Q_A \Lambda_A Q_A^\top`
+    and :math:`B = Q_B \Lambda_B Q_B^\top`, and :math:`m = \text{vec}(M)` (row-major),
+
+    .. math:: m^\top (A \otimes B + \delta I)^{-1} m
+        = \sum_{ij} \frac{(Q_A^\top M Q_B)_{ij}^2}{\lambda^A_i \lambda^B_j + \delta}.
+
+    Returns None if the covariances are not positive definite (unless the strategy is ``pinv``).
+    """
+    N, a, _ = factors_a.shape
+    b = factors_b.shape[-1]
+
+    eigvals_a, eigvecs_a = np.linalg.eigh(factors_a)
+    eigvals_b, eigvecs_b = np.linalg.eigh(factors_b)
+    eigvals = (
+        eigvals_a[:, :, None] * eigvals_b[:, None, :]
+        + config.COVARIANCE_INVERSION["damping"]
+    )
+    inverse_eigvals = _invert_eigenvalues(eigvals.reshape((N, a * b)))
+    if inverse_eigvals is None:
+        return None
+
+    centered_mean_matrices = centered_mean.reshape((N, a, b))
+    rotated = np.einsum(
+        "nia,nij,njb->nab", eigvecs_a, centered_mean_matrices, eigvecs_b
+    ).reshape((N, a * b))
+    return np.einsum("ni,ni,ni->n", rotated, inverse_eigvals, rotated)
+
+
+def _low_rank_plus_diagonal_discrepancies(centered_mean, diagonals, low_rank_factors):
+    r"""Normalized discrepancies for a stack of covariances :math:`D + UU^\top`.
+
+    By the Woodbury identity, with :math:`v = U^\top D^{-1} m`,
+
+    .. math:: m^\top (D + UU^\top)^{-1} m
+        = m^\top D^{-1} m - v^\top (I + U^\top D^{-1} U)^{-1} v.
+
+    Returns None if the diagonal is not positive or if the strategy is ``pinv``.
+    """
+    if config.COVARIANCE_INVERSION["strategy"] == "pinv":
+        return None
+    diagonals = diagonals + config.COVARIANCE_INVERSION["damping"]
+    if np.any(diagonals <= 0.0):
+        return None
+
+    rank = low_rank_factors.shape[-1]
+    scaled_factors = low_rank_factors / diagonals[:, :, None]
+    projected_mean = np.einsum("nik,ni->nk", scaled_factors, centered_mean)
+    capacitance = np.eye(rank) + np.einsum(
+        "nik,nil->nkl", low_rank_factors, scaled_factors
+    )
+    cholesky_factors = np.linalg.cholesky(capacitance)
+    whitened = np.linalg.solve(cholesky_factors, projected_mean[..., None])[..., 0]
+
+    diagonal_part = np.einsum("ni,ni->n", centered_mean / diagonals, centered_mean)
+    return diagonal_part - np.einsum("nk,nk->n", whitened, whitened)
+
+
+def _invert_eigenvalues(eigvals):
+    """Invert (positive) eigenvalues, or pseudo-invert them for the ``pinv`` strategy.
+
+    Returns None if an eigenvalue is not positive (and the strategy is not ``pinv``).
+    """
+    if config.COVARIANCE_INVERSION["strategy"] == "pinv":
+        cutoff = 1e-15 * np.amax(np.abs(eigvals), axis=-1, keepdims=True)
+        return np.where(
+            np.abs(eigvals) > cutoff, 1.0 / np.where(eigvals == 0.0, 1.0, eigvals), 0.0
+        )
+    if np.any(eigvals <= 0.0):
+        return None
+    return 1.0 / eigvals
+
+
+_FAST_PATHS = {
+    "diagonal": _diagonal_discrepancies,
+    "kronecker": _kronecker_discrepancies,
+    "low_rank_plus_diagonal": _low_rank_plus_diagonal_discrepancies,
+}
+
+
+def _scaling_diagonal(cov: linops.Scaling):
+    if cov.is_isotropic:
+        return np.full(cov.shape[0], cov.scalar, dtype=float)
+    return np.asarray(cov.factors, dtype=float)
+
+
+def _low_rank_plus_diagonal(cov: SumLinearOperator):
+    """Extract D and U from an operator ``Scaling(D) + Matrix(U) @ Matrix(U).T``, or
+    return None if the operator does not have this structure."""
+    summands = cov._summands
+    if len(summands) != 2:
+        return None
+    scalings = [s for s in summands if isinstance(s, (linops.Scaling, linops.Identity))]
+    products = [s for s in summands if isinstance(s, ProductLinearOperator)]
+    if len(scalings) != 1 or len(products) != 1 or len(products[0]._factors) != 2:
+        return None
+
+    left, right = (_todense(factor) for factor in products[0]._factors)
+    if left.shape[1] >= left.shape[0] or not np.array_equal(left, right.T):
+        return None
+
+    scaling = scalings[0]
+    diagonal = (
+        np.ones(scaling.shape[0])
+        if isinstance(scaling, linops.Identity)
+        else _scaling_diagonal(scaling)
+    )
+    return diagonal, left
+
+
+def _todense(cov):
+    if isinstance(cov, linops.LinearOperator):
+        return cov.todense()
+    return np.asarray(cov)
@@ -0,0 +1,354 @@
+"""Discrepancies between two sets of samples."""
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from probnumeval import instrumentation
+
+from . import _pairwise
+
+__all__ = [
+    "linear_time_mmd",
+    "random_features_mmd",
+    "energy_distance",
+    "sliced_wasserstein_distance",
+]
+
+# The following pylint-exception is for the access of the blockwise pairwise reductions:
+# pylint: disable=protected-access
+
+
+@instrumentation.instrumented("multivariate.linear_time_mmd")
+def linear_time_mmd(
+    samples: np.ndarray,
+    other_samples: np.ndarray,
+    lengthscale: Optional[float] = None,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+) -> Tuple[float, float]:
+    r"""Estimate the squared maximum mean discrepancy in linear time.
+
+    For samples :math:`x_1, ..., x_N` and :math:`y_1, ..., y_M`, shuffle both sets
+    and split them into :math:`m = \lfloor \min(N, M) / 2 \rfloor` disjoint pairs each. Then,
+
+    .. math:: \widehat{\text{MMD}}^2 = \frac{1}{m} \sum_{i=1}^m k(x_{2i-1}, x_{2i}) + k(y_{2i-1}, y_{2i}) - k(x_{2i-1}, y_{2i}) - k(x_{2i}, y_{2i-1})
+
+    is an unbiased estimator of the squared MMD w.r.t. the Gaussian kernel
+    :math:`k(x, y) = \exp(-\| x - y \|_2^2 / (2\ell^2))`, which costs :math:`O(md)` [1]_.
+    Since the summands are i.i.d., the estimator comes with a standard error.
+
+    Parameters
+    ----------
+    samples :
+        **Shape (N, d).** Samples from the first distribution, e.g. from the solution.
+    other_samples :
+        **Shape (M, d).** Samples from the second distribution, e.g. from a reference solution.
+    lengthscale :
+        Lengthscale :math:`\ell` of the Gaussian kernel. Optional. Default is the median distance
+        between held-out pairs of samples (median heuristic). About a fifth of the pairs
+        is held out, so the lengthscale is independent of the pairs that the estimator
+        averages over, and the estimator remains unbiased.
+    random_state :
+        Seed (or generator) for shuffling the samples. Optional.
+
+    Returns
+    -------
+    float
+        Estimated squared MMD.
+    float
+        Standard error of the estimate.
+
+    References
+    ----------
+    .. [1] Gretton, A., Borgwardt, K. M., Rasch, M. J., Schölkopf, B., and Smola, A.
+        A kernel two-sample test. Journal of Machine Learning Research, 2012.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> rng = np.random.default_rng(1)
+    >>> mmd, standard_error = linear_time_mmd(
+    ...     rng.normal(size=(10000, 2)), rng.normal(size=(10000, 2)), random_state=2
+    ... )
+    >>> print(np.abs(mmd) < 3 * standard_error)
+    True
+    """
+    rng = np.random.default_rng(random_state)
+    samples, other_samples = _as_sample_sets(samples, other_samples)
+    num_all_pairs = min(len(samples), len(other_samples)) // 2
+    num_heldout_pairs = max(1, num_all_pairs // 5) if lengthscale is None else 0
+    num_pairs = num_all_pairs - num_heldout_pairs
+    if num_pairs < 2:
+        raise ValueError(
+            "The linear-time MMD requires at least four samples per set "
+            "(six if the lengthscale is estimated)."
+        )
+
+    x = samples[rng.permutation(len(samples))[: 2 * num_all_pairs]]
+    y = other_samples[rng.permutation(len(other_samples))[: 2 * num_all_pairs]]
+    heldout_x, x = x[: 2 * num_heldout_pairs], x[2 * num_heldout_pairs :]
+    heldout_y, y = y[: 2 * num_heldout_pairs], y[2 * num_heldout_pairs :]
+    if lengthscale is None:
+        heldout_distances = _paired_squared_distances(heldout_x, heldout_y)
+        lengthscale = _median_heuristic(
+            np.concatenate(list(heldout_distances.values()))
+        )
+
+    squared_distances = _paired_squared_distances(x, y)
+    kernel = {
+        key: np.exp(-value / (2.0 * lengthscale ** 2))
+        for key, value in squared_distances.items()
+    }
+    summands = kernel["xx"] + kernel["yy"] - kernel["xy"] - kernel["yx"]
+    return np.mean(summands), np.std(summands, ddof=1) / np.sqrt(num_pairs)
+
+
+@instrumentation.instrumented("multivariate.random_features_mmd")
+def random_features_mmd(
+    samples: np.ndarray,
+    other_samples: np.ndarray,
+    lengthscale: float = 1.0,
+    num_features: int = 256,
+    block_size: Optional[int] = None,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+) -> float:
+    r"""Approximate the squared maximum mean discrepancy with random Fourier features.
+
+    The Gaussian kernel is approximated by :math:`k(x, y) \approx z(x)^\top z(y)` with
+    :math:`D` random Fourier features :math:`z(x) = \sqrt{2/D} \cos(Wx + b)`,
+    where :math:`W_{ij} \sim \mathcal{N}(0, \ell^{-2})` and :math:`b_i \sim \mathcal{U}[0, 2\pi]` [1]_. Then,
+
+    .. math:: \widehat{\text{MMD}}^2 = \Big\| \frac{1}{N} \sum_{n=1}^N z(x_n) - \frac{1}{M} \sum_{m=1}^M z(y_m) \Big\|_2^2,
+
+    which costs :math:`O((N + M)dD)`. The features are computed block by block,
+    so only the mean embeddings (and one block of features) are held in memory.
+
+    Parameters
+    ----------
+    samples :
+        **Shape (N, d).** Samples from the first distribution, e.g. from the solution.
+    other_samples :
+        **Shape (M, d).** Samples from the second distribution, e.g. from a reference solution.
+    lengthscale :
+        Lengthscale :math:`\ell` of the Gaussian kernel. Optional. Default is 1.
+    num_features :
+        Number :math:`D` of random Fourier features. Optional. Default is 256.
+    block_size :
+        Number of samples whose features are computed at once. Optional. Default is 1024.
+    random_state :
+        Seed (or generator) for the random features. Optional.
+
+    Returns
+    -------
+    float
+        Approximate squared MMD.
+
+    References
+    ----------
+    .. [1] Rahimi, A. and Recht, B. Random features for large-scale kernel machines.
+        Advances in Neural Information Processing Systems, 2007.
+    """
+    rng = np.random.default_rng(random_state)
+    samples, other_samples = _as_sample_sets(samples, other_samples)
+    frequencies = rng.normal(
+        scale=1.0 / lengthscale, size=(samples.shape[1], num_features)
+    )
+    phases = rng.uniform(0.0, 2.0 * np.pi, size=num_features)
+
+    block_size = _pairwise.DEFAULT_BLOCK_SIZE if block_size is None else block_size
+
+    def _mean_embedding(x):
+        embedding = np.zeros(num_features)
+        for start in range(0, len(x), block_size):
+            features = np.cos(x[start : start + block_size] @ frequencies + phases)
+            embedding += np.sum(features, axis=0)
+        return np.sqrt(2.0 / num_features) * embedding / len(x)
+
+    difference = _mean_embedding(samples) - _mean_embedding(other_samples)
+    return difference @ difference
+
+
+@instrumentation.instrumented("multivariate.energy_distance")
+def energy_distance(
+    samples: np.ndarray,
+    other_samples: np.ndarray,
+    block_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> float:
+    r"""Compute the energy distance between two sets of samples.
+
+    For samples :math:`x_1, ..., x_N` and :math:`y_1, ..., y_M`, compute
+
+    .. math:: \mathcal{E} = \frac{2}{NM} \sum_{n, m} \| x_n - y_m \|_2
+        - \frac{1}{N^2} \sum_{n, n'} \| x_n - x_{n'} \|_2
+        - \frac{1}{M^2} \sum_{m, m'} \| y_m - y_{m'} \|_2,
+
+    which is non-negative, and zero if and only if the empirical distributions coincide.
+    The distance matrices are never formed. Instead, their sums are accumulated tile by tile
+    (see :func:`sample_sample_distance`).
+
+    Parameters
+    ----------
+    samples :
+        **Shape (N, d).** Samples from the first distribution, e.g. from the solution.
+    other_samples :
+        **Shape (M, d).** Samples from the second distribution, e.g. from a reference solution.
+    block_size :
+        Number of samples per tile side. Optional. Default is 1024.
+    max_workers :
+        Number of threads that process tiles in parallel. Optional. Default is None, i.e. no parallelism.
+
+    Returns
+    -------
+    float
+        Energy distance.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> samples = np.array([[0.0], [1.0]])
+    >>> print(energy_distance(samples, samples))
+    0.0
+    >>> print(energy_distance(samples, samples + 1.0))
+    1.0
+    """
+    samples, other_samples = _as_sample_sets(samples, other_samples)
+    tile_function = _pairwise._distance_tile_function(p=2)
+
+    def _mean_distance(x, y):
+        row_sums = _pairwise._pairwise_row_sums(
+            x, y, tile_function, block_size=block_size, max_workers=max_workers
+        )
+        return np.sum(row_sums) / (len(x) * len(y))
+
+    return (
+        2.0 * _mean_distance(samples, other_samples)
+        - _mean_distance(samples, samples)
+        - _mean_distance(other_samples, other_samples)
+    )
+
+
+@instrumentation.instrumented("multivariate.sliced_wasserstein_distance")
+def sliced_wasserstein_distance(
+    samples: np.ndarray,
+    other_samples: np.ndarray,
+    p: int = 2,
+    num_projections: int = 100,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+) -> Union[float, np.ndarray]:
+    r"""Compute the sliced Wasserstein distance between two sets of samples.
+
+    Project both sets of samples onto :math:`L` random directions :math:`\theta_1, ..., \theta_L`
+    (drawn uniformly from the unit sphere), and average the Wasserstein distances of the
+    one-dimensional projections [1]_,
+
+    .. math:: SW_p = \Big( \frac{1}{L} \sum_{l=1}^L W_p^p(\theta_l^\top x, \theta_l^\top y) \Big)^{1/p}.
+
+    In one dimension, the Wasserstein distance compares the empirical quantile functions,
+    i.e. it only requires sorting. All projections are computed with a single matrix-matrix
+    product, so the cost is :math:`O(L(N + M)(d + \log (N + M)))` instead of the cubic cost of
+    exact optimal transport. The sample sizes may differ.
+
+    Stacks of sample sets (e.g. the samples at T time points) are processed at once,
+    with the same projections for every set.
+
+    Parameters
+    ----------
+    samples :
+        **Shape (N, d) or (T, N, d).** Samples from the first distribution, e.g. from the solution.
+    other_samples :
+        **Shape (M, d) or (T, M, d).** Samples from the second distribution, e.g. from a reference solution.
+    p :
+        Order of the Wasserstein distance. At least 1. Default is 2.
+    num_projections :
+        Number :math:`L` of random directions. Optional. Default is 100.
+    random_state :
+        Seed (or generator) for the random directions. Optional.
+
+    Returns
+    -------
+    float or np.ndarray
+        **Shape () or (T,).** Sliced Wasserstein distance(s).
+
+    References
+    ----------
+    .. [1] Bonneel, N., Rabin, J., Peyré, G., and Pfister, H.
+        Sliced and Radon Wasserstein barycenters of measures.
+        Journal of Mathematical Imaging and Vision, 2015.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> samples = np.random.default_rng(1).normal(size=(1000, 2))
+    >>> print(sliced_wasserstein_distance(samples, samples))
+    0.0
+    >>> distance = sliced_wasserstein_distance(samples, samples + 1.0, p=1, random_state=2)
+    >>> print(np.round(distance, 1))
+    0.9
+    """
+    samples = np.asarray(samples, dtype=float)
+    other_samples = np.asarray(other_samples, dtype=float)
+    if samples.ndim not in (2, 3) or samples.ndim != other_samples.ndim:
+        raise ValueError(
+            "The samples must have shape (N, d) and (M, d), or (T, N, d) and (T, M, d)."
+        )
+    if samples.shape[-1] != other_samples.shape[-1]:
+        raise ValueError("The samples must have the same dimension.")
+    if p < 1:
+        raise ValueError("The order of the Wasserstein distance must be at least 1.")
+
+    rng = np.random.default_rng(random_state)
+    directions = rng.normal(size=(samples.shape[-1], num_projections))
+    directions /= np.linalg.norm(directions, axis=0)
+
+    # Shape (..., N, L): one sorted column per projection.
+    projections = np.sort(samples @ directions, axis=-2)
+    other_projections = np.sort(other_samples @ directions, axis=-2)
+
+    # The empirical quantile functions are piecewise constant. Integrate their difference
+    # over the union of their breakpoints (which is exact).
+    num_samples, num_other_samples = samples.shape[-2], other_samples.shape[-2]
+    breakpoints = np.union1d(
+        np.arange(1, num_samples + 1) / num_samples,
+        np.arange(1, num_other_samples + 1) / num_other_samples,
+    )
+    weights = np.diff(breakpoints, prepend=0.0)
+    midpoints = breakpoints - weights / 2.0
+    indices = np.floor(midpoints * num_samples).astype(int)
+    other_indices = np.floor(midpoints * num_other_samples).astype(int)
+
+    differences = np.abs(
+        projections[..., indices, :] - other_projections[..., other_indices, :]
+    )
+    wasserstein_p = np.einsum("...nl,n->...l", differences ** p, weights)
+    return np.mean(wasserstein_p, axis=-1) ** (1.0 / p)
+
+
+def _as_sample_sets(samples, other_samples):
+    samples = np.asarray(samples, dtype=float)
+    other_samples = np.asarray(other_samples, dtype=float)
+    if samples.ndim != 2 or other_samples.ndim != 2:
+        raise ValueError("The samples must have shape (N, d) and (M, d).")
+    if samples.shape[1] != other_samples.shape[1]:
+        raise ValueError("The samples must have the same dimension.")
+    return samples, other_samples
+
+
+def _squared_norms(differences):
+    return np.einsum("nd,nd->n", differences, differences)
+
+
+def _paired_squared_distances(x, y):
+    """Squared distances within and across consecutive pairs of samples."""
+    x1, x2, y1, y2 = x[0::2], x[1::2], y[0::2], y[1::2]
+    return {
+        "xx": _squared_norms(x1 - x2),
+        "yy": _squared_norms(y1 - y2),
+        "xy": _squared_norms(x1 - y2),
+        "yx": _squared_norms(x2 - y1),
+    }
+
+
+def _median_heuristic(squared_distances):
+    lengthscale = np.sqrt(np.median(squared_distances))
+    return lengthscale if lengthscale > 0.0 else 1.0
@@ -8,23 +8,43 @@ https://iopscience.iop.org/article/10.1088/1742-6596/659/1/012022/pdf
 https://arxiv.org/pdf/2012.08202.pdf
 """
 
+from probnumeval import _lazy
 
-from ._calibration_measures import anees, inclination_index, non_credibility_index
-from ._error_measures import (
-    mae,
-    max_error,
-    mean_error,
-    relative_mae,
-    relative_max_error,
-    relative_mean_error,
-    relative_rmse,
-    rmse,
+__getattr__, __dir__ = _lazy.attach(
+    __name__,
+    submodule_attributes={
+        "_calibration_measures": [
+            "anees",
+            "calibration_report",
+            "inclination_index",
+            "non_credibility_index",
+        ],
+        "_error_measures": [
+            "mae",
+            "max_error",
+            "mean_error",
+            "relative_mae",
+            "relative_max_error",
+            "relative_mean_error",
+            "relative_rmse",
+            "rmse",
+        ],
+        "_evaluation_session": ["EvaluationSession"],
+        "_sample_analysis": [
+            "sample_chunks",
+            "sample_reference_distance",
+            "sample_sample_distance",
+        ],
+    },
 )
 
+# The names are provided by the lazy __getattr__:
+# pylint: disable=undefined-all-variable
 __all__ = [
     "anees",
     "non_credibility_index",
     "inclination_index",
+    "calibration_report",
     "rmse",
     "relative_rmse",
     "mae",
@@ -33,4 +53,8 @@ __all__ = [
     "relative_max_error",
     "mean_error",
     "relative_mean_error",
+    "EvaluationSession",
+    "sample_chunks",
+    "sample_reference_distance",
+    "sample_sample_distance",
 ]
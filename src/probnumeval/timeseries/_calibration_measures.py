@@ -7,22 +7,33 @@ Other source
 https://iopscience.iop.org/article/10.1088/1742-6596/659/1/012022/pdf
 """
 
+from typing import Optional
+
 import numpy as np
 
-from probnumeval import multivariate
+from probnumeval import instrumentation, multivariate, utils
 from probnumeval.type import DeterministicSolutionType, ProbabilisticSolutionType
 
+from . import _chunking
+from ._evaluation_session import _evaluate
+
 __all__ = [
     "anees",
     "non_credibility_index",
     "inclination_index",
+    "calibration_report",
 ]
 
+# The following pylint-exception is for the access of the chunked implementations:
+# pylint: disable=protected-access
+
 
+@instrumentation.instrumented("timeseries.anees")
 def anees(
     approximate_solution: ProbabilisticSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     r"""Compute the average normalised estimation error squared.
 
@@ -52,6 +63,10 @@ def anees(
         computed with a non-probabilistic algorithm.)
     locations :
         Set of locations on which to evaluate the statistic.
+    chunk_size :
+        Number of locations on which the solutions are evaluated at once. Optional.
+        If specified, the statistic is accumulated chunk by chunk, which bounds the memory
+        footprint by the chunk size instead of the number of locations.
 
     Returns
     -------
@@ -66,18 +81,33 @@ def anees(
 
     """
 
-    approximate_evaluation = approximate_solution(locations)
-    reference_evaluation = reference_solution(locations)
+    if chunk_size is not None:
+        return _chunking._chunked_calibration_measures(
+            approximate_solution,
+            reference_solution,
+            locations,
+            chunk_size=chunk_size,
+            with_reference=False,
+        )["anees"]
+
+    approximate_evaluation = _evaluate(
+        approximate_solution, locations, stage="evaluate_approximate_solution"
+    )
+    reference_evaluation = _evaluate(
+        reference_solution, locations, stage="evaluate_reference_solution"
+    )
     return multivariate.anees(
         approximate_solution=approximate_evaluation,
         reference_solution=reference_evaluation,
     )
 
 
+@instrumentation.instrumented("timeseries.non_credibility_index")
 def non_credibility_index(
     approximate_solution: ProbabilisticSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     r"""Compute the non-credibility index (NCI).
 
@@ -96,6 +126,10 @@ def non_credibility_index(
         computed with a non-probabilistic algorithm.)
     locations :
         Set of locations on which to evaluate the statistic.
+    chunk_size :
+        Number of locations on which the solutions are evaluated at once. Optional.
+        If specified, the statistic is accumulated chunk by chunk, which bounds the memory
+        footprint by the chunk size instead of the number of locations.
 
     Returns
     -------
@@ -107,18 +141,33 @@ def non_credibility_index(
         An alternative calibration measure.
 
     """
-    approximate_evaluation = approximate_solution(locations)
-    reference_evaluation = reference_solution(locations)
+    if chunk_size is not None:
+        return _chunking._chunked_calibration_measures(
+            approximate_solution,
+            reference_solution,
+            locations,
+            chunk_size=chunk_size,
+            with_reference=True,
+        )["non_credibility_index"]
+
+    approximate_evaluation = _evaluate(
+        approximate_solution, locations, stage="evaluate_approximate_solution"
+    )
+    reference_evaluation = _evaluate(
+        reference_solution, locations, stage="evaluate_reference_solution"
+    )
     return multivariate.non_credibility_index(
         approximate_solution=approximate_evaluation,
         reference_solution=reference_evaluation,
     )
 
 
+@instrumentation.instrumented("timeseries.inclination_index")
 def inclination_index(
     approximate_solution: ProbabilisticSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     r"""Compute the inclination index (II).
 
@@ -137,6 +186,10 @@ def inclination_index(
         computed with a non-probabilistic algorithm.)
     locations :
         Set of locations on which to evaluate the statistic.
+    chunk_size :
+        Number of locations on which the solutions are evaluated at once. Optional.
+        If specified, the statistic is accumulated chunk by chunk, which bounds the memory
+        footprint by the chunk size instead of the number of locations.
 
     Returns
     -------
@@ -149,9 +202,96 @@ def inclination_index(
     non_credibility_index
         An alternative calibration measure.
     """
-    approximate_evaluation = approximate_solution(locations)
-    reference_evaluation = reference_solution(locations)
+    if chunk_size is not None:
+        return _chunking._chunked_calibration_measures(
+            approximate_solution,
+            reference_solution,
+            locations,
+            chunk_size=chunk_size,
+            with_reference=True,
+        )["inclination_index"]
+
+    approximate_evaluation = _evaluate(
+        approximate_solution, locations, stage="evaluate_approximate_solution"
+    )
+    reference_evaluation = _evaluate(
+        reference_solution, locations, stage="evaluate_reference_solution"
+    )
     return multivariate.inclination_index(
         approximate_solution=approximate_evaluation,
         reference_solution=reference_evaluation,
     )
+
+
+@instrumentation.instrumented("timeseries.calibration_report")
+def calibration_report(
+    approximate_solution: ProbabilisticSolutionType,
+    reference_solution: DeterministicSolutionType,
+    locations: np.ndarray,
+    perc: float = 0.95,
+    chunk_size: Optional[int] = None,
+):
+    r"""Compute the ANEES, the NCI, and the inclination index at once.
+
+    The approximate and the reference solution are evaluated only once,
+    and all covariance matrices are factorized only once.
+
+    Parameters
+    ----------
+    approximate_solution :
+        Approximate solution as returned by a Kalman filter or ODE solver. This must be a `FiltSmoothPosterior`.
+    reference_solution :
+        Reference solution. (This is not assumed to be a `TimeSeriesPosterior`, because
+        ideally this is the true solution of a problem; often, it is a reference solution
+        computed with a non-probabilistic algorithm.)
+    locations :
+        Set of locations on which to evaluate the statistics.
+    perc :
+        Confidence level of the chi-squared confidence interval. Optional. Default is 0.95.
+    chunk_size :
+        Number of locations on which the solutions are evaluated at once. Optional.
+        If specified, the statistics are accumulated chunk by chunk, which bounds the memory
+        footprint by the chunk size instead of the number of locations.
+
+    Returns
+    -------
+    CalibrationReport
+        ANEES, NCI, inclination index, and the chi-squared confidence interval.
+
+    See also
+    --------
+    anees
+        Average normalised estimation error squared.
+    non_credibility_index
+        Non-credibility index.
+    inclination_index
+        Inclination index.
+    """
+    if chunk_size is not None:
+        measures = _chunking._chunked_calibration_measures(
+            approximate_solution,
+            reference_solution,
+            locations,
+            chunk_size=chunk_size,
+            with_reference=True,
+        )
+        return multivariate.CalibrationReport(
+            anees=measures["anees"],
+            non_credibility_index=measures["non_credibility_index"],
+            inclination_index=measures["inclination_index"],
+            chi2_confidence_interval=utils.chi2_confidence_intervals(
+                dim=measures["dim"], perc=perc
+            ),
+        )
+
+    approximate_evaluation = _evaluate(
+        approximate_solution, locations, stage="evaluate_approximate_solution"
+    )
+    reference_evaluation = _evaluate(
+        reference_solution, locations, stage="evaluate_reference_solution"
+    )
+    return multivariate.calibration_report(
+        approximate_solution=approximate_evaluation,
+        reference_solution=reference_evaluation,
+        perc=perc,
+    )
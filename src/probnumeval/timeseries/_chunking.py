@@ -0,0 +1,139 @@
+"""Evaluate metrics block-by-block on long location grids.
+
+Instead of evaluating the approximate and the reference solution on the full grid,
+the grid is split into chunks of locations, and only the sums and maxima
+that each metric needs are accumulated.
+"""
+
+import numpy as np
+
+from probnumeval.multivariate import (
+    _accumulators,
+    _calibration_measures,
+    _inversion_diagnostics,
+)
+
+from ._evaluation_session import _evaluate
+
+# The following pylint-exception is for the access of private multivariate helpers:
+# pylint: disable=protected-access
+
+
+def _location_chunks(locations: np.ndarray, chunk_size: int):
+    """Split a grid of locations into consecutive chunks."""
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be a positive integer.")
+    locations = np.asarray(locations)
+    for start in range(0, len(locations), chunk_size):
+        yield locations[start : start + chunk_size]
+
+
+def _chunked_mean_error(
+    approximate_solution, reference_solution, locations, p, chunk_size, relative
+):
+    """Accumulate the (relative) mean error chunk by chunk."""
+    accumulator = (
+        _accumulators.RelativeMeanErrorAccumulator(p=p)
+        if relative
+        else _accumulators.MeanErrorAccumulator(p=p)
+    )
+    for chunk in _location_chunks(locations, chunk_size):
+        accumulator.update(
+            mean_chunk=_evaluate(
+                approximate_solution, chunk, stage="evaluate_approximate_solution"
+            ),
+            cov_chunk=None,
+            reference_chunk=_evaluate(
+                reference_solution, chunk, stage="evaluate_reference_solution"
+            ),
+        )
+    return accumulator.result()
+
+
+def _chunked_calibration_measures(
+    approximate_solution, reference_solution, locations, chunk_size, with_reference
+):
+    """Accumulate ANEES, NCI, and II chunk by chunk.
+
+    The ANEES only requires a running sum of the normalized discrepancies.
+    NCI and II compare the normalized discrepancies to the discrepancies w.r.t.
+    the sample covariance of all centered means, which is only known after
+    a first pass over the grid. Therefore, the solutions are evaluated twice
+    if ``with_reference`` is true: the first pass accumulates the sample covariance
+    (and stores one log-discrepancy per location), the second pass evaluates
+    the reference discrepancies.
+
+    Returns
+    -------
+    dict
+        ANEES, NCI, and II (the latter two are None if ``with_reference`` is false),
+        as well as the dimension of the solution.
+    """
+    log_discrepancies = []
+    sum_discrepancies = 0.0
+    dim = None
+    sample_covariance = _accumulators._RunningCovariance()
+    first_step = _inversion_diagnostics._next_step()
+
+    for chunk in _location_chunks(locations, chunk_size):
+        (
+            centered_mean,
+            normalized_discrepancies,
+        ) = _calibration_measures._compute_solution_discrepancies(
+            _evaluate(
+                approximate_solution, chunk, stage="evaluate_approximate_solution"
+            ),
+            _evaluate(reference_solution, chunk, stage="evaluate_reference_solution"),
+        )
+        sum_discrepancies += np.sum(normalized_discrepancies)
+        dim = centered_mean.shape[1]
+        if with_reference:
+            log_discrepancies.append(np.log10(normalized_discrepancies))
+            sample_covariance.update(centered_mean)
+
+    num_locations = len(locations)
+    measures = dict(
+        anees=sum_discrepancies / num_locations,
+        non_credibility_index=None,
+        inclination_index=None,
+        dim=dim,
+    )
+    if not with_reference:
+        return measures
+
+    log_discrepancies = np.concatenate(log_discrepancies)
+    sample_covariance_matrix = sample_covariance.covariance()
+
+    # The sample covariance is factorized once and reused for all chunks.
+    shared_covariance_discrepancies = (
+        _calibration_measures._factorize_shared_covariance(sample_covariance_matrix)
+    )
+    log_reference_discrepancies = []
+    with _inversion_diagnostics._revisit_steps(first_step):
+        for chunk in _location_chunks(locations, chunk_size):
+            centered_mean, _ = _evaluate_centered_chunk(
+                approximate_solution, reference_solution, chunk
+            )
+            reference_discrepancies = shared_covariance_discrepancies(centered_mean)
+            log_reference_discrepancies.append(np.log10(reference_discrepancies))
+    log_reference_discrepancies = np.concatenate(log_reference_discrepancies)
+
+    measures["non_credibility_index"] = 10 * np.mean(
+        np.abs(log_discrepancies - log_reference_discrepancies)
+    )
+    measures["inclination_index"] = 10 * (
+        np.mean(log_discrepancies) - np.mean(log_reference_discrepancies)
+    )
+    return measures
+
+
+def _evaluate_centered_chunk(approximate_solution, reference_solution, chunk):
+    approximate_evaluation = _evaluate(
+        approximate_solution, chunk, stage="evaluate_approximate_solution"
+    )
+    reference_evaluation = _evaluate(
+        reference_solution, chunk, stage="evaluate_reference_solution"
+    )
+    return _calibration_measures._center_and_stack(
+        approximate_evaluation, reference_evaluation
+    )
@@ -1,10 +1,14 @@
 """Error measures for time-series problems."""
 
+from typing import Optional
+
 import numpy as np
 
-from probnumeval import multivariate
+from probnumeval import instrumentation, multivariate
 from probnumeval.type import DeterministicSolutionType
 
+from ._evaluation_session import _evaluate
+
 __all__ = [
     "rmse",
     "relative_rmse",
@@ -16,11 +20,16 @@ __all__ = [
     "relative_mean_error",
 ]
 
+# The following pylint-exception is for the access of the chunked implementations:
+# pylint: disable=protected-access
 
+
+@instrumentation.instrumented("timeseries.rmse")
 def rmse(
     approximate_solution: DeterministicSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     """Compute the root mean-square error."""
     return mean_error(
@@ -28,13 +37,16 @@ def rmse(
         reference_solution=reference_solution,
         locations=locations,
         p=2,
+        chunk_size=chunk_size,
     )
 
 
+@instrumentation.instrumented("timeseries.relative_rmse")
 def relative_rmse(
     approximate_solution: DeterministicSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     """Compute the root mean-square error."""
     return relative_mean_error(
@@ -42,13 +54,16 @@ def relative_rmse(
         reference_solution=reference_solution,
         locations=locations,
         p=2,
+        chunk_size=chunk_size,
     )
 
 
+@instrumentation.instrumented("timeseries.max_error")
 def max_error(
     approximate_solution: DeterministicSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     """Compute the root mean-square error."""
     return mean_error(
@@ -56,13 +71,16 @@ def max_error(
         reference_solution=reference_solution,
         locations=locations,
         p=np.inf,
+        chunk_size=chunk_size,
     )
 
 
+@instrumentation.instrumented("timeseries.relative_max_error")
 def relative_max_error(
     approximate_solution: DeterministicSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     """Compute the root mean-square error."""
     return relative_mean_error(
@@ -70,13 +88,16 @@ def relative_max_error(
         reference_solution=reference_solution,
         locations=locations,
         p=np.inf,
+        chunk_size=chunk_size,
     )
 
 
+@instrumentation.instrumented("timeseries.mae")
 def mae(
     approximate_solution: DeterministicSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     """Compute the root mean-square error."""
     return mean_error(
@@ -84,13 +105,16 @@ def mae(
         reference_solution=reference_solution,
         locations=locations,
         p=1,
+        chunk_size=chunk_size,
     )
 
 
+@instrumentation.instrumented("timeseries.relative_mae")
 def relative_mae(
     approximate_solution: DeterministicSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
+    chunk_size: Optional[int] = None,
 ):
     """Compute the root mean-square error."""
     return relative_mean_error(
@@ -98,18 +122,41 @@ def relative_mae(
         reference_solution=reference_solution,
         locations=locations,
         p=1,
+        chunk_size=chunk_size,
     )
 
 
+@instrumentation.instrumented("timeseries.mean_error")
 def mean_error(
     approximate_solution: DeterministicSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
     p: int,
+    chunk_size: Optional[int] = None,
 ):
-    """Compute the mean error."""
-    approximate_evaluation = approximate_solution(locations)
-    reference_evaluation = reference_solution(locations)
+    """Compute the mean error.
+
+    If a ``chunk_size`` is specified, the solutions are evaluated on chunks of
+    at most ``chunk_size`` locations at a time, which bounds the memory footprint.
+    """
+    if chunk_size is not None:
+        # The chunked accumulators import probnum and scipy, which plain errors never need.
+        from . import _chunking  # pylint: disable=import-outside-toplevel
+
+        return _chunking._chunked_mean_error(
+            approximate_solution,
+            reference_solution,
+            locations,
+            p=p,
+            chunk_size=chunk_size,
+            relative=False,
+        )
+    approximate_evaluation = _evaluate(
+        approximate_solution, locations, stage="evaluate_approximate_solution"
+    )
+    reference_evaluation = _evaluate(
+        reference_solution, locations, stage="evaluate_reference_solution"
+    )
     return multivariate.mean_error(
         approximate_solution=approximate_evaluation,
         reference_solution=reference_evaluation,
@@ -117,15 +164,36 @@ def mean_error(
     )
 
 
+@instrumentation.instrumented("timeseries.relative_mean_error")
 def relative_mean_error(
     approximate_solution: DeterministicSolutionType,
     reference_solution: DeterministicSolutionType,
     locations: np.ndarray,
     p: int,
+    chunk_size: Optional[int] = None,
 ):
-    """Compute the relative mean error."""
-    approximate_evaluation = approximate_solution(locations)
-    reference_evaluation = reference_solution(locations)
+    """Compute the relative mean error.
+
+    If a ``chunk_size`` is specified, the solutions are evaluated on chunks of
+    at most ``chunk_size`` locations at a time, which bounds the memory footprint.
+    """
+    if chunk_size is not None:
+        from . import _chunking  # pylint: disable=import-outside-toplevel
+
+        return _chunking._chunked_mean_error(
+            approximate_solution,
+            reference_solution,
+            locations,
+            p=p,
+            chunk_size=chunk_size,
+            relative=True,
+        )
+    approximate_evaluation = _evaluate(
+        approximate_solution, locations, stage="evaluate_approximate_solution"
+    )
+    reference_evaluation = _evaluate(
+        reference_solution, locations, stage="evaluate_reference_solution"
+    )
     return multivariate.relative_mean_error(
         approximate_solution=approximate_evaluation,
         reference_solution=reference_evaluation,
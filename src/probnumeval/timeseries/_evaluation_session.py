@@ -0,0 +1,117 @@
+"""Reuse evaluations of solutions across several metrics."""
+
+import collections
+import contextvars
+import hashlib
+import threading
+from typing import Optional
+
+import numpy as np
+
+from probnumeval import instrumentation
+
+__all__ = ["EvaluationSession"]
+
+
+class EvaluationSession:
+    """Context manager that caches evaluations of approximate and reference solutions.
+
+    Inside the context, all functions in :mod:`probnumeval.timeseries` evaluate
+    a solution on a set of locations at most once. Subsequent metrics reuse the cached
+    evaluation. Cache entries are keyed on the identity of the solution and a hash of
+    the locations, and the least recently used entry is evicted once the cache is full.
+    The active session is local to the current thread (or asyncio task); a session can be
+    shared across threads, e.g. with :func:`probnumeval.evaluate_many`.
+
+    Parameters
+    ----------
+    maxsize :
+        Maximum number of cached evaluations. Optional. Default is 16.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from probnumeval import timeseries
+    >>> locations = np.linspace(0.0, 1.0, 10)
+    >>> with timeseries.EvaluationSession() as session:
+    ...     rmse = timeseries.rmse(np.sin, np.cos, locations)
+    ...     mae = timeseries.mae(np.sin, np.cos, locations)
+    >>> print(session.misses, session.hits)
+    2 2
+    """
+
+    def __init__(self, maxsize: int = 16):
+        if maxsize < 1:
+            raise ValueError("The cache of an evaluation session needs maxsize >= 1.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self):
+        self._token = _ACTIVE_SESSION.set(self)
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        _ACTIVE_SESSION.reset(self._token)
+        self._token = None
+
+    def __len__(self):
+        return len(self._cache)
+
+    def evaluate(self, solution, locations: np.ndarray):
+        """Evaluate a solution on a set of locations, or look the result up in the
+        cache."""
+        locations = np.asarray(locations)
+        key = (id(solution), locations.shape, locations.dtype.str, _hash(locations))
+
+        with self._lock:
+            if key in self._cache:
+                cached_solution, cached_locations, evaluation = self._cache[key]
+                # The reference to the solution keeps its id() from being reused,
+                # and comparing the locations rules out hash collisions.
+                if cached_solution is solution and np.array_equal(
+                    cached_locations, locations
+                ):
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return evaluation
+            self.misses += 1
+
+        # Evaluate outside of the lock, so other threads are not blocked meanwhile.
+        evaluation = solution(locations)
+        with self._lock:
+            self._cache[key] = (solution, locations.copy(), evaluation)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return evaluation
+
+    def clear(self):
+        """Remove all cached evaluations."""
+        with self._lock:
+            self._cache.clear()
+
+
+_ACTIVE_SESSION = contextvars.ContextVar("evaluation_session", default=None)
+"""Evaluation session that is currently active (if any)."""
+
+
+def _evaluate(solution, locations: np.ndarray, stage: str = "evaluate"):
+    """Evaluate a solution, reusing the active evaluation session if there is one.
+
+    The evaluation is instrumented as the given stage.
+    """
+    with instrumentation.stage(stage, shape=np.shape(locations)):
+        session = _ACTIVE_SESSION.get()
+        if session is None:
+            return solution(locations)
+        return session.evaluate(solution, locations)
+
+
+def _hash(locations: np.ndarray) -> str:
+    return hashlib.blake2b(
+        np.ascontiguousarray(locations).tobytes(), digest_size=16
+    ).hexdigest()
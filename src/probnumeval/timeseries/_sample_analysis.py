@@ -0,0 +1,232 @@
+"""Extract information out of trajectory samples from a time-series posterior."""
+
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+from probnumeval import instrumentation, multivariate
+from probnumeval.multivariate import _pairwise
+
+from ._evaluation_session import _evaluate
+
+# The following pylint-exception is for the access of the pairwise distance tiles:
+# pylint: disable=protected-access
+
+__all__ = [
+    "sample_chunks",
+    "sample_reference_distance",
+    "sample_sample_distance",
+]
+
+DEFAULT_CHUNK_SIZE = 1024
+"""Default number of trajectory samples per chunk."""
+
+_MAX_TILE_ENTRIES = 2 ** 22
+"""Maximum number of entries of the sample differences that a batch of distance tiles
+(over several locations) holds at once."""
+
+
+def sample_chunks(
+    approximate_solution,
+    locations: np.ndarray,
+    num_samples: int,
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+) -> Iterator[np.ndarray]:
+    """Draw trajectory samples on a grid of locations, one chunk of samples at a time.
+
+    Each sample is a full trajectory, i.e. the samples are shared across locations.
+    Every chunk is drawn with its own seed (derived from ``random_state``),
+    so iterating again with the same integer ``random_state`` reproduces exactly the same samples.
+
+    Parameters
+    ----------
+    approximate_solution :
+        Approximate solution, e.g. a ``filtsmooth.TimeSeriesPosterior``. It must provide a method
+        ``sample(t, size, random_state)``.
+    locations :
+        **Shape (T,).** Locations at which the trajectories are evaluated.
+    num_samples :
+        Total number S of trajectory samples.
+    chunk_size :
+        Number of trajectory samples per chunk. Optional. Default is 1024.
+        If None, all samples are drawn at once.
+    random_state :
+        Seed (or generator) for the samples. Optional.
+
+    Yields
+    ------
+    np.ndarray
+        **Shape (T, S_chunk, d).** A chunk of trajectory samples.
+    """
+    for chunk_slice, seed in _chunk_seeds(num_samples, chunk_size, random_state):
+        yield _draw_chunk(approximate_solution, locations, chunk_slice, seed)
+
+
+@instrumentation.instrumented("timeseries.sample_reference_distance")
+def sample_reference_distance(
+    approximate_solution,
+    reference_solution,
+    locations: np.ndarray,
+    num_samples: int,
+    p: int = 2,
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+) -> np.ndarray:
+    r"""Compute the sample-reference distance at every location.
+
+    For trajectory samples :math:`x_1, ..., x_S` and a reference solution :math:`\xi`,
+    compute the dimension-normalized sample-reference distances
+
+    .. math:: R_s(t) = \frac{1}{d} \| x_s(t) - \xi(t) \|_p
+
+    for all locations :math:`t` at once. Only one chunk of samples is held in memory at a time.
+
+    Parameters
+    ----------
+    approximate_solution :
+        Approximate solution, e.g. a ``filtsmooth.TimeSeriesPosterior``, from which trajectories are sampled.
+    reference_solution :
+        Reference solution, i.e. a callable that maps the locations to an array of shape (T, d).
+    locations :
+        **Shape (T,).** Locations at which the distances are computed.
+    num_samples :
+        Number S of trajectory samples.
+    p :
+        Order of the underlying norm that shall be used. At least 1, at most infinity. Default is 2, which corresponds to the RMSE.
+    chunk_size :
+        Number of trajectory samples per chunk. Optional. Default is 1024.
+        If None, all samples are drawn at once.
+    random_state :
+        Seed (or generator) for the samples. Optional.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (T, S).** Sample-reference distances :math:`R_s(t)`.
+
+    See also
+    --------
+    probnumeval.multivariate.sample_reference_distance
+        The sample-reference distance at a single location.
+    """
+    reference = np.reshape(
+        _evaluate(reference_solution, locations, stage="evaluate_reference_solution"),
+        (len(locations), -1),
+    )
+    distances = [
+        multivariate.sample_reference_distance(chunk, reference, p=p)
+        for chunk in sample_chunks(
+            approximate_solution,
+            locations,
+            num_samples,
+            chunk_size=chunk_size,
+            random_state=random_state,
+        )
+    ]
+    return np.concatenate(distances, axis=1)
+
+
+@instrumentation.instrumented("timeseries.sample_sample_distance")
+def sample_sample_distance(
+    approximate_solution,
+    locations: np.ndarray,
+    num_samples: int,
+    p: int = 2,
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+) -> np.ndarray:
+    r"""Compute the sample-sample distance at every location.
+
+    For trajectory samples :math:`x_1, ..., x_S`, compute the dimension-normalized sample-sample distances
+
+    .. math:: E_k(t) = \frac{1}{dS} \sum_{s=1}^S \| x_k(t) - x_s(t) \|_p
+
+    for all locations :math:`t` at once.
+    The pairs of chunks are processed one after another, and the chunks are
+    redrawn from their seeds instead of being stored, i.e. at most two chunks of samples
+    are held in memory at a time (at the cost of drawing each chunk repeatedly).
+    The distances between two chunks are computed for blocks of locations at once,
+    and the blocks are sized such that the differences of the samples
+    in a block never have more than :math:`2^{22}` entries.
+
+    Parameters
+    ----------
+    approximate_solution :
+        Approximate solution, e.g. a ``filtsmooth.TimeSeriesPosterior``, from which trajectories are sampled.
+    locations :
+        **Shape (T,).** Locations at which the distances are computed.
+    num_samples :
+        Number S of trajectory samples.
+    p :
+        Order of the underlying norm that shall be used. At least 1, at most infinity. Default is 2, which corresponds to the RMSE.
+    chunk_size :
+        Number of trajectory samples per chunk. Optional. Default is 1024.
+        If None, all samples are drawn at once.
+    random_state :
+        Seed (or generator) for the samples. Optional.
+        With the same seed, the samples coincide with those of :func:`sample_reference_distance`.
+
+    Returns
+    -------
+    np.ndarray
+        **Shape (T, S).** Sample-sample distances :math:`E_k(t)`.
+
+    See also
+    --------
+    probnumeval.multivariate.sample_sample_distance
+        The sample-sample distance at a single location.
+    """
+    chunks = _chunk_seeds(num_samples, chunk_size, random_state)
+    num_locations = len(locations)
+    distance_sums = np.zeros((num_locations, num_samples))
+    dim = None
+    for i, (row_slice, row_seed) in enumerate(chunks):
+        row_chunk = _draw_chunk(approximate_solution, locations, row_slice, row_seed)
+        dim = row_chunk.shape[-1]
+
+        # The distance matrix is symmetric, so each pair of chunks is drawn only once,
+        # and its tile contributes to the row sums of both chunks.
+        for column_slice, column_seed in chunks[i:]:
+            column_chunk = (
+                row_chunk
+                if column_slice == row_slice
+                else _draw_chunk(
+                    approximate_solution, locations, column_slice, column_seed
+                )
+            )
+            tile_entries = row_chunk.shape[1] * column_chunk.shape[1] * dim
+            block_size = max(1, _MAX_TILE_ENTRIES // tile_entries)
+            for start in range(0, num_locations, block_size):
+                block = slice(start, start + block_size)
+                tiles = _pairwise._batched_distance_tiles(
+                    row_chunk[block], column_chunk[block], p
+                )
+                distance_sums[block, row_slice] += np.sum(tiles, axis=2)
+                if column_slice != row_slice:
+                    distance_sums[block, column_slice] += np.sum(tiles, axis=1)
+    return distance_sums / (num_samples * dim)
+
+
+def _chunk_seeds(num_samples, chunk_size, random_state):
+    """Split the samples into chunks and derive one seed per chunk."""
+    if num_samples < 1:
+        raise ValueError("The number of samples must be a positive integer.")
+    chunk_size = num_samples if chunk_size is None else chunk_size
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be a positive integer.")
+    rng = np.random.default_rng(random_state)
+    chunk_starts = range(0, num_samples, chunk_size)
+    seeds = rng.integers(2 ** 32, size=len(chunk_starts))
+    return [
+        (slice(start, min(start + chunk_size, num_samples)), int(seed))
+        for start, seed in zip(chunk_starts, seeds)
+    ]
+
+
+def _draw_chunk(approximate_solution, locations, chunk_slice, seed):
+    locations = np.asarray(locations)
+    size = chunk_slice.stop - chunk_slice.start
+    samples = approximate_solution.sample(t=locations, size=size, random_state=seed)
+    samples = np.reshape(samples, (size, len(locations), -1))
+    return np.transpose(samples, axes=(1, 0, 2))
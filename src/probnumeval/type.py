@@ -1,12 +1,24 @@
 """Types."""
 
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 import numpy as np
-from probnum import filtsmooth
 
 __all__ = ["ProbabilisticSolutionType", "DeterministicSolutionType"]
 
-ProbabilisticSolutionType = filtsmooth.TimeSeriesPosterior
-
 DeterministicSolutionType = Callable[[np.ndarray], np.ndarray]
+
+if TYPE_CHECKING:
+    # At runtime, the alias is provided by the module __getattr__.
+    from probnum import filtsmooth
+
+    ProbabilisticSolutionType = filtsmooth.TimeSeriesPosterior
+
+
+def __getattr__(name):
+    # probnum is only imported if the probabilistic solution type is needed.
+    if name == "ProbabilisticSolutionType":
+        from probnum import filtsmooth  # pylint: disable=import-outside-toplevel
+
+        return filtsmooth.TimeSeriesPosterior
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,17 @@
 """Visualize random variables and random processes."""
 
+from ._animate_posterior import animate_posterior_samples
 from ._animate_samples import (
     animate_with_great_circle_of_unitsphere,
+    animate_with_great_circle_of_unitsphere_in_chunks,
     animate_with_periodic_gp,
     geodesic_sphere,
 )
 
 __all__ = [
+    "animate_posterior_samples",
     "animate_with_periodic_gp",
     "animate_with_great_circle_of_unitsphere",
+    "animate_with_great_circle_of_unitsphere_in_chunks",
     "geodesic_sphere",
 ]
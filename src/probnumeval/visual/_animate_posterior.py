@@ -0,0 +1,148 @@
+"""Animate samples from a time-series posterior."""
+
+from typing import Iterator
+
+import numpy as np
+
+from ._animate_samples import (
+    animate_with_great_circle_of_unitsphere_in_chunks,
+    animate_with_periodic_gp,
+)
+
+
+def animate_posterior_samples(
+    posterior,
+    locations: np.ndarray,
+    num_frames: int,
+    joint: bool = False,
+    method: str = "great_circle",
+    endpoint: bool = False,
+) -> Iterator[np.ndarray]:
+    """Animate samples from a time-series posterior, one frame at a time.
+
+    Animated samples from a standard Normal distribution (see
+    :func:`animate_with_great_circle_of_unitsphere` and :func:`animate_with_periodic_gp`)
+    are mapped to samples from the posterior frame by frame. For the marginals,
+    the covariances are factorized once and the frames are pushed through the factors.
+    For the joint posterior, every frame is passed through the posterior's own sampler,
+    which maps base measure realizations affinely to sample paths.
+    Every frame is a sample from the posterior, and consecutive frames are similar.
+
+    Parameters
+    ----------
+    posterior :
+        Time-series posterior, e.g. a ``filtsmooth.SmoothingPosterior``.
+        Evaluating it on the locations must give random variables with ``mean`` and ``cov``.
+    locations :
+        **Shape (T,).** Locations at which the sample paths are animated.
+    num_frames :
+        Number of frames in the animation.
+    joint :
+        Whether the frames are sample paths from the joint posterior over all locations,
+        or whether the locations are sampled independently from the marginals.
+        Optional. Default is False.
+        Joint sample paths require a ``transform_base_measure_realizations`` method
+        (and the ``locations`` and ``states``) of the posterior, which is called once per
+        frame, i.e. no joint covariance is formed.
+    method :
+        How the standard Normal samples are animated. Either ``"great_circle"``, in which case
+        only one frame is held in memory at a time, or ``"periodic_gp"``, in which case the
+        standard Normal samples for all frames are computed at once.
+        Optional. Default is ``"great_circle"``.
+    endpoint :
+        Whether the final frame should be equal to the first frame. Optional. Default is False.
+
+    Yields
+    ------
+    np.ndarray
+        **Shape (T, d).** A frame, i.e. a (marginal or joint) sample path evaluated at the locations.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from probnum import randvars
+    >>> def posterior(locations):
+    ...     return [randvars.Normal(np.zeros(2), np.eye(2)) for _ in locations]
+    >>> frames = animate_posterior_samples(posterior, np.linspace(0.0, 1.0, 5), num_frames=20)
+    >>> print(next(frames).shape)
+    (5, 2)
+    """
+    locations = np.asarray(locations)
+    if method not in ("great_circle", "periodic_gp"):
+        raise ValueError(f"Animation method '{method}' is not known.")
+
+    if joint:
+        base_shape, transform = _joint_transform(posterior, locations)
+    else:
+        base_shape, transform = _marginal_transform(posterior, locations)
+    num_base_samples = int(np.prod(base_shape))
+
+    def _frames():
+        if method == "great_circle":
+            base_frames = (
+                frame
+                for chunk in animate_with_great_circle_of_unitsphere_in_chunks(
+                    num_base_samples, num_frames, chunk_size=1, endpoint=endpoint
+                )
+                for frame in chunk
+            )
+        else:
+            base_frames = animate_with_periodic_gp(
+                num_base_samples, num_frames, endpoint=endpoint
+            )
+
+        for base_frame in base_frames:
+            yield transform(np.reshape(base_frame, base_shape))
+
+    return _frames()
+
+
+def _marginal_transform(posterior, locations):
+    """Shape of the base measure realizations, and their map to marginal samples."""
+    mean, factor = _marginal_mean_and_factor(posterior, locations)
+
+    def transform(base_frame):
+        return mean + np.einsum("tij,tj->ti", factor, base_frame)
+
+    return mean.shape, transform
+
+
+def _marginal_mean_and_factor(posterior, locations):
+    """Means and square-root factors of the marginal covariances.
+
+    The factors are symmetric square roots, which exist even if a covariance is singular
+    (e.g. at the initial location of an ODE solution). The posterior is evaluated on the
+    sorted locations, and the results are returned in the order of the locations.
+    """
+    sorted_locations, inverse = np.unique(locations, return_inverse=True)
+    rvs = posterior(sorted_locations)
+    mean = np.stack([rv.mean for rv in rvs]).reshape((len(sorted_locations), -1))
+    cov = np.stack([rv.cov for rv in rvs])
+    cov = cov.reshape((len(sorted_locations), mean.shape[-1], mean.shape[-1]))
+    mean, cov = mean[inverse], cov[inverse]
+
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    sqrt_eigenvalues = np.sqrt(np.maximum(eigenvalues, 0.0))
+    return mean, eigenvectors * sqrt_eigenvalues[:, None, :]
+
+
+def _joint_transform(posterior, locations):
+    """Shape of the base measure realizations, and their map to joint sample paths.
+
+    As in the posterior's sampler, the locations of the posterior are included in the
+    (sorted) grid, and the requested locations are sliced out afterwards,
+    in the order in which they were requested.
+    """
+    all_locations, inverse = np.unique(
+        np.concatenate((locations, posterior.locations)), return_inverse=True
+    )
+    location_indices = inverse[: len(locations)]
+    base_shape = (len(all_locations),) + np.shape(posterior.states[0].mean)
+
+    def transform(base_frame):
+        sample_path = posterior.transform_base_measure_realizations(
+            base_measure_realizations=base_frame, t=all_locations
+        )
+        return np.reshape(sample_path[location_indices], (len(locations), -1))
+
+    return base_shape, transform
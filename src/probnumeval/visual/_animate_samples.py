@@ -1,12 +1,20 @@
 """Animate samples from a standard Normal distribution."""
 
+import functools
+
 import numpy as np
 
 
 def animate_with_periodic_gp(d, num_frames, base_measure_sample=None, endpoint=False):
-    """Animate samples from a standard Normal distribution by drawing samples from a
+    r"""Animate samples from a standard Normal distribution by drawing samples from a
     periodic Gaussian process.
 
+    On the equispaced, periodic grid of frames, the kernel matrix is circulant, i.e. it is
+    diagonalized by the discrete Fourier transform. The samples are therefore computed with
+    FFTs in :math:`O(F \log F)` per dimension (for :math:`F` frames), and neither the kernel matrix
+    nor its Cholesky factor are ever formed. The eigenvalues of the kernel matrix
+    only depend on the number of frames (and the endpoint), and are cached across calls.
+
     Parameters
     ----------
     d :
@@ -17,6 +25,7 @@ def animate_with_periodic_gp(d, num_frames, base_measure_sample=None, endpoint=F
     base_measure_sample:
         **Shape (num_steps, d).**
         I.i.d. samples from a standard Normal distribution.
+        If the endpoint is included, the final row is not used.
     endpoint
         Whether the final state should be equal to the first state. Optional. Default is False.
 
@@ -34,41 +43,70 @@ def animate_with_periodic_gp(d, num_frames, base_measure_sample=None, endpoint=F
     >>> dim, num_frames = 2, 10
     >>> states = animate_with_periodic_gp(dim, num_frames)
     >>> print(np.round(states, 1))
-    [[ 0.5 -0.5]
-     [ 0.3 -0.7]
-     [ 0.6 -0.3]
-     [ 1.6 -1.3]
-     [ 1.1 -1.8]
-     [ 0.5 -0.5]
-     [ 0.3 -0.7]
-     [ 0.6 -0.3]
-     [ 1.6 -1.3]
-     [ 1.1 -1.8]]
+    [[-0.2 -0.7]
+     [-0.  -0.6]
+     [-0.9 -0.4]
+     [-0.4  0.1]
+     [-0.8 -0.5]
+     [-0.2 -0.7]
+     [-0.  -0.6]
+     [-0.9 -0.4]
+     [-0.4  0.1]
+     [-0.8 -0.5]]
     """
-
-    def k(t1, t2):
-        """Periodic covariance kernel."""
-        return np.exp(-np.sin(np.abs(t1 - t2)) ** 2)
-
     unit_sample = (
         base_measure_sample
         if base_measure_sample is not None
         else np.random.randn(num_frames, d)
     )
 
-    equispaced_distances = np.linspace(0, 2 * np.pi, num_frames, endpoint=endpoint)
-    m = np.zeros(len(equispaced_distances))
-    K = k(equispaced_distances[:, None], equispaced_distances[None, :])
+    # If the endpoint is included, the final frame coincides with the first one,
+    # and only the remaining frames form a periodic grid.
+    num_periodic_frames = max(num_frames - 1, 1) if endpoint else num_frames
+    unit_sample = unit_sample[:num_periodic_frames]
 
-    # Transform "from the right", because unit_sample is shape (d, num_steps)
-    damping_factor = 1e-12
-    KS = np.linalg.cholesky(K + damping_factor * np.eye(len(K)))
-    samples = m[:, None] + KS @ unit_sample
+    # Multiply with the symmetric square root of the circulant kernel matrix.
+    sqrt_eigenvalues = _periodic_gp_sqrt_eigenvalues(num_periodic_frames)
+    samples = np.fft.irfft(
+        sqrt_eigenvalues[:, None] * np.fft.rfft(unit_sample, axis=0),
+        n=num_periodic_frames,
+        axis=0,
+    )
+    if num_periodic_frames < num_frames:
+        samples = np.concatenate((samples, samples[:1]), axis=0)
     return samples
 
 
+def _periodic_kernel(t1, t2):
+    """Periodic covariance kernel."""
+    return np.exp(-np.sin(np.abs(t1 - t2)) ** 2)
+
+
+@functools.lru_cache(maxsize=32)
+def _periodic_gp_sqrt_eigenvalues(num_frames):
+    """Square roots of the eigenvalues of the (circulant) kernel matrix on the periodic grid.
+
+    Only the first ``num_frames // 2 + 1`` eigenvalues are returned, because the remaining
+    ones are mirror images (which is what :func:`np.fft.irfft` expects).
+    The array is read-only, because it is cached.
+    """
+    equispaced_distances = np.linspace(0, 2 * np.pi, num_frames, endpoint=False)
+    first_column = _periodic_kernel(equispaced_distances[0], equispaced_distances)
+
+    # Eigenvalues that are negative due to round-off are clipped.
+    eigenvalues = np.fft.rfft(first_column).real
+    sqrt_eigenvalues = np.sqrt(np.maximum(eigenvalues, 0.0))
+    sqrt_eigenvalues.flags.writeable = False
+    return sqrt_eigenvalues
+
+
 def animate_with_great_circle_of_unitsphere(
-    d, num_frames, initial_sample=None, initial_direction=None, endpoint=False
+    d,
+    num_frames,
+    initial_sample=None,
+    initial_direction=None,
+    endpoint=False,
+    num_samples=None,
 ):
     """Animate samples from a standard Normal distribution by drawing a great circle on
     a unitsphere uniformly at random.
@@ -80,6 +118,10 @@ def animate_with_great_circle_of_unitsphere(
     (which amounts to the dimension of the underlying multivariate Normal distribution),
     and num_steps is the number of frames that shall be shown in the animation.
 
+    All frames are computed at once (see :func:`geodesic_sphere`).
+    For long or high-resolution animations, use
+    :func:`animate_with_great_circle_of_unitsphere_in_chunks`.
+
     Parameters
     ----------
     d :
@@ -89,21 +131,23 @@ def animate_with_great_circle_of_unitsphere(
         Number of steps to be taken. This can be thought of the number of frames
         in the final animation.
     initial_sample:
-        **Shape (d,).**
+        **Shape (d,) or (num_samples, d).**
         Initial sample on the sphere. Will be normalized to length 1 internally. Optional.
         If not provided, sampled from a standard Normal distribution.
     initial_direction:
-        **Shape (d,).**
+        **Shape (d,) or (num_samples, d).**
         Initial direction on the tangent space of the initial sample. Will be orthonormalized internally.
         Optional. If not provided, sampled from a standard Normal distribution.
     endpoint
         Whether the final state should be equal to the first state. Optional. Default is False.
-
+    num_samples
+        Number of independent samples that shall be animated at once. Optional.
+        Only used if the initial sample or direction is sampled. Default is None, i.e. a single sample.
 
     Returns
     -------
     np.ndarray
-        **Shape (num_steps, d).**
+        **Shape (num_steps, d) or (num_steps, num_samples, d).**
         N steps that traverse the sphere along a (d-1)-dimensional subspace.
 
     References
@@ -117,7 +161,7 @@ def animate_with_great_circle_of_unitsphere(
     >>> import numpy as np
     >>> np.random.seed(42)
     >>> dim, num_frames = 2, 10
-    >>> states = animate_with_random_great_circle_of_unitsphere(dim, num_frames)
+    >>> states = animate_with_great_circle_of_unitsphere(dim, num_frames)
     >>> print(np.round(states, 1))
     [[ 0.5 -0.1]
      [ 0.5  0.2]
@@ -130,32 +174,112 @@ def animate_with_great_circle_of_unitsphere(
      [ 0.  -0.5]
      [ 0.3 -0.4]]
     """
-    # Read inputs
-    state = initial_sample if initial_sample is not None else np.random.randn(d)
+    scale, normalized_state, orthonormal_direction = _great_circle(
+        d, initial_sample, initial_direction, num_samples
+    )
+    return scale * geodesic_sphere(
+        normalized_state,
+        orthonormal_direction,
+        t=_step_sizes(0, num_frames, num_frames, endpoint),
+    )
+
+
+def animate_with_great_circle_of_unitsphere_in_chunks(
+    d,
+    num_frames,
+    chunk_size,
+    initial_sample=None,
+    initial_direction=None,
+    endpoint=False,
+    num_samples=None,
+):
+    """Animate samples from a standard Normal distribution along a great circle, one chunk of frames at a time.
+
+    Equivalent to :func:`animate_with_great_circle_of_unitsphere`, but the frames are
+    computed lazily, i.e. memory does not grow with the number of frames.
+    This is useful to render long or high-resolution animations.
+
+    Parameters
+    ----------
+    d :
+        Dimension of the sphere.
+    num_frames :
+        Total number of frames in the animation.
+    chunk_size :
+        Number of frames per chunk.
+    initial_sample:
+        **Shape (d,) or (num_samples, d).** Initial sample on the sphere. Optional.
+    initial_direction:
+        **Shape (d,) or (num_samples, d).** Initial direction on the tangent space of the initial sample. Optional.
+    endpoint
+        Whether the final state should be equal to the first state. Optional. Default is False.
+    num_samples
+        Number of independent samples that shall be animated at once. Optional.
+
+    Yields
+    ------
+    np.ndarray
+        **Shape (chunk_size, d) or (chunk_size, num_samples, d).**
+        A chunk of consecutive frames. The final chunk may be shorter.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> np.random.seed(42)
+    >>> chunks = animate_with_great_circle_of_unitsphere_in_chunks(2, 10, chunk_size=4)
+    >>> print([chunk.shape for chunk in chunks])
+    [(4, 2), (4, 2), (2, 2)]
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be a positive integer.")
+
+    # The great circle is fixed before the first chunk is requested.
+    scale, normalized_state, orthonormal_direction = _great_circle(
+        d, initial_sample, initial_direction, num_samples
+    )
+
+    def _chunks():
+        for start in range(0, num_frames, chunk_size):
+            stop = min(start + chunk_size, num_frames)
+            yield scale * geodesic_sphere(
+                normalized_state,
+                orthonormal_direction,
+                t=_step_sizes(start, stop, num_frames, endpoint),
+            )
+
+    return _chunks()
+
+
+def _great_circle(d, initial_sample, initial_direction, num_samples):
+    """Read (or sample) the initial state and direction, and orthonormalize them."""
+    shape = (d,) if num_samples is None else (num_samples, d)
+    state = initial_sample if initial_sample is not None else np.random.randn(*shape)
     direction = (
-        initial_direction if initial_direction is not None else np.random.randn(d)
+        initial_direction if initial_direction is not None else np.random.randn(*shape)
     )
 
     # Normalize and orthogonalize
-    scale = np.linalg.norm(state)
+    scale = np.linalg.norm(state, axis=-1, keepdims=True)
     normalized_state = state / scale
     orthogonal_direction = (
-        direction - (direction.T @ normalized_state) * normalized_state
+        direction
+        - np.sum(direction * normalized_state, axis=-1, keepdims=True)
+        * normalized_state
     )
-    orthonormal_direction = orthogonal_direction / np.linalg.norm(orthogonal_direction)
-
-    # Compute great circle
-    equispaced_distances = np.linspace(0, 2.0 * np.pi, num_frames, endpoint=endpoint)
-    states = np.array(
-        [
-            scale * geodesic_sphere(normalized_state, orthonormal_direction * delta)
-            for delta in equispaced_distances
-        ]
+    orthonormal_direction = orthogonal_direction / np.linalg.norm(
+        orthogonal_direction, axis=-1, keepdims=True
     )
-    return states
+    return scale, normalized_state, orthonormal_direction
+
+
+def _step_sizes(start, stop, num_frames, endpoint):
+    """Frames start:stop of ``np.linspace(0, 2 * np.pi, num_frames, endpoint=endpoint)``."""
+    num_intervals = num_frames - 1 if endpoint else num_frames
+    step = 2.0 * np.pi / num_intervals if num_intervals > 0 else 0.0
+    return np.arange(start, stop) * step
 
 
-def geodesic_sphere(point, velocity):
+def geodesic_sphere(point, velocity, t=None):
     r"""Compute the geodesic on the sphere.
 
     It is given by the exponential map starting at a point :math:`p` and initial velocity `v t`,
@@ -164,15 +288,29 @@ def geodesic_sphere(point, velocity):
 
     and can be used to compute a great circle on a sphere.
     The dimension of the sphere is read off the sizes of point and velocity.
+
+    Points and velocities of shape (..., d) are broadcast against each other,
+    and if an array of step sizes :math:`t` of shape (K,) is given,
+    the geodesic is evaluated at all of them at once, which results in shape (K, ..., d).
+    If no step sizes are given, the geodesic is evaluated at :math:`t=1`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> point, velocity = np.array([1.0, 0.0]), np.array([0.0, 1.0])
+    >>> print(np.round(geodesic_sphere(point, velocity, t=np.array([0.0, np.pi / 2, np.pi])), 1))
+    [[ 1.  0.]
+     [ 0.  1.]
+     [-1.  0.]]
     """
+    velocity = np.asarray(velocity)
+    if t is not None:
+        velocity = np.multiply.outer(np.asarray(t), velocity)
 
     # Decompose the velocity into magnitude * direction
-    magnitude = np.linalg.norm(velocity)
-    # Early exit if no proper direction is given
-    if magnitude == 0.0:
-        return point
-
-    direction = velocity / magnitude
+    magnitude = np.linalg.norm(velocity, axis=-1, keepdims=True)
+    # If no proper direction is given, the geodesic does not move (cos(0) = 1, sin(0) = 0)
+    direction = velocity / np.where(magnitude == 0.0, 1.0, magnitude)
 
     geodesic = np.cos(magnitude) * point + np.sin(magnitude) * direction
     return geodesic
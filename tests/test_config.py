@@ -1,6 +1,11 @@
 """Tests for configurations."""
 
-from probnumeval import config
+import functools
+import threading
+
+import pytest
+
+from probnumeval import config, evaluate_many
 
 
 def test_cov_inversion():
@@ -52,3 +57,108 @@ def test_context():
     assert config.COVARIANCE_INVERSION["strategy"] == "cholesky"
     assert config.COVARIANCE_INVERSION["symmetrize"]
     assert config.COVARIANCE_INVERSION["damping"] == 0.0
+
+
+def test_conjugate_gradients_context():
+    """Check whether the context manager of the conjugate-gradient parameters does its job."""
+    assert config.CONJUGATE_GRADIENTS["maxiter"] is None
+
+    with config.conjugate_gradients_context(rtol=1e-3, maxiter=5):
+        assert config.CONJUGATE_GRADIENTS["rtol"] == 1e-3
+        assert config.CONJUGATE_GRADIENTS["maxiter"] == 5
+
+    assert config.CONJUGATE_GRADIENTS["rtol"] == 1e-10
+    assert config.CONJUGATE_GRADIENTS["maxiter"] is None
+
+
+def test_reentrant_context():
+    """The same context manager can be entered again while it is active."""
+    context = config.covariance_inversion_context(strategy="inv")
+    with context:
+        with config.covariance_inversion_context(strategy="solve"):
+            with context:
+                assert config.COVARIANCE_INVERSION["strategy"] == "inv"
+            assert config.COVARIANCE_INVERSION["strategy"] == "solve"
+        assert config.COVARIANCE_INVERSION["strategy"] == "inv"
+    assert config.COVARIANCE_INVERSION["strategy"] == "cholesky"
+
+
+def test_context_is_thread_local():
+    """Concurrent contexts in different threads do not see each other's parameters."""
+    barrier = threading.Barrier(2)
+
+    def job(strategy):
+        with config.covariance_inversion_context(strategy=strategy):
+            # Both threads have entered their context before either one reads.
+            barrier.wait()
+            return config.COVARIANCE_INVERSION["strategy"]
+
+    assert evaluate_many(
+        [functools.partial(job, "inv"), functools.partial(job, "pinv")], max_workers=2
+    ) == ["inv", "pinv"]
+    assert config.COVARIANCE_INVERSION["strategy"] == "cholesky"
+
+
+def test_setter_is_process_wide():
+    """Threads that are not started by evaluate_many see the parameters of the setter."""
+    strategies = []
+    config.set_covariance_inversion_parameters(
+        strategy="inv", symmetrize=True, damping=0.0
+    )
+    try:
+        thread = threading.Thread(
+            target=lambda: strategies.append(config.COVARIANCE_INVERSION["strategy"])
+        )
+        thread.start()
+        thread.join()
+        with config.covariance_inversion_context(strategy="solve"):
+            assert config.COVARIANCE_INVERSION["strategy"] == "solve"
+    finally:
+        config.set_covariance_inversion_parameters(
+            strategy="cholesky", symmetrize=True, damping=0.0
+        )
+    assert strategies == ["inv"]
+
+
+def test_same_context_in_several_threads():
+    """One context manager can be entered in several threads at once."""
+    context = config.covariance_inversion_context(strategy="inv")
+    first_entered, second_entered = threading.Event(), threading.Event()
+    first_exited = threading.Event()
+
+    def first_job():
+        with context:
+            first_entered.set()
+            second_entered.wait(timeout=10.0)
+            strategy = config.COVARIANCE_INVERSION["strategy"]
+        first_exited.set()
+        return strategy, config.COVARIANCE_INVERSION["strategy"]
+
+    def second_job():
+        first_entered.wait(timeout=10.0)
+        with context:
+            second_entered.set()
+            # The first thread exits while the second one is inside the context.
+            first_exited.wait(timeout=10.0)
+            strategy = config.COVARIANCE_INVERSION["strategy"]
+        return strategy, config.COVARIANCE_INVERSION["strategy"]
+
+    assert (
+        evaluate_many([first_job, second_job], max_workers=2)
+        == [("inv", "cholesky")] * 2
+    )
+
+
+def test_evaluate_many_inherits_context():
+    """Jobs see the configuration of the caller."""
+    with config.covariance_inversion_context(strategy="solve"):
+        strategies = evaluate_many(
+            [lambda: config.COVARIANCE_INVERSION["strategy"]] * 3
+        )
+    assert strategies == ["solve"] * 3
+
+
+def test_read_only():
+    """The parameters can only be changed with the setter or the context manager."""
+    with pytest.raises(TypeError):
+        config.COVARIANCE_INVERSION["strategy"] = "inv"
@@ -0,0 +1,98 @@
+"""Tests for the startup cost of importing probnumeval."""
+import json
+import subprocess
+import sys
+
+import pytest
+
+import probnumeval
+
+HEAVY_DEPENDENCIES = [
+    "pkg_resources",
+    "probnum",
+    "scipy.linalg",
+    "scipy.spatial",
+    "scipy.stats",
+]
+
+HEAVY_SUBMODULES = [
+    "probnumeval.multivariate._calibration_measures",
+    "probnumeval.multivariate._sample_analysis",
+    "probnumeval.multivariate._two_sample",
+    "probnumeval.timeseries._calibration_measures",
+    "probnumeval.timeseries._sample_analysis",
+    "probnumeval.instrumentation",
+    "probnumeval.type",
+]
+
+
+def _run_in_fresh_interpreter(statement):
+    """Execute a statement in a fresh interpreter, and report the loaded modules."""
+    script = "\n".join(
+        [
+            "import json, sys",
+            "import numpy",
+            statement,
+            "print(json.dumps({'modules': sorted(sys.modules)}))",
+        ]
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import probnumeval",
+        "import probnumeval.multivariate, probnumeval.timeseries, probnumeval.config",
+        "from probnumeval.multivariate import rmse",
+        "from probnumeval.timeseries import rmse; rmse(numpy.sin, numpy.cos, numpy.ones(3))",
+    ],
+)
+def test_no_heavy_dependencies(statement):
+    result = _run_in_fresh_interpreter(statement)
+    loaded = [module for module in HEAVY_DEPENDENCIES if module in result["modules"]]
+    assert not loaded
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import probnumeval",
+        "import probnumeval.multivariate, probnumeval.timeseries, probnumeval.visual",
+    ],
+)
+def test_no_heavy_submodules(statement):
+    result = _run_in_fresh_interpreter(statement)
+    loaded = [module for module in HEAVY_SUBMODULES if module in result["modules"]]
+    assert not loaded
+
+
+def test_private_submodules_are_attributes():
+    result = _run_in_fresh_interpreter(
+        "import probnumeval.multivariate; "
+        "assert probnumeval.multivariate._robust_inversion._cholesky_where_possible"
+    )
+    assert "probnumeval.multivariate._robust_inversion" in result["modules"]
+
+
+def test_lazy_attributes():
+    result = _run_in_fresh_interpreter(
+        "import probnumeval; assert callable(probnumeval.multivariate.anees)"
+    )
+    assert "probnum" in result["modules"]
+
+
+@pytest.mark.parametrize("module_name", ["multivariate", "timeseries"])
+def test_all_names_are_available(module_name):
+    module = getattr(probnumeval, module_name)
+    for name in module.__all__:
+        assert name in dir(module)
+        assert getattr(module, name) is not None
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        probnumeval.multivariate.does_not_exist  # pylint: disable=pointless-statement
@@ -0,0 +1,208 @@
+"""Tests for the instrumentation of metric evaluations."""
+
+import json
+import logging
+import time
+
+import numpy as np
+import pytest
+from probnum import _randomvariablelist, randvars
+
+from probnumeval import config, evaluate_many, instrumentation, multivariate, timeseries
+
+# The following pylint-exception is for the _randomvariablelist and stage access:
+# pylint: disable=protected-access
+
+
+@pytest.fixture
+def approximate_solution():
+    factors = np.random.rand(20, 3, 3)
+    covs = factors @ np.transpose(factors, axes=(0, 2, 1)) + np.eye(3)
+    return _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=np.random.rand(3), cov=cov) for cov in covs]
+    )
+
+
+@pytest.fixture
+def reference_solution():
+    return np.random.rand(20, 3)
+
+
+def test_stages_of_a_calibration_measure(approximate_solution, reference_solution):
+    stats = instrumentation.InMemorySink()
+    with instrumentation.Instrumentation(stats):
+        multivariate.non_credibility_index(approximate_solution, reference_solution)
+
+    summary = stats.summary()
+    assert set(summary) == {
+        ("multivariate.non_credibility_index", stage)
+        for stage in ("call", "stack", "factorize", "symmetrize", "reduce")
+    }
+    assert summary["multivariate.non_credibility_index", "call"].calls == 1
+    assert summary["multivariate.non_credibility_index", "factorize"].calls == 2
+
+    factorize_events = [event for event in stats.events if event.stage == "factorize"]
+    assert factorize_events[0].shape == (20, 3, 3)
+    assert factorize_events[1].shape == (3, 3)
+
+
+def test_self_times_sum_to_wall_time(approximate_solution, reference_solution):
+    stats = instrumentation.InMemorySink()
+    with instrumentation.Instrumentation(stats):
+        multivariate.calibration_report(approximate_solution, reference_solution)
+
+    (call,) = [event for event in stats.events if event.stage == "call"]
+    assert call.wall_time > 0.0
+    np.testing.assert_allclose(
+        sum(event.self_time for event in stats.events), call.wall_time
+    )
+
+
+def test_nested_metrics_are_part_of_the_outer_call():
+    """Timeseries metrics call multivariate metrics, which are not reported on their
+    own."""
+    stats = instrumentation.InMemorySink()
+    with instrumentation.Instrumentation(stats):
+        timeseries.rmse(np.sin, np.cos, np.linspace(0.0, 1.0, 10))
+        timeseries.mae(np.sin, np.cos, np.linspace(0.0, 1.0, 10))
+
+    assert {event.metric for event in stats.events} == {
+        "timeseries.rmse",
+        "timeseries.mae",
+    }
+    evaluations = [event for event in stats.events if event.stage.startswith("eval")]
+    assert len(evaluations) == 4
+    assert all(event.shape == (10,) for event in evaluations)
+
+
+def test_fallbacks_are_recorded():
+    cov_matrices = np.stack([np.eye(2), np.diag([1.0, -1.0]), np.eye(2)])
+    stats = instrumentation.InMemorySink()
+    with config.covariance_inversion_context(strategy="auto"):
+        with instrumentation.Instrumentation(stats):
+            multivariate.anees(
+                _randomvariablelist._RandomVariableList(
+                    [randvars.Normal(mean=np.ones(2), cov=cov) for cov in cov_matrices]
+                ),
+                np.zeros((3, 2)),
+            )
+
+    (fallback,) = [event for event in stats.events if event.stage == "fallback"]
+    assert fallback.metric == "multivariate.anees"
+    assert fallback.shape == (3,)
+    assert fallback.details["eigendecomposed_steps"] == [1]
+    assert fallback.wall_time is None
+
+
+def test_json_lines_sink(tmp_path, approximate_solution, reference_solution):
+    path = tmp_path / "events.jsonl"
+    with instrumentation.JSONLinesSink(path) as sink:
+        with instrumentation.Instrumentation(sink):
+            multivariate.anees(approximate_solution, reference_solution)
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [event["stage"] for event in events] == [
+        "stack",
+        "symmetrize",
+        "factorize",
+        "reduce",
+        "call",
+    ]
+    assert all(event["metric"] == "multivariate.anees" for event in events)
+    assert events[0]["shape"] == [20]
+
+
+def test_logging_sink(caplog):
+    logger = logging.getLogger("probnumeval.test")
+    with caplog.at_level(logging.DEBUG, logger="probnumeval.test"):
+        with instrumentation.Instrumentation(
+            instrumentation.LoggingSink(logger, level=logging.DEBUG)
+        ):
+            multivariate.rmse(np.ones(3), np.zeros(3))
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].getMessage().startswith("multivariate.rmse: call")
+
+
+def test_several_sinks(approximate_solution, reference_solution):
+    first, second = instrumentation.InMemorySink(), instrumentation.InMemorySink()
+    with instrumentation.Instrumentation(first, second):
+        multivariate.anees(approximate_solution, reference_solution)
+    assert first.events == second.events
+
+
+def test_needs_a_sink():
+    with pytest.raises(ValueError):
+        instrumentation.Instrumentation()
+
+
+def test_nothing_is_recorded_outside_of_the_context(
+    approximate_solution, reference_solution
+):
+    stats = instrumentation.InMemorySink()
+    with instrumentation.Instrumentation(stats):
+        pass
+    multivariate.anees(approximate_solution, reference_solution)
+    assert stats.events == []
+
+
+def test_custom_stages_and_records():
+    stats = instrumentation.InMemorySink()
+    with instrumentation.Instrumentation(stats):
+        with instrumentation.stage("outer", metric="custom"):
+            with instrumentation.stage("inner", shape=(4,)):
+                time.sleep(0.01)
+            instrumentation.record("note", value=1)
+
+    inner, note, outer = stats.events
+    assert (inner.metric, inner.stage, inner.shape) == ("custom", "inner", (4,))
+    assert (note.metric, note.details) == ("custom", {"value": 1})
+    assert outer.wall_time >= inner.wall_time >= 0.01
+    assert outer.self_time < outer.wall_time
+
+
+def test_parallel_stages_inside_a_stage():
+    """Stages of evaluate_many jobs are attributed to the stage that encloses the call,
+    but they are not subtracted from its self time."""
+    stats = instrumentation.InMemorySink()
+
+    def job():
+        with instrumentation.stage("inner"):
+            time.sleep(0.001)
+
+    with instrumentation.Instrumentation(stats):
+        with instrumentation.stage("outer", metric="custom"):
+            evaluate_many([job] * 64, max_workers=8)
+
+    *inner, outer = stats.events
+    assert len(inner) == 64
+    assert all(event.metric == "custom" for event in inner)
+    assert outer.self_time == outer.wall_time
+    assert all(0.0 <= event.self_time <= event.wall_time for event in stats.events)
+
+
+def test_nothing_happens_when_disabled(monkeypatch):
+    """The hooks neither call a sink nor set the current stage without an active
+    instrumentation."""
+    stats = instrumentation.InMemorySink()
+    instrumentation.Instrumentation(stats)  # created, but never entered
+
+    class UnsettableStage:
+        """Context variable of the current stage that must not be set."""
+
+        @staticmethod
+        def get():
+            return None
+
+        @staticmethod
+        def set(value):
+            raise AssertionError(f"The current stage was set to {value}.")
+
+    monkeypatch.setattr(instrumentation, "_CURRENT_STAGE", UnsettableStage())
+
+    instrumentation.instrumented("noop")(lambda: None)()
+    with instrumentation.stage("noop"):
+        instrumentation.record("note")
+    multivariate.rmse(np.ones(3), np.zeros(3))
+
+    assert stats.events == []
@@ -0,0 +1,89 @@
+"""Tests for the incremental accumulators."""
+import numpy as np
+import pytest
+from probnum import _randomvariablelist, randvars
+
+from probnumeval import multivariate
+
+# The following pylint-exception is for the _randomvariablelist access:
+# pylint: disable=protected-access
+
+
+@pytest.fixture
+def means():
+    return np.random.rand(20, 3)
+
+
+@pytest.fixture
+def covs():
+    factors = np.random.rand(20, 3, 3)
+    return factors @ np.transpose(factors, axes=(0, 2, 1)) + np.eye(3)
+
+
+@pytest.fixture
+def reference():
+    return np.random.rand(20, 3) + 1.0
+
+
+def _chunks(array, chunk_sizes):
+    return np.split(array, np.cumsum(chunk_sizes)[:-1])
+
+
+chunkings = pytest.mark.parametrize("chunk_sizes", [[20], [1] * 20, [3, 10, 7]])
+
+
+@chunkings
+@pytest.mark.parametrize("p", [1, 2, np.inf])
+def test_mean_error_accumulator(means, reference, chunk_sizes, p):
+    accumulator = multivariate.MeanErrorAccumulator(p=p)
+    relative_accumulator = multivariate.RelativeMeanErrorAccumulator(p=p)
+    for mean_chunk, reference_chunk in zip(
+        _chunks(means, chunk_sizes), _chunks(reference, chunk_sizes)
+    ):
+        accumulator.update(mean_chunk, None, reference_chunk)
+        relative_accumulator.update(mean_chunk, None, reference_chunk)
+
+    assert accumulator.result() == pytest.approx(
+        multivariate.mean_error(means, reference, p=p)
+    )
+    assert relative_accumulator.result() == pytest.approx(
+        multivariate.relative_mean_error(means, reference, p=p)
+    )
+
+
+@chunkings
+def test_calibration_accumulators(means, covs, reference, chunk_sizes):
+    anees_accumulator = multivariate.ANEESAccumulator()
+    calibration_accumulator = multivariate.CalibrationAccumulator()
+    for mean_chunk, cov_chunk, reference_chunk in zip(
+        _chunks(means, chunk_sizes),
+        _chunks(covs, chunk_sizes),
+        _chunks(reference, chunk_sizes),
+    ):
+        anees_accumulator.update(mean_chunk, cov_chunk, reference_chunk)
+        calibration_accumulator.update(mean_chunk, cov_chunk, reference_chunk)
+
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=C) for (m, C) in zip(means, covs)]
+    )
+    expected = multivariate.calibration_report(rvlist, reference)
+    report = calibration_accumulator.result()
+
+    assert anees_accumulator.result() == pytest.approx(expected.anees)
+    assert report.anees == pytest.approx(expected.anees)
+    assert report.non_credibility_index == pytest.approx(expected.non_credibility_index)
+    assert report.inclination_index == pytest.approx(expected.inclination_index)
+
+
+def test_result_before_update():
+    assert np.isnan(multivariate.MeanErrorAccumulator(p=2).result())
+    assert np.isnan(multivariate.ANEESAccumulator().result())
+    assert np.isnan(multivariate.CalibrationAccumulator().result().anees)
+
+
+def test_single_time_step_updates(means, covs, reference):
+    """Single time steps can be passed without a leading axis."""
+    accumulator = multivariate.ANEESAccumulator()
+    for m, C, r in zip(means, covs, reference):
+        accumulator.update(m, C, r)
+    assert accumulator.count == 20
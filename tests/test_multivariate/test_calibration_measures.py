@@ -6,7 +6,7 @@ from probnum import _randomvariablelist, randvars
 from probnumeval import config, multivariate
 
 all_strategies = pytest.mark.parametrize(
-    "strategy", ["inv", "pinv", "solve", "cholesky"]
+    "strategy", ["inv", "pinv", "solve", "cholesky", "cov_cholesky", "cg", "auto"]
 )
 all_symmetries = pytest.mark.parametrize("symmetrize", [True, False])
 all_dampings = pytest.mark.parametrize("damping", [1.0, 0.0])
@@ -80,3 +80,175 @@ def test_inclination_index(
             approximate_solution, reference_solution
         )
     assert np.isscalar(output)
+
+
+@pytest.fixture
+def centered_mean():
+    return np.random.rand(20, 3)
+
+
+@pytest.fixture
+def cov_matrices():
+    factors = np.random.rand(20, 3, 3)
+    return factors @ np.transpose(factors, axes=(0, 2, 1)) + np.eye(3)
+
+
+@all_strategies
+@all_symmetries
+@all_dampings
+def test_batched_discrepancies_match_loop(
+    centered_mean, cov_matrices, strategy, symmetrize, damping
+):
+    """The batched engine computes the same numbers as a loop over time steps."""
+    with config.covariance_inversion_context(
+        strategy=strategy, symmetrize=symmetrize, damping=damping
+    ):
+        output = multivariate._calibration_measures._compute_normalized_discrepancies(
+            centered_mean, cov_matrices
+        )
+
+    expected = np.array(
+        [
+            m @ np.linalg.solve(0.5 * (C + C.T) + damping * np.eye(3), m)
+            for (m, C) in zip(centered_mean, cov_matrices)
+        ]
+    )
+    assert output.shape == (20,)
+    np.testing.assert_allclose(output, expected)
+
+
+def test_calibration_report(approximate_solution, reference_solution):
+    """The report coincides with the individual calibration measures."""
+    report = multivariate.calibration_report(approximate_solution, reference_solution)
+
+    assert report.anees == pytest.approx(
+        multivariate.anees(approximate_solution, reference_solution)
+    )
+    assert report.non_credibility_index == pytest.approx(
+        multivariate.non_credibility_index(approximate_solution, reference_solution)
+    )
+    assert report.inclination_index == pytest.approx(
+        multivariate.inclination_index(approximate_solution, reference_solution)
+    )
+    lower, upper = report.chi2_confidence_interval
+    assert 0.0 < lower < upper
+
+
+@all_strategies
+@all_symmetries
+@all_dampings
+def test_shared_covariance_discrepancies_match_tiled(
+    centered_mean, cov_matrices, strategy, symmetrize, damping
+):
+    """Factorizing a shared covariance once gives the same result as tiling it."""
+    cov_matrix = cov_matrices[0]
+    with config.covariance_inversion_context(
+        strategy=strategy, symmetrize=symmetrize, damping=damping
+    ):
+        output = multivariate._calibration_measures._compute_normalized_discrepancies_shared_covariance(
+            centered_mean, cov_matrix
+        )
+        expected = multivariate._calibration_measures._compute_normalized_discrepancies(
+            centered_mean, np.tile(cov_matrix, reps=(len(centered_mean), 1, 1))
+        )
+    assert output.shape == (20,)
+    np.testing.assert_allclose(output, expected)
+
+
+@pytest.fixture
+def square_root_solution(cov_matrices):
+    """Normals whose Cholesky factors are known (e.g. from a square-root filter)."""
+    rvlist = [
+        randvars.Normal(
+            mean=np.random.rand(3), cov=cov, cov_cholesky=np.linalg.cholesky(cov)
+        )
+        for cov in cov_matrices
+    ]
+    return _randomvariablelist._RandomVariableList(rvlist)
+
+
+@pytest.mark.parametrize("strategy", ["cholesky", "cov_cholesky"])
+def test_precomputed_cholesky_factors_are_reused(
+    square_root_solution, centered_mean, strategy
+):
+    """If the Normals carry Cholesky factors, they are reused instead of refactorizing."""
+    with config.covariance_inversion_context(strategy=strategy):
+        cholesky_factors = multivariate._calibration_measures._stack_cholesky_factors(
+            square_root_solution, centered_mean
+        )
+        output = multivariate.anees(square_root_solution, centered_mean)
+    with config.covariance_inversion_context(strategy="solve"):
+        expected = multivariate.anees(square_root_solution, centered_mean)
+
+    expected_factors = np.array([rv.cov_cholesky for rv in square_root_solution])
+    np.testing.assert_allclose(cholesky_factors, expected_factors)
+    np.testing.assert_allclose(output, expected)
+
+
+def test_cov_cholesky_strategy_factorizes_missing_factors(
+    approximate_solution, reference_solution
+):
+    """The cov_cholesky strategy uses the Normals' factors even if they are not precomputed."""
+    with config.covariance_inversion_context(strategy="cholesky"):
+        assert (
+            multivariate._calibration_measures._stack_cholesky_factors(
+                approximate_solution, reference_solution
+            )
+            is None
+        )
+        expected = multivariate.anees(approximate_solution, reference_solution)
+    with config.covariance_inversion_context(strategy="cov_cholesky"):
+        output = multivariate.anees(approximate_solution, reference_solution)
+    np.testing.assert_allclose(output, expected)
+
+
+@pytest.mark.parametrize("strategy", ["cholesky", "cov_cholesky"])
+def test_cholesky_factors_are_not_reused_under_damping(
+    square_root_solution, centered_mean, strategy
+):
+    """Damped covariances are refactorized, so both Cholesky strategies agree with the
+    other strategies."""
+    with config.covariance_inversion_context(strategy=strategy, damping=1.0):
+        assert (
+            multivariate._calibration_measures._stack_cholesky_factors(
+                square_root_solution, centered_mean
+            )
+            is None
+        )
+        output = multivariate.anees(square_root_solution, centered_mean)
+    with config.covariance_inversion_context(strategy="solve", damping=1.0):
+        expected = multivariate.anees(square_root_solution, centered_mean)
+    np.testing.assert_allclose(output, expected)
+
+
+def test_cholesky_factors_are_not_reused_for_asymmetric_covariances(centered_mean):
+    """Symmetrized covariances are refactorized if the covariances are not symmetric."""
+    cov_matrix = np.array([[2.0, 0.5, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 1.0]])
+    approximate_solution = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=np.zeros(3), cov=cov_matrix) for _ in centered_mean]
+    )
+    with config.covariance_inversion_context(strategy="cov_cholesky"):
+        output = multivariate.anees(approximate_solution, centered_mean)
+    with config.covariance_inversion_context(strategy="solve"):
+        expected = multivariate.anees(approximate_solution, centered_mean)
+    np.testing.assert_allclose(output, expected)
+
+
+def test_precision_matrices(approximate_solution, reference_solution):
+    """User-supplied precision matrices replace the inversion of the covariances."""
+    precision_matrices = np.array(
+        [np.linalg.inv(rv.cov) for rv in approximate_solution]
+    )
+    report = multivariate.calibration_report(
+        approximate_solution,
+        reference_solution,
+        precision_matrices=precision_matrices,
+    )
+    expected = multivariate.calibration_report(approximate_solution, reference_solution)
+
+    assert report.anees == pytest.approx(expected.anees)
+    assert report.non_credibility_index == pytest.approx(expected.non_credibility_index)
+    assert report.inclination_index == pytest.approx(expected.inclination_index)
+    assert multivariate.anees(
+        approximate_solution, reference_solution, precision_matrices=precision_matrices
+    ) == pytest.approx(expected.anees)
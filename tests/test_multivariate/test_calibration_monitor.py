@@ -0,0 +1,105 @@
+"""Tests for the sliding-window calibration monitor."""
+import numpy as np
+import pytest
+from probnum import _randomvariablelist, randvars
+
+from probnumeval import multivariate
+
+# The following pylint-exception is for the _randomvariablelist access:
+# pylint: disable=protected-access
+
+
+@pytest.fixture
+def approximate_solution():
+    np.random.seed(1)
+    factors = np.random.rand(30, 3, 3)
+    covs = factors @ np.transpose(factors, axes=(0, 2, 1)) + np.eye(3)
+    means = np.random.rand(30, 3)
+    return _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=C) for (m, C) in zip(means, covs)]
+    )
+
+
+@pytest.fixture
+def reference_solution():
+    return np.random.rand(30, 3)
+
+
+@pytest.mark.parametrize("window_size", [5, 12])
+def test_sliding_window_matches_recomputation(
+    approximate_solution, reference_solution, window_size
+):
+    nci, ii = multivariate.sliding_window_calibration(
+        approximate_solution, reference_solution, window_size=window_size
+    )
+    assert nci.shape == ii.shape == (30,)
+    assert np.all(np.isnan(nci[: window_size - 1]))
+
+    for end in range(window_size, 31):
+        window = slice(end - window_size, end)
+        expected_nci = multivariate.non_credibility_index(
+            approximate_solution[window], reference_solution[window]
+        )
+        expected_ii = multivariate.inclination_index(
+            approximate_solution[window], reference_solution[window]
+        )
+        assert nci[end - 1] == pytest.approx(expected_nci)
+        assert ii[end - 1] == pytest.approx(expected_ii)
+
+
+def test_min_periods(approximate_solution, reference_solution):
+    nci, _ = multivariate.sliding_window_calibration(
+        approximate_solution, reference_solution, window_size=10, min_periods=5
+    )
+    assert np.all(np.isnan(nci[:4]))
+    assert np.all(np.isfinite(nci[4:]))
+    assert nci[6] == pytest.approx(
+        multivariate.non_credibility_index(
+            approximate_solution[:7], reference_solution[:7]
+        )
+    )
+
+
+def test_monitor_generator(approximate_solution, reference_solution):
+    monitor = multivariate.SlidingWindowCalibrationMonitor(window_size=6)
+    outputs = list(
+        monitor.run(
+            approximate_solution.mean, approximate_solution.cov, reference_solution
+        )
+    )
+    assert len(outputs) == 30
+    assert len(monitor) == 6
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        multivariate.SlidingWindowCalibrationMonitor(window_size=5, min_periods=6)
+
+
+def test_min_periods_exceed_dimension(approximate_solution, reference_solution):
+    with pytest.raises(ValueError):
+        multivariate.sliding_window_calibration(
+            approximate_solution, reference_solution, window_size=10, min_periods=3
+        )
+
+    monitor = multivariate.SlidingWindowCalibrationMonitor(window_size=3)
+    with pytest.raises(ValueError):
+        monitor.step(np.zeros(3), np.eye(3), np.ones(3))
+    assert len(monitor) == 0
+
+
+def test_cholesky_rank_one_update():
+    factor = np.random.rand(4, 4)
+    matrix = factor @ factor.T + np.eye(4)
+    vector = np.random.rand(4)
+
+    cholesky_factor = np.linalg.cholesky(matrix)
+    updated = multivariate._calibration_monitor._cholesky_rank_one_update(
+        cholesky_factor, vector
+    )
+    np.testing.assert_allclose(updated @ updated.T, matrix + np.outer(vector, vector))
+
+    downdated = multivariate._calibration_monitor._cholesky_rank_one_update(
+        updated, vector, downdate=True
+    )
+    np.testing.assert_allclose(downdated, cholesky_factor)
@@ -0,0 +1,114 @@
+"""Tests for the matrix-free conjugate-gradient strategy."""
+import numpy as np
+import pytest
+from probnum import _randomvariablelist, linops, randvars
+
+from probnumeval import config, multivariate
+from probnumeval.multivariate import _matrix_free
+
+# The following pylint-exception is for the _randomvariablelist access:
+# pylint: disable=protected-access
+
+
+def _spd(dim):
+    factor = np.random.rand(dim, dim)
+    return factor @ factor.T + np.eye(dim)
+
+
+@pytest.fixture
+def centered_mean():
+    return np.random.rand(5, 6)
+
+
+@pytest.fixture
+def cov_matrices():
+    return np.stack([_spd(6) for _ in range(5)])
+
+
+@pytest.mark.parametrize(
+    "as_operator",
+    [
+        linops.Matrix,
+        lambda cov: linops.LinearOperator(
+            shape=cov.shape, dtype=cov.dtype, matmul=lambda x: cov @ x
+        ),
+        lambda cov: (lambda x: cov @ x),
+    ],
+)
+@pytest.mark.parametrize("damping", [1.0, 0.0])
+def test_operators_match_dense(centered_mean, cov_matrices, as_operator, damping):
+    """Linear operators and matvec callables give the same result as dense matrices."""
+    with config.covariance_inversion_context(strategy="solve", damping=damping):
+        expected = multivariate._calibration_measures._compute_normalized_discrepancies(
+            centered_mean, cov_matrices
+        )
+    with config.covariance_inversion_context(strategy="cg", damping=damping):
+        output = multivariate._calibration_measures._compute_normalized_discrepancies(
+            centered_mean, [as_operator(cov) for cov in cov_matrices]
+        )
+    np.testing.assert_allclose(output, expected)
+
+
+def test_structured_operators():
+    """Kronecker and scaling covariances never need to be densified."""
+    covs = [
+        linops.Kronecker(linops.Matrix(_spd(2)), linops.Scaling(np.arange(1.0, 4.0))),
+        linops.Scaling(np.arange(1.0, 7.0)),
+    ]
+    means = [np.random.rand(2, 3), np.random.rand(6)]
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=cov) for (m, cov) in zip(means, covs)]
+    )
+    reference = np.zeros((2, 6))
+
+    expected = multivariate.anees(rvlist, reference)
+    with config.covariance_inversion_context(strategy="cg"):
+        output = multivariate.anees(rvlist, reference)
+    np.testing.assert_allclose(output, expected)
+
+
+def test_diagnostics_report_iterations(centered_mean, cov_matrices):
+    """The number of iterations is recorded per time step and bounded by the dimension."""
+    with config.covariance_inversion_context(strategy="cg"):
+        with multivariate.InversionDiagnostics() as diagnostics:
+            _matrix_free._conjugate_gradient_discrepancies(centered_mean, cov_matrices)
+
+    assert len(diagnostics.records) == 1
+    assert diagnostics.records[0].strategy == "cg"
+    assert diagnostics.iterations.shape == (5,)
+    assert np.all(diagnostics.iterations >= 1)
+    assert np.all(diagnostics.iterations <= 6 + 1)
+    assert np.all(diagnostics.converged)
+
+
+def test_maxiter(centered_mean, cov_matrices):
+    """If the iteration stops early, the non-converged steps are flagged."""
+    with config.covariance_inversion_context(strategy="cg"):
+        with config.conjugate_gradients_context(maxiter=1):
+            with multivariate.InversionDiagnostics() as diagnostics:
+                _matrix_free._conjugate_gradient_discrepancies(
+                    centered_mean, cov_matrices
+                )
+
+    np.testing.assert_array_equal(diagnostics.iterations, np.ones(5))
+    assert not np.all(diagnostics.converged)
+
+
+def test_shared_covariance(centered_mean, cov_matrices):
+    """A shared covariance is applied to all time steps at once."""
+    cov_matrix = cov_matrices[0]
+    expected = _matrix_free._conjugate_gradient_discrepancies(
+        centered_mean, np.stack([cov_matrix] * 5)
+    )
+    output = _matrix_free._conjugate_gradient_discrepancies(
+        centered_mean, cov_matrix, shared=True
+    )
+    np.testing.assert_allclose(output, expected)
+
+
+def test_indefinite_covariance_raises(centered_mean):
+    """Negative curvature reveals covariances that are not positive definite."""
+    with pytest.raises(np.linalg.LinAlgError):
+        _matrix_free._conjugate_gradient_discrepancies(
+            centered_mean, -np.stack([np.eye(6)] * 5)
+        )
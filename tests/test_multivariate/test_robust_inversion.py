@@ -0,0 +1,156 @@
+"""Tests for the batched Cholesky factorization with per-step fallbacks."""
+import numpy as np
+import pytest
+from probnum import _randomvariablelist, randvars
+
+from probnumeval import config, multivariate
+from probnumeval.multivariate import (
+    _calibration_measures,
+    _inversion_diagnostics,
+    _robust_inversion,
+)
+
+# The following pylint-exception is for the _randomvariablelist access:
+# pylint: disable=protected-access
+
+
+@pytest.fixture
+def centered_mean():
+    return np.random.rand(50, 3)
+
+
+@pytest.fixture
+def cov_matrices():
+    """Positive definite covariances, apart from a slightly indefinite one at step 7 and
+    a clearly indefinite one at step 31."""
+    factors = np.random.rand(50, 3, 3)
+    covs = factors @ np.transpose(factors, axes=(0, 2, 1)) + np.eye(3)
+    covs[7] = np.diag([1.0, 1.0, -1e-14])
+    covs[31] = np.diag([1.0, -1.0, 2.0])
+    return covs
+
+
+def test_fallback_only_for_failing_steps(centered_mean, cov_matrices):
+    """The failing steps are located, and all other steps coincide with plain Cholesky."""
+    with config.covariance_inversion_context(strategy="auto"):
+        with multivariate.InversionDiagnostics() as diagnostics:
+            output = (
+                multivariate._calibration_measures._compute_normalized_discrepancies(
+                    centered_mean, cov_matrices
+                )
+            )
+
+    np.testing.assert_array_equal(diagnostics.jittered_steps, [7])
+    np.testing.assert_array_equal(diagnostics.eigendecomposed_steps, [31])
+    np.testing.assert_array_equal(diagnostics.fallback_steps, [7, 31])
+    assert np.all(np.isfinite(output))
+    assert np.all(output >= 0.0)
+
+    regular = np.setdiff1d(np.arange(50), [7, 31])
+    with config.covariance_inversion_context(strategy="cholesky"):
+        expected = multivariate._calibration_measures._compute_normalized_discrepancies(
+            centered_mean[regular], cov_matrices[regular]
+        )
+    np.testing.assert_allclose(output[regular], expected)
+
+
+def test_eigendecomposition_projects_on_positive_eigenspace(centered_mean):
+    """Negative eigenvalues do not contribute to the normalized discrepancy."""
+    cov_matrix = np.diag([2.0, -1.0, 4.0])
+    output, jitter = _robust_inversion._fallback_discrepancies(
+        cov_matrix, centered_mean
+    )
+    expected = centered_mean[:, 0] ** 2 / 2.0 + centered_mean[:, 2] ** 2 / 4.0
+
+    assert jitter is None
+    np.testing.assert_allclose(output, expected)
+
+
+def test_cholesky_where_possible(cov_matrices):
+    cholesky_factors, success = _robust_inversion._cholesky_where_possible(cov_matrices)
+    assert np.flatnonzero(~success).tolist() == [7, 31]
+    np.testing.assert_allclose(
+        cholesky_factors[success] @ np.transpose(cholesky_factors[success], (0, 2, 1)),
+        cov_matrices[success],
+    )
+
+
+def test_anees_does_not_fail(centered_mean, cov_matrices):
+    """A single indefinite covariance does not make the whole ANEES call fail."""
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=C) for (m, C) in zip(centered_mean, cov_matrices)]
+    )
+    reference = np.zeros_like(centered_mean)
+
+    with pytest.raises(np.linalg.LinAlgError):
+        multivariate.anees(rvlist, reference)
+    with config.covariance_inversion_context(strategy="auto"):
+        output = multivariate.anees(rvlist, reference)
+    assert np.isfinite(output)
+
+
+def test_shared_covariance_fallback_is_recorded(centered_mean):
+    """A rank-deficient reference sample falls back, and the fallback is recorded."""
+    centered_mean[:, 2] = 0.0
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=np.eye(3)) for m in centered_mean]
+    )
+    reference = np.zeros_like(centered_mean)
+
+    with pytest.raises(np.linalg.LinAlgError):
+        multivariate.non_credibility_index(rvlist, reference)
+    with config.covariance_inversion_context(strategy="auto"):
+        with multivariate.InversionDiagnostics() as diagnostics:
+            output = multivariate.non_credibility_index(rvlist, reference)
+
+    assert np.isfinite(output)
+    (record,) = diagnostics.records
+    assert (record.strategy, record.num_steps) == ("auto", 50)
+    np.testing.assert_array_equal(diagnostics.fallback_steps, np.arange(50))
+
+
+def test_shared_covariance_fallback_revisits_the_steps_of_the_call(
+    centered_mean, cov_matrices
+):
+    """The fallback for the shared sample covariance refers to the time steps of the
+    call, not to the time steps after them."""
+    centered_mean[:, 2] = 0.0
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=C) for (m, C) in zip(centered_mean, cov_matrices)]
+    )
+    reference = np.zeros_like(centered_mean)
+
+    with config.covariance_inversion_context(strategy="auto"):
+        with multivariate.InversionDiagnostics() as diagnostics:
+            multivariate.non_credibility_index(rvlist, reference)
+            multivariate.inclination_index(rvlist, reference)
+
+    assert [record.first_step for record in diagnostics.records] == [0, 0, 50, 50]
+    np.testing.assert_array_equal(diagnostics.eigendecomposed_steps, [31, 81])
+    np.testing.assert_array_equal(diagnostics.fallback_steps, np.arange(100))
+
+
+def test_dense_indefinite_shared_covariance(centered_mean, cov_matrices):
+    """A dense, indefinite shared covariance falls back for the revisited steps."""
+    rotation, _ = np.linalg.qr(np.random.rand(3, 3))
+    cov_matrix = rotation @ np.diag([1.0, -1.0, 2.0]) @ rotation.T
+
+    shared_covariance_discrepancies = (
+        _calibration_measures._compute_normalized_discrepancies_shared_covariance
+    )
+    with config.covariance_inversion_context(strategy="auto"):
+        with multivariate.InversionDiagnostics() as diagnostics:
+            _calibration_measures._compute_normalized_discrepancies(
+                centered_mean, cov_matrices
+            )
+            with _inversion_diagnostics._revisit_steps(10):
+                output = shared_covariance_discrepancies(
+                    centered_mean[10:20], cov_matrix
+                )
+
+    assert np.all(np.isfinite(output))
+    shared_record = diagnostics.records[-1]
+    assert (shared_record.first_step, shared_record.num_steps) == (10, 10)
+    np.testing.assert_array_equal(
+        diagnostics.eigendecomposed_steps, np.union1d(np.arange(10, 20), [31])
+    )
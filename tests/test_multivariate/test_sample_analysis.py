@@ -1,6 +1,8 @@
 """Tests for sample analysis functions."""
 import numpy as np
 import pytest
+import scipy.spatial
+import scipy.stats
 
 from probnumeval import multivariate
 
@@ -27,6 +29,150 @@ def test_sample_reference_distance(fake_samples, fake_reference, p):
     np.testing.assert_allclose(srdist.shape, (100,))
 
 
-def test_gaussianity_p_value():
-    with pytest.raises(NotImplementedError):
-        multivariate.gaussianity_p_value(None)
+@pytest.mark.parametrize("p", [1, 2, 3, np.inf])
+@pytest.mark.parametrize("chunk_size", [None, 1, 4])
+def test_batched_sample_reference_distance(p, chunk_size):
+    """Stacks of samples and references give the same result as one call per time point."""
+    samples = np.random.rand(5, 20, 3)
+    references = np.random.rand(5, 3)
+    srdist = multivariate.sample_reference_distance(
+        samples, references, p=p, chunk_size=chunk_size
+    )
+    expected = np.stack(
+        [
+            scipy.spatial.distance_matrix(s, r[None, :], p=p).flatten() / 3
+            for (s, r) in zip(samples, references)
+        ]
+    )
+    assert srdist.shape == (5, 20)
+    np.testing.assert_allclose(srdist, expected)
+
+
+@pytest.mark.parametrize("method, num_tests", [("marginal", 3), ("mardia", 2)])
+@pytest.mark.parametrize("correction", [None, "bonferroni", "holm", "fdr_bh"])
+def test_gaussianity_p_value(fake_samples, method, num_tests, correction):
+    p_values = multivariate.gaussianity_p_value(
+        fake_samples, method=method, correction=correction
+    )
+    assert p_values.shape == (num_tests,)
+    assert np.all((0.0 <= p_values) & (p_values <= 1.0))
+
+
+@pytest.mark.parametrize("method", ["marginal", "mardia"])
+def test_gaussianity_p_value_batched(method):
+    """A batch of time points gives the same p-values as one call per time point."""
+    samples = np.random.randn(4, 50, 3)
+    p_values = multivariate.gaussianity_p_value(samples, method=method)
+    expected = np.stack(
+        [multivariate.gaussianity_p_value(s, method=method) for s in samples]
+    )
+    np.testing.assert_allclose(p_values, expected)
+
+
+def test_gaussianity_p_value_detects_non_gaussian_samples():
+    samples = np.random.rand(2000, 2)
+    assert np.all(multivariate.gaussianity_p_value(samples) < 1e-3)
+    assert np.all(multivariate.gaussianity_p_value(samples, method="mardia")[1] < 1e-3)
+
+
+def test_mardia_skewness_matches_pairwise_definition():
+    samples = np.random.randn(30, 2) ** 2
+    centered = samples - np.mean(samples, axis=0)
+    whitened = (
+        centered @ np.linalg.inv(np.linalg.cholesky(np.cov(centered.T, bias=True))).T
+    )
+    skewness = np.mean((whitened @ whitened.T) ** 3)
+
+    p_values = multivariate.gaussianity_p_value(samples, method="mardia")
+    assert p_values[0] == pytest.approx(scipy.stats.chi2.sf(30 * skewness / 6.0, df=4))
+
+
+@pytest.mark.parametrize(
+    "correction, expected",
+    [
+        ("bonferroni", [0.04, 0.12, 0.16, 1.0]),
+        ("holm", [0.04, 0.09, 0.09, 0.5]),
+        ("fdr_bh", [0.04, 0.16 / 3, 0.16 / 3, 0.5]),
+    ],
+)
+def test_multiple_testing_correction(correction, expected):
+    p_values = np.array([0.01, 0.03, 0.04, 0.5])
+    np.testing.assert_allclose(
+        multivariate._sample_analysis._correct_p_values(p_values, correction),
+        expected,
+    )
+
+
+def test_gaussianity_p_value_unknown_options(fake_samples):
+    with pytest.raises(ValueError):
+        multivariate.gaussianity_p_value(fake_samples, method="shapiro")
+    with pytest.raises(ValueError):
+        multivariate.gaussianity_p_value(fake_samples, correction="sidak")
+
+
+def test_mardia_needs_more_samples_than_dimensions():
+    with pytest.raises(ValueError):
+        multivariate.gaussianity_p_value(np.random.randn(3, 3), method="mardia")
+    with pytest.raises(ValueError):
+        multivariate.gaussianity_p_value(np.ones((10, 2)), method="mardia")
+
+
+@pytest.mark.parametrize("p", [1, 2, 3, np.inf])
+@pytest.mark.parametrize("block_size", [1, 7, 1000])
+@pytest.mark.parametrize("max_workers", [None, 3])
+def test_blockwise_sample_sample_distance(fake_samples, p, block_size, max_workers):
+    """The blockwise implementation coincides with the mean of the full distance matrix."""
+    ssdist = multivariate.sample_sample_distance(
+        fake_samples, p=p, block_size=block_size, max_workers=max_workers
+    )
+    expected = (
+        np.mean(scipy.spatial.distance_matrix(fake_samples, fake_samples, p=p), axis=0)
+        / fake_samples.shape[1]
+    )
+    np.testing.assert_allclose(ssdist, expected)
+
+
+@pytest.mark.parametrize("block_size", [7, 1000])
+def test_gram_sample_sample_distance(fake_samples, block_size):
+    ssdist = multivariate.sample_sample_distance(
+        1e3 + fake_samples, p=2, block_size=block_size, gram=True
+    )
+    expected = multivariate.sample_sample_distance(fake_samples, p=2)
+    np.testing.assert_allclose(ssdist, expected)
+
+
+def test_gram_sample_sample_distance_requires_p2(fake_samples):
+    with pytest.raises(ValueError):
+        multivariate.sample_sample_distance(fake_samples, p=1, gram=True)
+
+
+@pytest.mark.parametrize("p", [1, 2, np.inf])
+def test_approximate_sample_sample_distance(p):
+    """The estimates are seeded, and their errors are of the order of the standard errors."""
+    samples = np.random.rand(500, 3)
+    estimates, standard_errors = multivariate.sample_sample_distance(
+        samples, p=p, approx=True, num_partners=50, block_size=64, random_state=1
+    )
+    estimates_again, _ = multivariate.sample_sample_distance(
+        samples, p=p, approx=True, num_partners=50, random_state=1
+    )
+    expected = multivariate.sample_sample_distance(samples, p=p)
+
+    assert estimates.shape == standard_errors.shape == (500,)
+    np.testing.assert_allclose(estimates, estimates_again)
+    assert np.all(standard_errors > 0.0)
+    assert np.mean(np.abs(estimates - expected) < 3 * standard_errors) > 0.9
+
+
+@pytest.mark.parametrize("p", [1, 2, np.inf])
+def test_mean_sample_sample_distance(fake_samples, p):
+    exact = multivariate.mean_sample_sample_distance(fake_samples, p=p)
+    estimate, standard_error = multivariate.mean_sample_sample_distance(
+        fake_samples, p=p, approx=True, num_pairs=5000, random_state=2
+    )
+
+    assert exact == pytest.approx(
+        np.mean(multivariate.sample_sample_distance(fake_samples, p=p))
+    )
+    assert standard_error > 0.0
+    assert np.abs(estimate - exact) < 5 * standard_error
@@ -0,0 +1,120 @@
+"""Tests for the structured-covariance fast paths."""
+import numpy as np
+import pytest
+from probnum import _randomvariablelist, linops, randvars
+
+from probnumeval import config, multivariate
+
+all_strategies = pytest.mark.parametrize(
+    "strategy", ["inv", "pinv", "solve", "cholesky"]
+)
+all_dampings = pytest.mark.parametrize("damping", [1.0, 0.0])
+
+# The following pylint-exception is for the _randomvariablelist access:
+# pylint: disable=protected-access
+
+
+def _spd(dim):
+    factor = np.random.rand(dim, dim)
+    return factor @ factor.T + np.eye(dim)
+
+
+def _dense_anees(means, covs, reference):
+    rvlist = _randomvariablelist._RandomVariableList(
+        [
+            randvars.Normal(mean=np.ravel(m), cov=cov.todense())
+            for (m, cov) in zip(means, covs)
+        ]
+    )
+    return multivariate.anees(rvlist, reference.reshape((len(means), -1)))
+
+
+def _structured_anees(means, covs, reference):
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=cov) for (m, cov) in zip(means, covs)]
+    )
+    return multivariate.anees(rvlist, reference)
+
+
+@all_strategies
+@all_dampings
+def test_diagonal(strategy, damping):
+    means = np.random.rand(10, 4)
+    covs = [linops.Scaling(np.random.rand(4) + 0.5) for _ in range(10)]
+    reference = np.random.rand(10, 4)
+
+    with config.covariance_inversion_context(strategy=strategy, damping=damping):
+        expected = _dense_anees(means, covs, reference)
+        output = _structured_anees(means, covs, reference)
+    assert output == pytest.approx(expected)
+
+
+@all_strategies
+@all_dampings
+def test_kronecker(strategy, damping):
+    means = np.random.rand(10, 2, 3)
+    covs = [linops.Kronecker(_spd(2), _spd(3)) for _ in range(10)]
+    reference = np.random.rand(10, 2, 3)
+
+    with config.covariance_inversion_context(strategy=strategy, damping=damping):
+        expected = _dense_anees(means, covs, reference)
+        output = _structured_anees(means, covs, reference)
+    assert output == pytest.approx(expected)
+
+
+@all_strategies
+@all_dampings
+def test_low_rank_plus_diagonal(strategy, damping):
+    means = np.random.rand(10, 5)
+    covs = []
+    for _ in range(10):
+        low_rank_factor = linops.Matrix(np.random.rand(5, 2))
+        covs.append(
+            linops.Scaling(np.random.rand(5) + 0.5)
+            + low_rank_factor @ low_rank_factor.T
+        )
+    reference = np.random.rand(10, 5)
+
+    with config.covariance_inversion_context(strategy=strategy, damping=damping):
+        expected = _dense_anees(means, covs, reference)
+        output = _structured_anees(means, covs, reference)
+    assert output == pytest.approx(expected)
+
+
+def test_mixed_structures():
+    """Covariances of different structure are grouped and combined correctly."""
+    means = np.random.rand(6, 4)
+    covs = [
+        linops.Scaling(np.random.rand(4) + 0.5),
+        linops.Matrix(_spd(4)),
+        linops.Identity(4),
+        linops.Scaling(np.random.rand(4) + 0.5),
+        linops.Matrix(_spd(4)),
+        linops.Scaling(2.0, shape=4),
+    ]
+    reference = np.random.rand(6, 4)
+    assert _structured_anees(means, covs, reference) == pytest.approx(
+        _dense_anees(means, covs, reference)
+    )
+
+
+def test_dense_diagonal_detection():
+    diagonals = np.random.rand(10, 3) + 0.5
+    cov_matrices = np.stack([np.diag(diag) for diag in diagonals])
+    centered_mean = np.random.rand(10, 3)
+
+    output = multivariate._calibration_measures._compute_normalized_discrepancies(
+        centered_mean, cov_matrices
+    )
+    np.testing.assert_allclose(output, np.sum(centered_mean ** 2 / diagonals, axis=1))
+    assert (
+        multivariate._structured_covariances._diagonals_if_diagonal(cov_matrices + 1e-3)
+        is None
+    )
+
+
+def test_single_normal_with_dense_covariance():
+    mean, cov, reference = np.random.rand(3), _spd(3), np.random.rand(3)
+    output = multivariate.anees(randvars.Normal(mean=mean, cov=cov), reference)
+    expected = (mean - reference) @ np.linalg.solve(cov, mean - reference)
+    assert output == pytest.approx(expected)
@@ -0,0 +1,209 @@
+"""Tests for two-sample discrepancies."""
+import numpy as np
+import pytest
+import scipy.spatial
+
+from probnumeval import multivariate
+
+
+@pytest.fixture
+def samples():
+    return np.random.default_rng(1).normal(size=(2000, 3))
+
+
+@pytest.fixture
+def same_distribution():
+    return np.random.default_rng(2).normal(size=(1500, 3))
+
+
+@pytest.fixture
+def shifted_distribution():
+    return np.random.default_rng(3).normal(loc=1.0, size=(1500, 3))
+
+
+def test_linear_time_mmd(samples, same_distribution, shifted_distribution):
+    mmd, standard_error = multivariate.linear_time_mmd(
+        samples, same_distribution, random_state=4
+    )
+    assert np.abs(mmd) < 4 * standard_error
+
+    mmd, standard_error = multivariate.linear_time_mmd(
+        samples, shifted_distribution, random_state=4
+    )
+    assert mmd > 4 * standard_error
+
+
+def test_linear_time_mmd_matches_quadratic_time_on_average(samples):
+    """The linear-time estimator is unbiased, i.e. its mean over shuffles is the U-statistic."""
+    x, y = samples[:40], samples[40:80] + 0.5
+    lengthscale = 1.5
+
+    def kernel(a, b):
+        squared_distances = scipy.spatial.distance.cdist(a, b, "sqeuclidean")
+        return np.exp(-squared_distances / (2 * lengthscale ** 2))
+
+    def off_diagonal_mean(matrix):
+        return (np.sum(matrix) - np.trace(matrix)) / (len(matrix) * (len(matrix) - 1))
+
+    expected = (
+        off_diagonal_mean(kernel(x, x))
+        + off_diagonal_mean(kernel(y, y))
+        - 2 * off_diagonal_mean(kernel(x, y))
+    )
+    estimates = [
+        multivariate.linear_time_mmd(x, y, lengthscale=lengthscale, random_state=seed)[
+            0
+        ]
+        for seed in range(2000)
+    ]
+    np.testing.assert_allclose(np.mean(estimates), expected, atol=5e-3)
+
+
+def test_linear_time_mmd_with_median_heuristic_is_unbiased():
+    """The lengthscale is estimated from held-out pairs, so the estimator is zero on
+    average if both distributions coincide."""
+    rng = np.random.default_rng(10)
+    estimates = [
+        multivariate.linear_time_mmd(
+            rng.normal(size=(20, 3)), rng.normal(size=(20, 3)), random_state=rng
+        )[0]
+        for _ in range(2000)
+    ]
+    np.testing.assert_allclose(np.mean(estimates), 0.0, atol=5e-3)
+
+
+def test_linear_time_mmd_seeded(samples, shifted_distribution):
+    first = multivariate.linear_time_mmd(samples, shifted_distribution, random_state=5)
+    second = multivariate.linear_time_mmd(samples, shifted_distribution, random_state=5)
+    assert first == second
+
+
+def test_linear_time_mmd_too_few_samples():
+    with pytest.raises(ValueError):
+        multivariate.linear_time_mmd(np.ones((3, 2)), np.ones((10, 2)))
+    with pytest.raises(ValueError):
+        multivariate.linear_time_mmd(np.ones((4, 2)), np.ones((10, 2)))
+    multivariate.linear_time_mmd(np.ones((4, 2)), np.ones((10, 2)), lengthscale=1.0)
+
+
+def test_random_features_mmd(samples, same_distribution, shifted_distribution):
+    same = multivariate.random_features_mmd(
+        samples, same_distribution, num_features=512, random_state=6
+    )
+    shifted = multivariate.random_features_mmd(
+        samples, shifted_distribution, num_features=512, random_state=6
+    )
+    assert 0.0 <= same < shifted
+
+
+def test_random_features_mmd_approximates_biased_mmd(samples):
+    x, y = samples[:200], samples[200:400] + 0.5
+    squared_distances = scipy.spatial.distance.cdist(
+        np.concatenate((x, y)), np.concatenate((x, y)), "sqeuclidean"
+    )
+    kernel = np.exp(-squared_distances / 2)
+    weights = np.concatenate((np.ones(200), -np.ones(200))) / 200
+    expected = weights @ kernel @ weights
+
+    approximation = multivariate.random_features_mmd(
+        x, y, num_features=20000, random_state=7
+    )
+    np.testing.assert_allclose(approximation, expected, rtol=0.1)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, None])
+def test_random_features_mmd_block_size(samples, shifted_distribution, block_size):
+    x, y = samples[:50], shifted_distribution[:30]
+    expected = multivariate.random_features_mmd(x, y, random_state=8)
+    received = multivariate.random_features_mmd(
+        x, y, block_size=block_size, random_state=8
+    )
+    np.testing.assert_allclose(received, expected)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, None])
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_energy_distance(samples, shifted_distribution, block_size, max_workers):
+    x, y = samples[:50], shifted_distribution[:30]
+    expected = (
+        2 * np.mean(scipy.spatial.distance.cdist(x, y))
+        - np.mean(scipy.spatial.distance.cdist(x, x))
+        - np.mean(scipy.spatial.distance.cdist(y, y))
+    )
+    received = multivariate.energy_distance(
+        x, y, block_size=block_size, max_workers=max_workers
+    )
+    np.testing.assert_allclose(received, expected)
+
+
+def test_energy_distance_one_dimensional(samples, shifted_distribution):
+    """In one dimension, the energy distance is twice the squared Cramer distance."""
+    x, y = samples[:50, :1], shifted_distribution[:30, :1]
+    grid = np.sort(np.concatenate((x, y)).ravel())
+    cdf_x = np.searchsorted(np.sort(x.ravel()), grid[:-1], side="right") / len(x)
+    cdf_y = np.searchsorted(np.sort(y.ravel()), grid[:-1], side="right") / len(y)
+    expected = 2 * np.sum((cdf_x - cdf_y) ** 2 * np.diff(grid))
+    np.testing.assert_allclose(multivariate.energy_distance(x, y), expected)
+
+
+@pytest.mark.parametrize(
+    "discrepancy",
+    [
+        multivariate.linear_time_mmd,
+        multivariate.random_features_mmd,
+        multivariate.energy_distance,
+        multivariate.sliced_wasserstein_distance,
+    ],
+)
+def test_dimension_mismatch(discrepancy):
+    with pytest.raises(ValueError):
+        discrepancy(np.ones((10, 2)), np.ones((10, 3)))
+
+
+@pytest.mark.parametrize("p", [1, 2, 3])
+def test_sliced_wasserstein_distance_one_dimensional(p):
+    """In one dimension, there is nothing to slice."""
+    rng = np.random.default_rng(9)
+    x, y = rng.normal(size=(30, 1)), rng.normal(size=(30, 1)) + 0.5
+    expected = np.mean(np.abs(np.sort(x.ravel()) - np.sort(y.ravel())) ** p) ** (1 / p)
+    received = multivariate.sliced_wasserstein_distance(x, y, p=p, random_state=10)
+    np.testing.assert_allclose(received, expected)
+
+
+def test_sliced_wasserstein_distance_unequal_sizes():
+    """Repeating every sample does not change the empirical distribution."""
+    rng = np.random.default_rng(11)
+    x, y = rng.normal(size=(20, 3)), rng.normal(size=(30, 3))
+    expected = multivariate.sliced_wasserstein_distance(
+        np.repeat(x, 3, axis=0), np.repeat(y, 2, axis=0), random_state=12
+    )
+    received = multivariate.sliced_wasserstein_distance(x, y, random_state=12)
+    np.testing.assert_allclose(received, expected)
+
+
+def test_sliced_wasserstein_distance_shift(samples):
+    """For a shift s, the sliced 2-Wasserstein distance is about |s| / sqrt(d)."""
+    shift = np.array([1.0, 2.0, 2.0])
+    received = multivariate.sliced_wasserstein_distance(
+        samples[:100], samples[:100] + shift, num_projections=5000, random_state=13
+    )
+    np.testing.assert_allclose(received, 3.0 / np.sqrt(3), rtol=0.05)
+
+
+def test_sliced_wasserstein_distance_batched(samples, shifted_distribution):
+    x = np.stack((samples[:50], samples[50:100], samples[100:150]))
+    y = np.stack(
+        (shifted_distribution[:40], samples[150:190], shifted_distribution[40:80])
+    )
+    received = multivariate.sliced_wasserstein_distance(x, y, random_state=14)
+    expected = [
+        multivariate.sliced_wasserstein_distance(x_t, y_t, random_state=14)
+        for x_t, y_t in zip(x, y)
+    ]
+    np.testing.assert_allclose(received.shape, (3,))
+    np.testing.assert_allclose(received, expected)
+
+
+def test_sliced_wasserstein_distance_invalid_order(samples):
+    with pytest.raises(ValueError):
+        multivariate.sliced_wasserstein_distance(samples, samples, p=0.5)
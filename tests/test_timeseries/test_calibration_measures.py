@@ -3,7 +3,7 @@ import numpy as np
 import pytest
 from probnum import filtsmooth, randvars, statespace
 
-from probnumeval import config, timeseries
+from probnumeval import config, multivariate, timeseries
 
 all_strategies = pytest.mark.parametrize(
     "strategy", ["inv", "pinv", "solve", "cholesky"]
@@ -80,3 +80,92 @@ def test_inclination_index(kalpost, refsol, grid, strategy, symmetrize, damping)
     ):
         output = timeseries.inclination_index(kalpost, refsol, grid)
     assert np.isscalar(output)
+
+
+def test_calibration_report(kalpost, grid):
+    """The report coincides with the individual calibration measures."""
+
+    def refsol(x):
+        return np.sin(x[:, None]) * np.ones((1, 2))
+
+    report = timeseries.calibration_report(kalpost, refsol, grid)
+
+    assert report.anees == pytest.approx(timeseries.anees(kalpost, refsol, grid))
+    assert report.non_credibility_index == pytest.approx(
+        timeseries.non_credibility_index(kalpost, refsol, grid)
+    )
+    assert report.inclination_index == pytest.approx(
+        timeseries.inclination_index(kalpost, refsol, grid)
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 100])
+def test_chunked_calibration_measures(kalpost, grid, chunk_size):
+    """Accumulating the statistics chunk by chunk does not change the result."""
+
+    def refsol(x):
+        return np.sin(x[:, None]) * np.ones((1, 2))
+
+    report = timeseries.calibration_report(kalpost, refsol, grid)
+    chunked_report = timeseries.calibration_report(
+        kalpost, refsol, grid, chunk_size=chunk_size
+    )
+
+    assert chunked_report.anees == pytest.approx(report.anees)
+    assert chunked_report.non_credibility_index == pytest.approx(
+        report.non_credibility_index
+    )
+    assert chunked_report.inclination_index == pytest.approx(report.inclination_index)
+    assert chunked_report.chi2_confidence_interval == pytest.approx(
+        report.chi2_confidence_interval
+    )
+
+    assert timeseries.anees(
+        kalpost, refsol, grid, chunk_size=chunk_size
+    ) == pytest.approx(report.anees)
+    assert timeseries.non_credibility_index(
+        kalpost, refsol, grid, chunk_size=chunk_size
+    ) == pytest.approx(report.non_credibility_index)
+    assert timeseries.inclination_index(
+        kalpost, refsol, grid, chunk_size=chunk_size
+    ) == pytest.approx(report.inclination_index)
+
+
+# The following pylint-exception is for the access of the shared factorization:
+# pylint: disable=protected-access
+
+
+@pytest.mark.parametrize(
+    "strategy", ["inv", "pinv", "solve", "cholesky", "cov_cholesky", "auto", "cg"]
+)
+def test_chunked_reference_covariance_is_factorized_once(
+    kalpost, grid, strategy, monkeypatch
+):
+    """The second pass reuses one factorization of the sample covariance."""
+
+    def refsol(x):
+        return np.sin(x[:, None]) * np.ones((1, 2))
+
+    factorize = multivariate._calibration_measures._factorize_shared_covariance
+    calls = []
+
+    def counting_factorize(cov_matrix):
+        calls.append(cov_matrix)
+        return factorize(cov_matrix)
+
+    with config.covariance_inversion_context(strategy=strategy):
+        report = timeseries.calibration_report(kalpost, refsol, grid)
+        monkeypatch.setattr(
+            multivariate._calibration_measures,
+            "_factorize_shared_covariance",
+            counting_factorize,
+        )
+        chunked_report = timeseries.calibration_report(
+            kalpost, refsol, grid, chunk_size=4
+        )
+
+    assert len(calls) == 1
+    assert chunked_report.non_credibility_index == pytest.approx(
+        report.non_credibility_index
+    )
+    assert chunked_report.inclination_index == pytest.approx(report.inclination_index)
@@ -49,3 +49,34 @@ def test_relative_mae(sol, ref_sol, evalgrid):
 
 def test_relative_max_error(sol, ref_sol, evalgrid):
     assert 0.0 < timeseries.relative_max_error(sol, ref_sol, evalgrid) < 1e-8
+
+
+@pytest.mark.parametrize(
+    "error_measure",
+    [
+        timeseries.rmse,
+        timeseries.mae,
+        timeseries.max_error,
+        timeseries.relative_rmse,
+        timeseries.relative_mae,
+        timeseries.relative_max_error,
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_chunked_error_measures(evalgrid, error_measure, chunk_size):
+    """Accumulating the errors chunk by chunk does not change the result."""
+
+    def sol(t):
+        return np.stack((np.sin(t), np.cos(t)), axis=-1)
+
+    def ref_sol(t):
+        return np.stack((np.sin(t) + t ** 2, np.cos(t) - t), axis=-1)
+
+    error = error_measure(sol, ref_sol, evalgrid)
+    chunked_error = error_measure(sol, ref_sol, evalgrid, chunk_size=chunk_size)
+    assert chunked_error == pytest.approx(error)
+
+
+def test_invalid_chunk_size(sol, ref_sol, evalgrid):
+    with pytest.raises(ValueError):
+        timeseries.rmse(sol, ref_sol, evalgrid, chunk_size=0)
@@ -0,0 +1,98 @@
+"""Tests for evaluation sessions."""
+import functools
+
+import numpy as np
+import pytest
+
+from probnumeval import evaluate_many, timeseries
+
+
+class CountingSolution:
+    """Solution that counts how often it has been evaluated."""
+
+    def __init__(self, offset):
+        self.offset = offset
+        self.num_calls = 0
+
+    def __call__(self, locations):
+        self.num_calls += 1
+        return locations + self.offset
+
+
+@pytest.fixture
+def sol():
+    return CountingSolution(offset=1e-10)
+
+
+@pytest.fixture
+def ref_sol():
+    return CountingSolution(offset=0.0)
+
+
+@pytest.fixture
+def evalgrid():
+    return np.linspace(0.1, 1.0)
+
+
+def test_session_reuses_evaluations(sol, ref_sol, evalgrid):
+    with timeseries.EvaluationSession() as session:
+        rmse = timeseries.rmse(sol, ref_sol, evalgrid)
+        mae = timeseries.mae(sol, ref_sol, evalgrid)
+        max_error = timeseries.max_error(sol, ref_sol, evalgrid)
+
+    assert sol.num_calls == 1
+    assert ref_sol.num_calls == 1
+    assert session.misses == 2
+    assert session.hits == 4
+
+    assert rmse == timeseries.rmse(sol, ref_sol, evalgrid)
+    assert mae == timeseries.mae(sol, ref_sol, evalgrid)
+    assert max_error == timeseries.max_error(sol, ref_sol, evalgrid)
+
+
+def test_no_caching_outside_of_session(sol, ref_sol, evalgrid):
+    timeseries.rmse(sol, ref_sol, evalgrid)
+    timeseries.mae(sol, ref_sol, evalgrid)
+    assert sol.num_calls == 2
+
+
+def test_different_locations_are_different_entries(sol, ref_sol, evalgrid):
+    with timeseries.EvaluationSession():
+        timeseries.rmse(sol, ref_sol, evalgrid)
+        timeseries.rmse(sol, ref_sol, evalgrid + 1.0)
+    assert sol.num_calls == 2
+
+
+def test_lru_eviction(sol, evalgrid):
+    with timeseries.EvaluationSession(maxsize=2) as session:
+        session.evaluate(sol, evalgrid)
+        session.evaluate(sol, evalgrid + 1.0)
+        session.evaluate(sol, evalgrid)  # Refresh the first entry
+        session.evaluate(sol, evalgrid + 2.0)  # Evicts the second entry
+        assert len(session) == 2
+
+        session.evaluate(sol, evalgrid)
+        assert sol.num_calls == 3
+        session.evaluate(sol, evalgrid + 1.0)
+        assert sol.num_calls == 4
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        timeseries.EvaluationSession(maxsize=0)
+
+
+def test_session_is_shared_with_parallel_jobs(sol, ref_sol, evalgrid):
+    """Jobs of evaluate_many use the session of the caller."""
+    with timeseries.EvaluationSession() as session:
+        timeseries.rmse(sol, ref_sol, evalgrid)
+        results = evaluate_many(
+            [
+                functools.partial(timeseries.rmse, sol, ref_sol, evalgrid),
+                functools.partial(timeseries.mae, sol, ref_sol, evalgrid),
+            ]
+        )
+
+    assert len(results) == 2
+    assert sol.num_calls == ref_sol.num_calls == 1
+    assert session.hits == 4
@@ -0,0 +1,130 @@
+"""Tests for sample analysis functions."""
+import numpy as np
+import pytest
+from probnum import filtsmooth, randvars, statespace
+
+from probnumeval import multivariate, timeseries
+
+# The following pylint-exception is for the access of the tile size:
+# pylint: disable=protected-access
+
+
+@pytest.fixture
+def smoothing_posterior():
+    """Smoothing posterior of a once-integrated Brownian motion, with irrelevant values."""
+    prior = statespace.IBM(1, 1)
+    locations = np.linspace(0.0, 1.0, 10)
+    rvlist = [
+        randvars.Normal(mean=np.array([np.sin(t), np.cos(t)]), cov=0.01 * np.eye(2))
+        for t in locations
+    ]
+    filtering_posterior = filtsmooth.FilteringPosterior(
+        states=rvlist, locations=locations, transition=prior
+    )
+    return filtsmooth.SmoothingPosterior(
+        filtering_posterior=filtering_posterior,
+        transition=prior,
+        locations=locations,
+        states=rvlist,
+    )
+
+
+@pytest.fixture
+def refsol():
+    return lambda t: np.stack([np.sin(t), np.cos(t)], axis=-1)
+
+
+@pytest.fixture
+def grid():
+    return np.linspace(0.0, 1.0, 15)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3, 20])
+def test_sample_chunks(smoothing_posterior, grid, chunk_size):
+    chunks = list(
+        timeseries.sample_chunks(
+            smoothing_posterior, grid, 7, chunk_size=chunk_size, random_state=1
+        )
+    )
+    samples = np.concatenate(chunks, axis=1)
+    samples_again = np.concatenate(
+        list(
+            timeseries.sample_chunks(
+                smoothing_posterior, grid, 7, chunk_size=chunk_size, random_state=1
+            )
+        ),
+        axis=1,
+    )
+
+    assert samples.shape == (15, 7, 2)
+    np.testing.assert_allclose(samples, samples_again)
+
+
+@pytest.mark.parametrize("p", [1, 2, np.inf])
+@pytest.mark.parametrize("chunk_size", [None, 3])
+def test_sample_reference_distance(smoothing_posterior, refsol, grid, p, chunk_size):
+    """The distances coincide with the multivariate distances at each location."""
+    output = timeseries.sample_reference_distance(
+        smoothing_posterior,
+        refsol,
+        grid,
+        num_samples=7,
+        p=p,
+        chunk_size=chunk_size,
+        random_state=1,
+    )
+    samples = np.concatenate(
+        list(
+            timeseries.sample_chunks(
+                smoothing_posterior, grid, 7, chunk_size=chunk_size, random_state=1
+            )
+        ),
+        axis=1,
+    )
+    expected = np.stack(
+        [
+            multivariate.sample_reference_distance(s, refsol(t), p=p)
+            for (s, t) in zip(samples, grid)
+        ]
+    )
+
+    assert output.shape == (15, 7)
+    np.testing.assert_allclose(output, expected)
+
+
+@pytest.mark.parametrize("p", [1, 2, 3, np.inf])
+@pytest.mark.parametrize("chunk_size", [None, 3])
+@pytest.mark.parametrize("max_tile_entries", [2 ** 22, 20])
+def test_sample_sample_distance(
+    smoothing_posterior, grid, p, chunk_size, max_tile_entries, monkeypatch
+):
+    """The distances coincide with the multivariate distances at each location,
+    also if the locations are split into blocks."""
+    monkeypatch.setattr(
+        timeseries._sample_analysis, "_MAX_TILE_ENTRIES", max_tile_entries
+    )
+    output = timeseries.sample_sample_distance(
+        smoothing_posterior,
+        grid,
+        num_samples=7,
+        p=p,
+        chunk_size=chunk_size,
+        random_state=1,
+    )
+    samples = np.concatenate(
+        list(
+            timeseries.sample_chunks(
+                smoothing_posterior, grid, 7, chunk_size=chunk_size, random_state=1
+            )
+        ),
+        axis=1,
+    )
+    expected = np.stack([multivariate.sample_sample_distance(s, p=p) for s in samples])
+
+    assert output.shape == (15, 7)
+    np.testing.assert_allclose(output, expected)
+
+
+def test_sample_sample_distance_needs_samples(smoothing_posterior, grid):
+    with pytest.raises(ValueError):
+        timeseries.sample_sample_distance(smoothing_posterior, grid, num_samples=0)
@@ -0,0 +1,120 @@
+"""Tests for animating samples from a time-series posterior."""
+import numpy as np
+import pytest
+from probnum import filtsmooth, randvars, statespace
+
+from probnumeval import visual
+
+# The following pylint-exception is for testing the private factorizations:
+# pylint: disable=protected-access
+
+
+@pytest.fixture
+def smoothing_posterior():
+    """Smoothing posterior of a once-integrated Brownian motion, with irrelevant values."""
+    prior = statespace.IBM(1, 1)
+    locations = np.linspace(0.0, 1.0, 6)
+    rvlist = [
+        randvars.Normal(mean=np.array([np.sin(t), np.cos(t)]), cov=0.01 * np.eye(2))
+        for t in locations
+    ]
+    filtering_posterior = filtsmooth.FilteringPosterior(
+        states=rvlist, locations=locations, transition=prior
+    )
+    return filtsmooth.SmoothingPosterior(
+        filtering_posterior=filtering_posterior,
+        transition=prior,
+        locations=locations,
+        states=rvlist,
+    )
+
+
+@pytest.fixture
+def grid():
+    return np.linspace(0.0, 1.0, 9)
+
+
+@pytest.mark.parametrize("joint", [True, False])
+@pytest.mark.parametrize("method", ["great_circle", "periodic_gp"])
+@pytest.mark.parametrize("endpoint", [True, False])
+def test_animate_posterior_samples(smoothing_posterior, grid, joint, method, endpoint):
+    frames = list(
+        visual.animate_posterior_samples(
+            smoothing_posterior,
+            grid,
+            num_frames=7,
+            joint=joint,
+            method=method,
+            endpoint=endpoint,
+        )
+    )
+    assert len(frames) == 7
+    assert all(frame.shape == (9, 2) for frame in frames)
+    if endpoint:
+        np.testing.assert_allclose(frames[-1], frames[0], atol=1e-10)
+
+
+def test_marginal_factor(smoothing_posterior, grid):
+    mean, factor = visual._animate_posterior._marginal_mean_and_factor(
+        smoothing_posterior, grid
+    )
+    rvs = smoothing_posterior(grid)
+    np.testing.assert_allclose(mean, rvs.mean)
+    np.testing.assert_allclose(
+        np.einsum("tij,tkj->tik", factor, factor), rvs.cov, atol=1e-12
+    )
+
+
+def test_joint_transform(smoothing_posterior):
+    """On the locations of the posterior, the transform is the posterior's sampler."""
+    locations = smoothing_posterior.locations
+    base_shape, transform = visual._animate_posterior._joint_transform(
+        smoothing_posterior, locations
+    )
+    base_measure_realization = np.random.default_rng(1).normal(size=base_shape)
+    expected = smoothing_posterior.transform_base_measure_realizations(
+        base_measure_realization, t=locations
+    )
+    np.testing.assert_allclose(transform(base_measure_realization), expected)
+
+
+@pytest.fixture
+def permutation(grid):
+    return np.random.default_rng(2).permutation(len(grid))
+
+
+def test_joint_transform_keeps_the_order_of_unsorted_locations(
+    smoothing_posterior, grid, permutation
+):
+    base_shape, transform = visual._animate_posterior._joint_transform(
+        smoothing_posterior, grid
+    )
+    _, unsorted_transform = visual._animate_posterior._joint_transform(
+        smoothing_posterior, grid[permutation]
+    )
+    base_frame = np.random.default_rng(3).normal(size=base_shape)
+    np.testing.assert_allclose(
+        unsorted_transform(base_frame), transform(base_frame)[permutation]
+    )
+
+
+def test_marginal_transform_keeps_the_order_of_unsorted_locations(
+    smoothing_posterior, grid, permutation
+):
+    base_shape, transform = visual._animate_posterior._marginal_transform(
+        smoothing_posterior, grid
+    )
+    _, unsorted_transform = visual._animate_posterior._marginal_transform(
+        smoothing_posterior, grid[permutation]
+    )
+    base_frame = np.random.default_rng(3).normal(size=base_shape)
+    np.testing.assert_allclose(
+        unsorted_transform(base_frame[permutation]), transform(base_frame)[permutation]
+    )
+
+
+def test_unknown_method(smoothing_posterior, grid):
+    with pytest.raises(ValueError):
+        visual.animate_posterior_samples(
+            smoothing_posterior, grid, num_frames=7, method="brownian_motion"
+        )
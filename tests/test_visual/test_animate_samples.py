@@ -0,0 +1,127 @@
+"""Tests for animating samples."""
+import numpy as np
+import pytest
+
+from probnumeval import visual
+
+
+@pytest.fixture
+def initial_sample():
+    return np.random.default_rng(1).normal(size=(4, 5))
+
+
+@pytest.fixture
+def initial_direction():
+    return np.random.default_rng(2).normal(size=(4, 5))
+
+
+def test_geodesic_sphere_step_sizes(initial_sample, initial_direction):
+    point = initial_sample[0] / np.linalg.norm(initial_sample[0])
+    step_sizes = np.linspace(0.0, 3.0, 7)
+    received = visual.geodesic_sphere(point, initial_direction[0], t=step_sizes)
+    expected = [
+        visual.geodesic_sphere(point, initial_direction[0] * t) for t in step_sizes
+    ]
+    np.testing.assert_allclose(received, expected)
+    np.testing.assert_allclose(received[0], point)
+
+
+def test_geodesic_sphere_zero_velocity(initial_sample):
+    point = initial_sample[:2]
+    velocity = np.stack((np.zeros(5), np.ones(5)))
+    received = visual.geodesic_sphere(point, velocity)
+    np.testing.assert_allclose(received[0], point[0])
+    assert np.all(np.isfinite(received))
+
+
+@pytest.mark.parametrize("endpoint", [True, False])
+def test_great_circle(initial_sample, initial_direction, endpoint):
+    states = visual.animate_with_great_circle_of_unitsphere(
+        5, 11, initial_sample[0], initial_direction[0], endpoint=endpoint
+    )
+    np.testing.assert_allclose(states.shape, (11, 5))
+    np.testing.assert_allclose(
+        np.linalg.norm(states, axis=-1), np.linalg.norm(initial_sample[0])
+    )
+    np.testing.assert_allclose(states[0], initial_sample[0])
+    if endpoint:
+        np.testing.assert_allclose(states[-1], states[0], atol=1e-12)
+
+
+def test_great_circle_batch(initial_sample, initial_direction):
+    states = visual.animate_with_great_circle_of_unitsphere(
+        5, 11, initial_sample, initial_direction
+    )
+    np.testing.assert_allclose(states.shape, (11, 4, 5))
+    for i in range(4):
+        expected = visual.animate_with_great_circle_of_unitsphere(
+            5, 11, initial_sample[i], initial_direction[i]
+        )
+        np.testing.assert_allclose(states[:, i], expected)
+
+
+def test_great_circle_num_samples():
+    states = visual.animate_with_great_circle_of_unitsphere(5, 11, num_samples=3)
+    np.testing.assert_allclose(states.shape, (11, 3, 5))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 11, 20])
+@pytest.mark.parametrize("endpoint", [True, False])
+def test_great_circle_in_chunks(
+    initial_sample, initial_direction, chunk_size, endpoint
+):
+    expected = visual.animate_with_great_circle_of_unitsphere(
+        5, 11, initial_sample, initial_direction, endpoint=endpoint
+    )
+    chunks = list(
+        visual.animate_with_great_circle_of_unitsphere_in_chunks(
+            5,
+            11,
+            chunk_size,
+            initial_sample,
+            initial_direction,
+            endpoint=endpoint,
+        )
+    )
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    np.testing.assert_allclose(np.concatenate(chunks), expected)
+
+
+def test_great_circle_in_chunks_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        visual.animate_with_great_circle_of_unitsphere_in_chunks(5, 11, chunk_size=0)
+
+
+def _dense_periodic_kernel_matrix(num_frames, endpoint):
+    distances = np.linspace(0, 2 * np.pi, num_frames, endpoint=endpoint)
+    return np.exp(-np.sin(np.abs(distances[:, None] - distances[None, :])) ** 2)
+
+
+@pytest.mark.parametrize("num_frames", [1, 2, 7, 10])
+@pytest.mark.parametrize("endpoint", [True, False])
+def test_periodic_gp_covariance(num_frames, endpoint):
+    """Applied to an identity matrix, the sampler returns a square root of the kernel matrix."""
+    factor = visual.animate_with_periodic_gp(
+        num_frames, num_frames, np.eye(num_frames), endpoint=endpoint
+    )
+    np.testing.assert_allclose(
+        factor @ factor.T,
+        _dense_periodic_kernel_matrix(num_frames, endpoint),
+        atol=1e-10,
+    )
+
+
+def test_periodic_gp_endpoint():
+    states = visual.animate_with_periodic_gp(3, 10, endpoint=True)
+    np.testing.assert_allclose(states.shape, (10, 3))
+    np.testing.assert_allclose(states[-1], states[0])
+
+
+def test_periodic_gp_cached_factor():
+    visual.animate_with_periodic_gp(2, 123)
+    # pylint: disable=protected-access
+    cache_info = visual._animate_samples._periodic_gp_sqrt_eigenvalues.cache_info()
+    visual.animate_with_periodic_gp(2, 123)
+    new_cache_info = visual._animate_samples._periodic_gp_sqrt_eigenvalues.cache_info()
+    assert new_cache_info.hits == cache_info.hits + 1
+    assert new_cache_info.currsize == cache_info.currsize